@@ -0,0 +1,353 @@
+"""Analitik NASA POWER multi-tahun, multi-situs yang diperbarui secara bertahap.
+
+Sebuah direktori file CSV per jam di-ingest paralel (process pool). Setiap
+file diringkas sekali menjadi agregat harian dan disimpan per hash isi di
+gudang; file yang sudah pernah diproses (path, ukuran, mtime sama, atau isi
+identik) dilewati. Setelah itu hanya situs yang mendapat data baru yang
+agregatnya dihitung ulang dari tabel harian:
+
+    bulanan         total/rata-rata per (tahun, bulan)
+    tahunan         total per tahun + kelengkapan data
+    persentil       P10..P90 nilai harian GHI dan yield PV
+    p50_p90         yield tahunan P50/P90 (kWh/kWp) dari tahun-tahun lengkap
+    klimatologi     rata-rata harian per bulan kalender + faktor musim
+
+Struktur gudang (default `.cache/analitik`):
+    manifest.json               file yang sudah diproses & daftar situs
+    harian/<hash>.npz           agregat harian satu file
+    situs/<kunci>.npz           agregat turunan satu situs
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from nasa_power import DIR_CACHE, KOLOM_WAKTU, baca_nasa_power, hash_isi
+from simulasi_pv import KOLOM_GHI, KOLOM_SUHU, simulasi
+
+KOLOM_ANGIN = 'WS10M'
+DIR_ANALITIK = DIR_CACHE.parent / 'analitik'
+VERSI_GUDANG = 1
+PERSENTIL = (10, 25, 50, 75, 90)
+Z_P90 = 1.2816                  # kuantil normal satu sisi untuk P90
+KELENGKAPAN_TAHUN = 0.95        # bagian hari berdata agar satu tahun dianggap lengkap
+
+# Kolom agregat harian: nama -> cara agregasi per bulan/tahun
+KOLOM_HARIAN = {
+    'ghi_kwh_m2': 'jumlah',     # iradiasi harian (kWh/m^2)
+    'pv_kwh_per_kwp': 'jumlah', # produksi simulasi 1 kWp (kWh)
+    'angin_rata': 'rata',       # kecepatan angin 10 m rata-rata (m/s)
+    'suhu_rata': 'rata',        # suhu udara rata-rata (°C)
+}
+
+
+def kunci_situs(lintang, bujur):
+    """Kunci situs dari koordinat (file beda tahun di titik yang sama digabung)."""
+    return f'{lintang:+08.4f}_{bujur:+09.4f}'
+
+
+# --- AGREGASI HARIAN (dipakai worker dan code.py) ---
+
+def agregasi_harian(data_nasa):
+    """Ringkas data per jam menjadi tabel harian (dict kolom NumPy).
+
+    Jam dengan nilai hilang di salah satu kolom diabaikan, hari tanpa jam
+    valid tidak dimasukkan; `hari` berisi tanggal lokal (datetime64[D]).
+    """
+    kolom = [k for k in (KOLOM_GHI, KOLOM_SUHU, KOLOM_ANGIN) if k in data_nasa.kolom]
+    valid = np.ones(len(data_nasa), dtype=bool)
+    for k in data_nasa.kolom:
+        if k not in KOLOM_WAKTU:
+            valid &= np.isfinite(data_nasa[k])
+
+    hari_jam = data_nasa.waktu.astype('datetime64[D]')[valid]
+    hari, posisi = np.unique(hari_jam, return_inverse=True)
+    n = len(hari)
+    jam_valid = np.bincount(posisi, minlength=n)
+
+    def jumlah(nilai):
+        return np.bincount(posisi, weights=np.asarray(nilai, dtype=np.float64)[valid], minlength=n)
+
+    hasil = {'hari': hari, 'jam_valid': jam_valid}
+    if KOLOM_GHI in kolom:
+        hasil['ghi_kwh_m2'] = jumlah(data_nasa[KOLOM_GHI]) / 1000
+        if KOLOM_SUHU in kolom:
+            hasil['pv_kwh_per_kwp'] = jumlah(simulasi(data_nasa, 1.0).energi_kwh)
+    if KOLOM_ANGIN in kolom:
+        hasil['angin_rata'] = jumlah(data_nasa[KOLOM_ANGIN]) / jam_valid
+    if KOLOM_SUHU in kolom:
+        hasil['suhu_rata'] = jumlah(data_nasa[KOLOM_SUHU]) / jam_valid
+    return hasil
+
+
+def _kelompok(kunci, harian):
+    """Agregasi tabel harian per `kunci` (array integer), mengikuti `KOLOM_HARIAN`."""
+    unik, posisi = np.unique(kunci, return_inverse=True)
+    jumlah_hari = np.bincount(posisi, minlength=len(unik))
+    hasil = {'kunci': unik, 'hari': jumlah_hari}
+    for nama, cara in KOLOM_HARIAN.items():
+        if nama in harian:
+            total = np.bincount(posisi, weights=harian[nama], minlength=len(unik))
+            hasil[nama] = total if cara == 'jumlah' else total / jumlah_hari
+    return hasil
+
+
+def ringkas_situs(harian):
+    """Semua agregat turunan dari tabel harian gabungan satu situs."""
+    hari = harian['hari']
+    bulan_abs = hari.astype('datetime64[M]').astype(np.int64)     # bulan sejak 1970-01
+    tahun = bulan_abs // 12 + 1970
+    bulan_kalender = bulan_abs % 12
+
+    bulanan = _kelompok(bulan_abs, harian)
+    bulanan['tahun'] = bulanan['kunci'] // 12 + 1970
+    bulanan['bulan'] = bulanan['kunci'] % 12 + 1
+
+    tahunan = _kelompok(tahun, harian)
+    tahunan['tahun'] = tahunan['kunci']
+    hari_setahun = np.where((tahunan['tahun'] % 4 == 0) & ((tahunan['tahun'] % 100 != 0)
+                                                           | (tahunan['tahun'] % 400 == 0)), 366, 365)
+    tahunan['kelengkapan'] = tahunan['hari'] / hari_setahun
+
+    hasil = {'bulanan': bulanan, 'tahunan': tahunan}
+
+    # Klimatologi: rata-rata harian per bulan kalender di seluruh tahun
+    klim = {'bulan': np.arange(1, 13)}
+    hari_per_bulan = np.bincount(bulan_kalender, minlength=12)
+    klim['hari'] = hari_per_bulan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for nama in KOLOM_HARIAN:
+            if nama in harian:
+                klim[nama] = np.bincount(bulan_kalender, weights=harian[nama], minlength=12) / hari_per_bulan
+        if 'pv_kwh_per_kwp' in harian:
+            klim['faktor_musim'] = klim['pv_kwh_per_kwp'] / harian['pv_kwh_per_kwp'].mean()
+    hasil['klimatologi'] = klim
+
+    hasil['persentil'] = {'persentil': np.array(PERSENTIL)}
+    for nama in ('ghi_kwh_m2', 'pv_kwh_per_kwp'):
+        if nama in harian:
+            hasil['persentil'][nama] = np.percentile(harian[nama], PERSENTIL)
+
+    # P50/P90 yield tahunan dari tahun lengkap (distribusi normal antar tahun)
+    if 'pv_kwh_per_kwp' in harian:
+        lengkap = tahunan['kelengkapan'] >= KELENGKAPAN_TAHUN
+        yield_tahun = tahunan['pv_kwh_per_kwp'][lengkap]
+        if not len(yield_tahun):
+            # Belum ada tahun lengkap: ekstrapolasi dari rata-rata harian
+            yield_tahun = np.array([harian['pv_kwh_per_kwp'].mean() * 365])
+        p50 = float(np.mean(yield_tahun))
+        sd = float(np.std(yield_tahun, ddof=1)) if len(yield_tahun) > 1 else float('nan')
+        hasil['p50_p90'] = {
+            'jumlah_tahun': np.array(int(lengkap.sum())),
+            'p50_kwh_per_kwp': np.array(p50),
+            'p90_kwh_per_kwp': np.array(p50 - Z_P90 * sd if len(yield_tahun) > 1 else float('nan')),
+            'sd_kwh_per_kwp': np.array(sd),
+        }
+    return hasil
+
+
+# --- GUDANG ---
+
+def _worker_ingest(path):
+    """Dijalankan di proses worker: hash, parse dan ringkas satu file."""
+    isi = Path(path).read_bytes()
+    data = baca_nasa_power(isi, cache_dir=None)
+    meta = data.metadata
+    return {
+        'hash': hash_isi(isi),
+        'lintang': meta.lintang,
+        'bujur': meta.bujur,
+        'elevasi': meta.elevasi,
+        'harian': agregasi_harian(data),
+    }
+
+
+def _simpan_npz(path, **kolom):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sementara = path.with_suffix('.tmp.npz')
+    np.savez(sementara, **kolom)
+    os.replace(sementara, path)
+
+
+def _ratakan(ringkasan):
+    """{'bulanan': {'tahun': ...}} -> {'bulanan.tahun': ...} untuk NPZ."""
+    return {f'{grup}.{nama}': np.asarray(nilai) for grup, isi in ringkasan.items() for nama, nilai in isi.items()}
+
+
+def penanda_gudang(direktori=DIR_ANALITIK):
+    """Penanda isi gudang (mtime manifest) untuk kunci cache, tanpa membaca manifest; 0 jika kosong."""
+    path = Path(direktori) / 'manifest.json'
+    return path.stat().st_mtime_ns if path.exists() else 0
+
+
+class GudangAnalitik:
+    """Gudang agregat NASA POWER di disk beserta manifest-nya."""
+
+    def __init__(self, direktori=DIR_ANALITIK):
+        self.direktori = Path(direktori)
+        path = self.direktori / 'manifest.json'
+        self.manifest = {'versi': VERSI_GUDANG, 'file': {}, 'path': {}, 'situs': {}}
+        if path.exists():
+            manifest = json.loads(path.read_text())
+            if manifest.get('versi') == VERSI_GUDANG:
+                self.manifest = manifest
+
+    def _simpan_manifest(self):
+        self.direktori.mkdir(parents=True, exist_ok=True)
+        sementara = self.direktori / 'manifest.json.tmp'
+        sementara.write_text(json.dumps(self.manifest, indent=1, ensure_ascii=False))
+        os.replace(sementara, self.direktori / 'manifest.json')
+
+    def _berubah(self, path):
+        """True jika `path` belum pernah diproses dengan ukuran & mtime yang sama."""
+        st = path.stat()
+        tercatat = self.manifest['path'].get(str(path.resolve()))
+        return tercatat is None or tercatat['ukuran'] != st.st_size or tercatat['mtime_ns'] != st.st_mtime_ns
+
+    def ingest(self, sumber, workers=None, pola='*.csv', nama_situs=None):
+        """Proses file baru dari direktori/list path; kembalikan ringkasan pekerjaan.
+
+        `nama_situs` opsional memetakan kunci situs -> nama yang mudah dibaca.
+        """
+        mulai = time.perf_counter()
+        if isinstance(sumber, (str, Path)) and Path(sumber).is_dir():
+            paths = sorted(Path(sumber).rglob(pola))
+        else:
+            paths = [Path(p) for p in ([sumber] if isinstance(sumber, (str, Path)) else sumber)]
+        baru = [p for p in paths if self._berubah(p)]
+
+        hasil = []
+        if len(baru) > 1 and workers != 1:
+            with ProcessPoolExecutor(workers) as pool:
+                hasil = list(pool.map(_worker_ingest, baru))
+        else:
+            hasil = [_worker_ingest(p) for p in baru]
+
+        terdampak = set()
+        for path, h in zip(baru, hasil):
+            st = path.stat()
+            self.manifest['path'][str(path.resolve())] = {'hash': h['hash'], 'ukuran': st.st_size,
+                                                          'mtime_ns': st.st_mtime_ns}
+            if h['hash'] in self.manifest['file']:
+                continue            # isi identik dengan file yang sudah ada
+            kunci = kunci_situs(h['lintang'], h['bujur'])
+            harian = h['harian']
+            _simpan_npz(self.direktori / 'harian' / f"{h['hash']}.npz",
+                        **{k: (v.astype(np.int64) if k == 'hari' else v) for k, v in harian.items()})
+            tahun = sorted(set((harian['hari'].astype('datetime64[Y]').astype(np.int64) + 1970).tolist()))
+            self.manifest['file'][h['hash']] = {'path': str(path), 'situs': kunci, 'tahun': tahun,
+                                               'hari': int(len(harian['hari'])),
+                                               'urutan': len(self.manifest['file'])}
+            situs = self.manifest['situs'].setdefault(kunci, {
+                'nama': path.stem, 'lintang': h['lintang'], 'bujur': h['bujur'],
+                'elevasi': h['elevasi'], 'file': [],
+            })
+            situs['file'].append(h['hash'])
+            terdampak.add(kunci)
+
+        for kunci, nama in (nama_situs or {}).items():
+            if kunci in self.manifest['situs']:
+                self.manifest['situs'][kunci]['nama'] = nama
+
+        for kunci in terdampak:
+            self._perbarui_situs(kunci)
+        self._simpan_manifest()
+        return {'dipindai': len(paths), 'diproses': len(baru), 'situs_diperbarui': sorted(terdampak),
+                'detik': time.perf_counter() - mulai}
+
+    def _perbarui_situs(self, kunci):
+        harian = self.harian(kunci)
+        ringkasan = ringkas_situs(harian)
+        situs = self.manifest['situs'][kunci]
+        situs['tahun'] = ringkasan['tahunan']['tahun'].tolist()
+        situs['hari'] = int(len(harian['hari']))
+        _simpan_npz(self.direktori / 'situs' / f'{kunci}.npz', **_ratakan(ringkasan))
+
+    # --- pembacaan ---
+
+    def situs(self):
+        """Kunci situs -> metadata (nama, koordinat, tahun, file)."""
+        return self.manifest['situs']
+
+    def harian(self, kunci):
+        """Tabel harian gabungan semua file situs; hari yang tumpang tindih diambil dari file terbaru."""
+        bagian = []
+        for h in self.manifest['situs'][kunci]['file']:
+            with np.load(self.direktori / 'harian' / f'{h}.npz') as npz:
+                bagian.append({k: npz[k] for k in npz.files})
+        kolom = set.intersection(*(set(b) for b in bagian))
+        gabung = {k: np.concatenate([b[k] for b in bagian]) for k in kolom}
+        # np.unique mengambil kemunculan pertama: balik urutan agar file terbaru menang
+        _, pertama = np.unique(gabung['hari'][::-1], return_index=True)
+        pilih = len(gabung['hari']) - 1 - pertama
+        hasil = {k: v[pilih] for k, v in gabung.items()}
+        hasil['hari'] = hasil['hari'].astype('datetime64[D]')
+        return hasil
+
+    def yield_tahun_lengkap(self, kunci):
+        """Yield PV tahunan (kWh/kWp) dari tahun-tahun yang datanya lengkap."""
+        tahunan = self.ringkasan(kunci)['tahunan']
+        return tahunan['pv_kwh_per_kwp'][tahunan['kelengkapan'] >= KELENGKAPAN_TAHUN]
+
+    def terdekat(self, lintang, bujur, min_tahun=1, jarak_maks=None):
+        """(kunci, jarak km) situs terdekat yang memiliki minimal `min_tahun` tahun data.
+
+        None jika tidak ada, atau jika situs terdekat lebih jauh dari `jarak_maks` km.
+        """
+        from referensi import jarak_km
+
+        kandidat = [(k, s) for k, s in self.manifest['situs'].items() if len(s.get('tahun', [])) >= min_tahun]
+        if not kandidat:
+            return None
+        jarak = jarak_km(lintang, bujur, np.array([s['lintang'] for _, s in kandidat]),
+                         np.array([s['bujur'] for _, s in kandidat]))
+        i = int(np.argmin(jarak))
+        if jarak_maks is not None and jarak[i] > jarak_maks:
+            return None
+        return kandidat[i][0], float(jarak[i])
+
+    def ringkasan(self, kunci):
+        """Agregat tersimpan satu situs: {'bulanan': {...}, 'tahunan': {...}, ...}."""
+        hasil = {}
+        with np.load(self.direktori / 'situs' / f'{kunci}.npz') as npz:
+            for nama in npz.files:
+                grup, _, kolom = nama.partition('.')
+                hasil.setdefault(grup, {})[kolom] = npz[nama]
+        return hasil
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest dan ringkas file NASA POWER multi-tahun/multi-situs")
+    sub = parser.add_subparsers(dest='perintah', required=True)
+    p_ingest = sub.add_parser('ingest', help="Proses file baru dari direktori")
+    p_ingest.add_argument('sumber', nargs='+', help="Direktori atau file CSV NASA POWER")
+    p_ingest.add_argument('--workers', type=int, default=None, help="Jumlah proses (default: semua core)")
+    p_ingest.add_argument('--gudang', default=str(DIR_ANALITIK))
+    p_info = sub.add_parser('info', help="Ringkasan per situs")
+    p_info.add_argument('--gudang', default=str(DIR_ANALITIK))
+    args = parser.parse_args(argv)
+
+    gudang = GudangAnalitik(args.gudang)
+    if args.perintah == 'ingest':
+        for sumber in args.sumber:
+            hasil = gudang.ingest(sumber, workers=args.workers)
+            print(f"{sumber}: {hasil['diproses']}/{hasil['dipindai']} file baru, "
+                  f"{len(hasil['situs_diperbarui'])} situs diperbarui ({hasil['detik']:.2f} dtk)")
+        return 0
+
+    for kunci, situs in gudang.situs().items():
+        r = gudang.ringkasan(kunci)
+        p = r.get('p50_p90', {})
+        print(f"{situs['nama']} ({kunci}): tahun {situs['tahun']}, "
+              f"P50 {float(p.get('p50_kwh_per_kwp', np.nan)):.0f} / P90 {float(p.get('p90_kwh_per_kwp', np.nan)):.0f} kWh/kWp")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
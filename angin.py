@@ -0,0 +1,383 @@
+"""Simulasi energi angin per jam dari WS10M NASA POWER, padanan `simulasi_pv.py`.
+
+Model yang sepenuhnya vektor:
+  v_hub  = WS10M * (h / 10)^alpha                     (hukum pangkat), atau
+         = WS10M * ln(h / z0) / ln(10 / z0)           (hukum logaritmik)
+  v_eq   = v_hub * (rho / 1.225)^(1/3)                 (koreksi kerapatan udara, IEC 61400-12)
+  P      = kurva_daya(v_eq) * (1 - rugi_sistem)
+dengan rho dari elevasi situs (atmosfer standar) dan T2M.
+
+Kurva daya turbin disimpan sebagai tabel pada grid kecepatan halus
+(`LANGKAH_GRID` m/s), sehingga interpolasi untuk jutaan jam x beberapa turbin
+cukup berupa indeks array. Seperti PV, keluaran linier terhadap jumlah turbin,
+jadi profil per unit cukup dihitung sekali per lokasi.
+
+Kurva di `KURVA_TURBIN` adalah kurva generik per kelas ukuran (bukan produk
+tertentu); tambahkan kurva pabrikan dengan `KurvaDaya` bila tersedia.
+
+Contoh (banyak situs & tahun sekaligus):
+    python angin.py ringkas data_nasa/ --tinggi 30 --workers 4 -o angin.csv
+"""
+
+import argparse
+import math
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from engine import TAHUN_ANALISIS, ASUMSI_INFLASI_LISTRIK, BIAYA_AWAL_PV_PER_Wp, TARIF_PLN
+from optimasi import npv_penghematan
+from payback import payback_tertutup
+from simulasi_pv import KOLOM_SUHU, agregasi_bulanan, simulasi
+
+KOLOM_ANGIN = 'WS10M'
+TINGGI_UKUR = 10.0              # m, tinggi pengukuran WS10M
+RHO_STANDAR = 1.225             # kg/m^3
+LANGKAH_GRID = 0.01             # m/s, resolusi tabel kurva daya
+KECEPATAN_MAKS = 40.0           # m/s, batas atas grid
+JAM_PER_TAHUN = 8760
+BIAYA_ANGIN_PER_W = 40000       # Rp/W terpasang (turbin kecil + menara + inverter)
+HUKUM_PROFIL = ('pangkat', 'log')
+
+
+@dataclass(frozen=True)
+class KurvaDaya:
+    """Kurva daya turbin: daya (kW) pada titik-titik kecepatan (m/s)."""
+    nama: str
+    kapasitas_kw: float
+    diameter_m: float
+    kecepatan: tuple
+    daya_kw: tuple
+    cut_out: float = 25.0
+
+
+# Kurva generik per kelas ukuran, kecepatan 0..25 m/s per 1 m/s
+_V = tuple(range(26))
+KURVA_TURBIN = {
+    'generik_1kw': KurvaDaya('Generik 1 kW (atap)', 1.0, 2.5, _V,
+                             (0, 0, 0, .02, .06, .12, .2, .3, .42, .56, .7, .85) + (1.0,) * 14),
+    'generik_5kw': KurvaDaya('Generik 5 kW', 5.0, 5.5, _V,
+                             (0, 0, 0, .1, .3, .6, 1.0, 1.55, 2.25, 3.1, 4.0, 5.0) + (5.0,) * 14),
+    'generik_100kw': KurvaDaya('Generik 100 kW', 100.0, 24.0, _V,
+                               (0, 0, 0, 2, 7, 15, 26, 40, 56, 72, 86, 96) + (100,) * 14),
+    'generik_2mw': KurvaDaya('Generik 2 MW (IEC kelas III)', 2000.0, 110.0, _V,
+                             (0, 0, 0, 40, 150, 330, 590, 950, 1400, 1820, 1980) + (2000,) * 15),
+}
+
+
+@dataclass(frozen=True)
+class ParameterAngin:
+    """Asumsi profil angin dan rugi-rugi sistem."""
+    tinggi_hub: float = 30.0        # m
+    hukum: str = 'pangkat'          # 'pangkat' atau 'log'
+    alpha: float = 1 / 7            # eksponen hukum pangkat (medan terbuka)
+    z0: float = 0.1                 # m, kekasaran permukaan (lahan pertanian)
+    rugi_sistem: float = 0.10       # ketersediaan, wake, listrik
+    koreksi_kerapatan: bool = True
+
+
+class PustakaTurbin:
+    """Tabel daya beberapa turbin pada grid kecepatan yang sama (turbin x grid)."""
+
+    def __init__(self, kurva):
+        self.kurva = tuple(kurva)
+        grid = np.arange(0.0, KECEPATAN_MAKS + LANGKAH_GRID, LANGKAH_GRID)
+        self.tabel = np.stack([
+            np.where(grid <= k.cut_out, np.interp(grid, k.kecepatan, k.daya_kw), 0.0) for k in self.kurva
+        ])
+        self.kapasitas_kw = np.array([k.kapasitas_kw for k in self.kurva])
+
+    @classmethod
+    def dari_nama(cls, nama):
+        nama = [nama] if isinstance(nama, str) else list(nama)
+        return cls(KURVA_TURBIN[n] for n in nama)
+
+    def daya(self, kecepatan):
+        """Daya (kW) setiap turbin untuk array kecepatan berbentuk apa pun -> (turbin, ...)."""
+        posisi = np.clip(np.asarray(kecepatan, dtype=np.float64), 0.0, KECEPATAN_MAKS) / LANGKAH_GRID
+        i = np.minimum(posisi.astype(np.int64), self.tabel.shape[1] - 2)
+        pecahan = posisi - i
+        return self.tabel[:, i] * (1 - pecahan) + self.tabel[:, i + 1] * pecahan
+
+
+def kecepatan_hub(v10, param=ParameterAngin()):
+    """Ekstrapolasi kecepatan 10 m ke tinggi hub (hukum pangkat atau logaritmik)."""
+    v10 = np.asarray(v10, dtype=np.float64)
+    if param.hukum == 'pangkat':
+        return v10 * (param.tinggi_hub / TINGGI_UKUR) ** param.alpha
+    if param.hukum == 'log':
+        return v10 * (math.log(param.tinggi_hub / param.z0) / math.log(TINGGI_UKUR / param.z0))
+    raise ValueError(f"Hukum profil angin tidak dikenal: {param.hukum} (pilih {', '.join(HUKUM_PROFIL)})")
+
+
+def kerapatan_udara(elevasi_m, suhu_c):
+    """Kerapatan udara (kg/m^3) dari elevasi (atmosfer standar) dan suhu udara."""
+    tekanan = 101325.0 * (1 - 2.25577e-5 * np.asarray(elevasi_m, dtype=np.float64)) ** 5.25588
+    return tekanan / (287.05 * (np.asarray(suhu_c, dtype=np.float64) + 273.15))
+
+
+# --- WEIBULL ---
+
+@dataclass(frozen=True)
+class ParameterWeibull:
+    """Parameter bentuk k dan skala c (m/s), satu nilai per deret."""
+    k: np.ndarray
+    c: np.ndarray
+
+    def pdf(self, v):
+        """Kerapatan peluang pada kecepatan `v` -> (..., len(v))."""
+        k, c = np.asarray(self.k)[..., None], np.asarray(self.c)[..., None]
+        x = np.asarray(v, dtype=np.float64) / c
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.nan_to_num(k / c * x ** (k - 1) * np.exp(-x ** k))
+
+
+_gamma = np.frompyfunc(math.gamma, 1, 1)
+
+
+def weibull_momen(rata, sd):
+    """Parameter Weibull dari rata-rata & simpangan baku (metode empiris Justus)."""
+    rata = np.asarray(rata, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = (np.asarray(sd, dtype=np.float64) / rata) ** -1.086
+        c = rata / np.asarray(_gamma(1 + 1 / k), dtype=np.float64)
+    return ParameterWeibull(k, c)
+
+
+def fit_weibull(kecepatan, axis=-1):
+    """Fit Weibull per deret sepanjang `axis` (NaN diabaikan)."""
+    return weibull_momen(np.nanmean(kecepatan, axis=axis), np.nanstd(kecepatan, axis=axis))
+
+
+def aep_weibull(weibull, pustaka, rugi_sistem=ParameterAngin.rugi_sistem):
+    """Energi tahunan (kWh) dari distribusi Weibull -> (..., turbin)."""
+    grid = np.arange(pustaka.tabel.shape[1]) * LANGKAH_GRID
+    return weibull.pdf(grid) @ pustaka.tabel.T * LANGKAH_GRID * JAM_PER_TAHUN * (1 - rugi_sistem)
+
+
+# --- SIMULASI PER JAM ---
+
+@dataclass(frozen=True)
+class HasilSimulasiAngin:
+    """Energi per jam per turbin berbentuk (turbin, ..., jam)."""
+    waktu: np.ndarray               # datetime64[h]
+    energi_kwh: np.ndarray          # (turbin, ..., jam)
+    kecepatan_hub: np.ndarray       # (..., jam)
+    kapasitas_kw: np.ndarray        # (turbin,)
+    nama_turbin: tuple
+
+    @property
+    def total_kwh(self):
+        return self.energi_kwh.sum(axis=-1)
+
+    @property
+    def jumlah_jam(self):
+        return self.energi_kwh.shape[-1]
+
+    @property
+    def aep_kwh(self):
+        """Energi tahunan (kWh/tahun) per turbin, disetahunkan dari panjang data."""
+        return self.total_kwh / self.jumlah_jam * JAM_PER_TAHUN
+
+    @property
+    def faktor_kapasitas(self):
+        kapasitas = self.kapasitas_kw.reshape((-1,) + (1,) * (self.energi_kwh.ndim - 2))
+        return self.aep_kwh / (kapasitas * JAM_PER_TAHUN)
+
+    def weibull(self):
+        return fit_weibull(self.kecepatan_hub)
+
+    def per_bulan(self):
+        """Total energi per bulan kalender berbentuk (turbin, ..., 12)."""
+        return agregasi_bulanan(self.waktu, self.energi_kwh)
+
+
+def energi_turbin(v10, pustaka, param=ParameterAngin(), rho=None):
+    """Energi per jam (kWh) tiap turbin untuk array WS10M berbentuk apa pun -> (turbin, ...)."""
+    v_hub = kecepatan_hub(np.nan_to_num(np.asarray(v10, dtype=np.float64), nan=0.0), param)
+    if rho is not None and param.koreksi_kerapatan:
+        v_hub = v_hub * np.cbrt(np.asarray(rho) / RHO_STANDAR)
+    return pustaka.daya(v_hub) * (1 - param.rugi_sistem), v_hub
+
+
+def simulasi_angin(data_nasa, turbin=tuple(KURVA_TURBIN), param=ParameterAngin()):
+    """Simulasikan satu/lebih tahun per jam untuk satu/banyak turbin sekaligus.
+
+    `data_nasa` adalah `nasa_power.DataNasaPower` (butuh kolom WS10M; T2M
+    dipakai untuk koreksi kerapatan jika ada).
+    """
+    pustaka = turbin if isinstance(turbin, PustakaTurbin) else PustakaTurbin.dari_nama(turbin)
+    rho = None
+    if KOLOM_SUHU in data_nasa.kolom:
+        suhu = data_nasa[KOLOM_SUHU]
+        rho = kerapatan_udara(data_nasa.metadata.elevasi or 0.0, np.where(np.isnan(suhu), 25.0, suhu))
+    energi, v_hub = energi_turbin(data_nasa[KOLOM_ANGIN], pustaka, param, rho)
+    v_hub = np.where(np.isnan(data_nasa[KOLOM_ANGIN]), np.nan, v_hub)
+    return HasilSimulasiAngin(data_nasa.waktu, energi, v_hub, pustaka.kapasitas_kw,
+                              tuple(k.nama for k in pustaka.kurva))
+
+
+# --- HIBRIDA PV + ANGIN ---
+
+@dataclass(frozen=True)
+class HasilHibrida:
+    """Grid kapasitas PV (kWp) x jumlah turbin dengan ekonomi yang sama seperti jalur surya."""
+    kapasitas_pv_kwp: np.ndarray    # (pv,)
+    jumlah_turbin: np.ndarray       # (turbin,)
+    nama_turbin: str
+    produksi_bulanan: np.ndarray    # (pv, turbin) kWh/bulan rata-rata
+    porsi_angin: np.ndarray         # (pv, turbin) bagian energi dari angin
+    jam_tanpa_produksi: np.ndarray  # (pv, turbin) bagian jam dengan produksi < 1% kapasitas
+    biaya_instalasi: np.ndarray
+    penghematan_rp: np.ndarray
+    payback_tahun: np.ndarray       # kontinu, NaN jika tidak impas
+    npv: np.ndarray
+
+    @property
+    def terbaik(self):
+        """Indeks (i_pv, i_turbin) dengan NPV terbesar."""
+        return np.unravel_index(np.nanargmax(self.npv), self.npv.shape)
+
+
+def ukuran_hibrida(data_nasa, tagihan_bulanan, kapasitas_pv_kwp, jumlah_turbin, turbin='generik_1kw',
+                   param=ParameterAngin(), biaya_angin_per_w=BIAYA_ANGIN_PER_W,
+                   tahun=TAHUN_ANALISIS, inflasi=ASUMSI_INFLASI_LISTRIK):
+    """Evaluasi semua kombinasi PV x turbin untuk satu situs dalam satu operasi array.
+
+    Penghematan, payback dan NPV memakai rumus engine/optimasi (tarif PLN,
+    inflasi dan diskonto yang sama), jadi angkanya setara dengan jalur surya.
+    """
+    kapasitas_pv_kwp = np.asarray(kapasitas_pv_kwp, dtype=np.float64)
+    jumlah_turbin = np.asarray(jumlah_turbin, dtype=np.float64)
+    pv = simulasi(data_nasa, 1.0).energi_kwh                  # (jam,) per kWp
+    hasil_angin = simulasi_angin(data_nasa, [turbin], param)
+    angin = hasil_angin.energi_kwh[0]                          # (jam,) per turbin
+    jam = len(pv)
+
+    e_pv = kapasitas_pv_kwp[:, None] * pv.sum()
+    e_angin = jumlah_turbin[None, :] * angin.sum()
+    produksi_bulanan = (e_pv + e_angin) / jam * JAM_PER_TAHUN / 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        porsi_angin = np.where(produksi_bulanan > 0, e_angin / (e_pv + e_angin), 0.0)
+
+    # Jam "gelap" dihitung per kombinasi tanpa membentuk (pv, turbin, jam)
+    kapasitas_total = kapasitas_pv_kwp[:, None] + jumlah_turbin[None, :] * hasil_angin.kapasitas_kw[0]
+    ambang = 0.01 * kapasitas_total
+    jam_tanpa = np.empty(produksi_bulanan.shape)
+    for i, kwp in enumerate(kapasitas_pv_kwp):
+        gabung = kwp * pv[None, :] + jumlah_turbin[:, None] * angin[None, :]
+        jam_tanpa[i] = (gabung < ambang[i][:, None]).mean(axis=1)
+
+    biaya = kapasitas_pv_kwp[:, None] * 1000 * BIAYA_AWAL_PV_PER_Wp \
+        + jumlah_turbin[None, :] * hasil_angin.kapasitas_kw[0] * 1000 * biaya_angin_per_w
+    penghematan = produksi_bulanan * TARIF_PLN
+    tagihan_baru = np.maximum(tagihan_bulanan - penghematan, 0)
+    return HasilHibrida(
+        kapasitas_pv_kwp=kapasitas_pv_kwp,
+        jumlah_turbin=jumlah_turbin,
+        nama_turbin=hasil_angin.nama_turbin[0],
+        produksi_bulanan=produksi_bulanan,
+        porsi_angin=porsi_angin,
+        jam_tanpa_produksi=jam_tanpa,
+        biaya_instalasi=biaya,
+        penghematan_rp=np.minimum(penghematan, tagihan_bulanan),
+        payback_tahun=payback_tertutup(tagihan_bulanan, tagihan_baru, biaya, inflasi),
+        npv=npv_penghematan(tagihan_bulanan, tagihan_baru, biaya, tahun, inflasi),
+    )
+
+
+# --- RINGKASAN MULTI-SITUS, MULTI-TAHUN ---
+
+def _worker_ringkas(tugas):
+    """Dijalankan di proses worker: statistik angin satu file (bisa digabung antar tahun)."""
+    from analitik_nasa import kunci_situs
+    from nasa_power import baca_nasa_power
+
+    path, turbin, param = tugas
+    data = baca_nasa_power(path)
+    hasil = simulasi_angin(data, turbin, param)
+    valid = ~np.isnan(hasil.kecepatan_hub)
+    v = hasil.kecepatan_hub[valid]
+    return {
+        'kunci': kunci_situs(data.metadata.lintang, data.metadata.bujur),
+        'nama': Path(path).stem,
+        'lintang': data.metadata.lintang,
+        'bujur': data.metadata.bujur,
+        'tahun': sorted(set(data.waktu.astype('datetime64[Y]').astype(int) + 1970)),
+        'jam': int(valid.sum()),
+        'jumlah_v': float(v.sum()),
+        'jumlah_v2': float((v * v).sum()),
+        'energi_kwh': hasil.energi_kwh[:, valid].sum(axis=1),
+        'kapasitas_kw': hasil.kapasitas_kw,
+        'nama_turbin': hasil.nama_turbin,
+    }
+
+
+def ringkas_banyak(paths, turbin=tuple(KURVA_TURBIN), param=ParameterAngin(), workers=None):
+    """Tabel per situs x turbin (AEP, faktor kapasitas, Weibull) dari banyak file per jam.
+
+    File dengan koordinat sama (tahun berbeda) digabung menjadi satu situs.
+    """
+    import pandas as pd
+
+    tugas = [(str(p), tuple(turbin), param) for p in paths]
+    if len(tugas) > 1 and workers != 1:
+        with ProcessPoolExecutor(workers) as pool:
+            hasil = list(pool.map(_worker_ringkas, tugas))
+    else:
+        hasil = [_worker_ringkas(t) for t in tugas]
+
+    situs = {}
+    for h in hasil:
+        s = situs.setdefault(h['kunci'], {**h, 'tahun': [], 'jam': 0, 'jumlah_v': 0.0, 'jumlah_v2': 0.0,
+                                           'energi_kwh': np.zeros_like(h['energi_kwh'])})
+        s['tahun'] = sorted(set(s['tahun']) | set(h['tahun']))
+        for k in ('jam', 'jumlah_v', 'jumlah_v2', 'energi_kwh'):
+            s[k] = s[k] + h[k]
+
+    baris = []
+    for kunci, s in situs.items():
+        rata = s['jumlah_v'] / s['jam']
+        weibull = weibull_momen(rata, math.sqrt(max(s['jumlah_v2'] / s['jam'] - rata * rata, 0.0)))
+        aep = s['energi_kwh'] / s['jam'] * JAM_PER_TAHUN
+        for nama, e, kap in zip(s['nama_turbin'], aep, s['kapasitas_kw']):
+            baris.append({
+                'situs': s['nama'], 'kunci': kunci, 'lintang': s['lintang'], 'bujur': s['bujur'],
+                'tahun': f"{s['tahun'][0]}-{s['tahun'][-1]}", 'jam_data': s['jam'],
+                'v_hub_rata': rata, 'weibull_k': float(weibull.k), 'weibull_c': float(weibull.c),
+                'turbin': nama, 'aep_kwh': e, 'faktor_kapasitas': e / (kap * JAM_PER_TAHUN),
+            })
+    return pd.DataFrame(baris)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ringkasan energi angin banyak situs/tahun dari file NASA POWER")
+    sub = parser.add_subparsers(dest='perintah', required=True)
+    p = sub.add_parser('ringkas', help="AEP, faktor kapasitas dan Weibull per situs x turbin")
+    p.add_argument('sumber', nargs='+', help="Direktori atau file CSV NASA POWER")
+    p.add_argument('--turbin', action='append', choices=list(KURVA_TURBIN),
+                   help="Turbin yang dihitung (boleh diulang; default semua)")
+    p.add_argument('--tinggi', type=float, default=ParameterAngin.tinggi_hub, help="Tinggi hub (m)")
+    p.add_argument('--hukum', choices=HUKUM_PROFIL, default=ParameterAngin.hukum)
+    p.add_argument('--workers', type=int, default=None, help="Jumlah proses (default: semua core)")
+    p.add_argument('-o', '--output', help="Simpan tabel ke CSV (default: cetak)")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for sumber in args.sumber:
+        sumber = Path(sumber)
+        paths += sorted(sumber.rglob('*.csv')) if sumber.is_dir() else [sumber]
+    param = ParameterAngin(tinggi_hub=args.tinggi, hukum=args.hukum)
+    tabel = ringkas_banyak(paths, args.turbin or tuple(KURVA_TURBIN), param, args.workers)
+    if args.output:
+        tabel.to_csv(args.output, index=False)
+    else:
+        print(tabel.to_string(index=False, float_format=lambda x: f'{x:,.3f}'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
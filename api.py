@@ -0,0 +1,376 @@
+"""Layanan HTTP JSON ringan untuk perhitungan Solar Analyzer (tanpa Streamlit).
+
+Menjalankan:
+    python api.py --port 8000
+
+Endpoint:
+    GET  /kesehatan                 status + statistik micro-batch
+    GET  /provinsi                  metadata semua provinsi
+    GET  /provinsi/<nama>           metadata satu provinsi
+    POST /skenario                  {"provinsi", "tagihan_bulanan", "wp_modul", "jumlah_modul"}
+    POST /skenario/batch            {"skenario": [ {...}, ... ]}
+    POST /proyeksi                  sama dengan /skenario + biaya kumulatif per tahun
+
+Server memakai `asyncio` dari pustaka standar dan hanya mengimpor NumPy,
+jadi siap melayani dalam sepersekian detik. Permintaan /skenario dan
+/proyeksi yang datang berdekatan dikumpulkan (`PengumpulBatch`) lalu
+dihitung sekaligus lewat `batch.evaluasi_array`; hasilnya identik dengan
+angka kartu metrik di `project.py`.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+import numpy as np
+
+from batch import evaluasi_array
+from engine import (
+    FILE_DATA, TAHUN_ANALISIS, ASUMSI_INFLASI_LISTRIK, MAX_JUMLAH_MODUL, MAX_WP_MODUL,
+    baca_baris_provinsi, pola_musim, format_payback
+)
+from payback import kurva_kumulatif
+
+JENDELA_BATCH_DETIK = 0.002
+UKURAN_BATCH_MAKS = 4096
+BATAS_SKENARIO_BATCH = 100_000
+BATAS_BODY_BYTE = 16 * 1024 * 1024
+BATCH_DI_THREAD = 1000   # batch sebesar ini dihitung di thread agar event loop tetap melayani
+
+ALASAN_HTTP = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class GalatPermintaan(Exception):
+    """Kesalahan input yang dikembalikan ke klien sebagai JSON `{"error": ...}`."""
+
+    def __init__(self, pesan, status=400):
+        super().__init__(pesan)
+        self.status = status
+
+
+# --- DATA PROVINSI ---
+
+class DataProvinsi:
+    """Tabel provinsi untuk API: pencarian nama lewat dict (tanpa pandas)."""
+
+    def __init__(self, baris):
+        self.baris = baris
+        self.indeks = {nama: i for i, (nama, _, _) in enumerate(baris)}
+        self.indeks_kecil = {nama.strip().casefold(): i for i, (nama, _, _) in enumerate(baris)}
+
+    def cari(self, nama):
+        i = self.indeks.get(nama)
+        if i is None and isinstance(nama, str):
+            i = self.indeks_kecil.get(nama.strip().casefold())
+        if i is None:
+            raise GalatPermintaan(f"Provinsi tidak dikenal: {nama}", status=404)
+        return i
+
+    def metadata(self, i):
+        nama, radiasi, emisi = self.baris[i]
+        return {
+            'provinsi': nama,
+            'produksi_harian_kwh_per_kwp': radiasi,
+            'faktor_emisi_kg_per_kwh': emisi,
+            'zona_musim': pola_musim(nama)[0],
+        }
+
+
+def baca_skenario(data, item):
+    """Validasi satu objek skenario JSON menjadi (indeks provinsi, tagihan, wp, modul)."""
+    if not isinstance(item, dict):
+        raise GalatPermintaan("Skenario harus berupa objek JSON")
+    if 'provinsi' not in item:
+        raise GalatPermintaan("Field 'provinsi' wajib diisi")
+    try:
+        tagihan = float(item.get('tagihan_bulanan', 500000))
+        wp = item.get('wp_modul', 550)
+        modul = item.get('jumlah_modul', 4)
+        if not all(isinstance(x, int) and not isinstance(x, bool) for x in (wp, modul)):
+            raise ValueError
+    except (TypeError, ValueError):
+        raise GalatPermintaan("tagihan_bulanan harus angka; wp_modul dan jumlah_modul harus bilangan bulat")
+    if not (0 < tagihan < float('inf') and wp > 0 and modul > 0):
+        raise GalatPermintaan("tagihan_bulanan, wp_modul dan jumlah_modul harus lebih dari 0")
+    if wp > MAX_WP_MODUL or modul > MAX_JUMLAH_MODUL:
+        raise GalatPermintaan(f"wp_modul maksimal {MAX_WP_MODUL:,} dan jumlah_modul maksimal {MAX_JUMLAH_MODUL:,}")
+    return data.cari(item['provinsi']), tagihan, wp, modul
+
+
+def hitung_batch(data, daftar, dengan_proyeksi=False, tahun_analisis=TAHUN_ANALISIS):
+    """Evaluasi banyak skenario tervalidasi sekaligus; kembalikan list dict JSON."""
+    posisi = np.array([d[0] for d in daftar], dtype=np.int64)
+    radiasi = np.array([data.baris[i][1] for i in posisi.tolist()], dtype=np.float64)
+    emisi = np.array([data.baris[i][2] for i in posisi.tolist()], dtype=np.float64)
+    tagihan = np.array([d[1] for d in daftar], dtype=np.float64)
+    wp = np.array([d[2] for d in daftar], dtype=np.int64)
+    modul = np.array([d[3] for d in daftar], dtype=np.int64)
+
+    hasil = evaluasi_array(radiasi, emisi, tagihan, wp, modul, tahun_analisis=tahun_analisis)
+    kolom = {
+        'kapasitas_pv_kwp': hasil.kapasitas_pv_kwp.tolist(),
+        'produksi_pv_bulanan_kwh': hasil.produksi_pv_bulanan.tolist(),
+        'penghematan_rp': hasil.penghematan_rp.tolist(),
+        'tagihan_baru_rp': hasil.tagihan_baru.tolist(),
+        'biaya_instalasi_rp': hasil.biaya_instalasi_pv.tolist(),
+        'payback_tahun': hasil.payback_tahun.tolist(),
+        'skor_kemandirian': hasil.skor_kemandirian.tolist(),
+        'emisi_dicegah_kg_per_bulan': hasil.emisi_dicegah_total.tolist(),
+        'emisi_dicegah_total_ton': (hasil.emisi_dicegah_total * 12 * tahun_analisis / 1000).tolist(),
+    }
+    keluaran = [
+        {'provinsi': data.baris[i][0], 'tagihan_bulanan': t, 'wp_modul': w, 'jumlah_modul': m}
+        for i, t, w, m in zip(posisi.tolist(), tagihan.tolist(), wp.tolist(), modul.tolist())
+    ]
+    for nama, nilai in kolom.items():
+        for baris, v in zip(keluaran, nilai):
+            baris[nama] = v
+    for baris in keluaran:
+        baris['payback_teks'] = format_payback(baris['payback_tahun'], tahun_analisis)
+
+    if dengan_proyeksi:
+        tanpa, dengan = kurva_kumulatif(
+            tagihan, hasil.tagihan_baru, hasil.biaya_instalasi_pv,
+            tahun_analisis, ASUMSI_INFLASI_LISTRIK
+        )
+        tahun = list(range(1, tahun_analisis + 1))
+        for baris, a, b in zip(keluaran, tanpa.tolist(), dengan.tolist()):
+            baris['proyeksi'] = {'tahun': tahun, 'tanpa_pv': a, 'dengan_pv': b,
+                                 'total_hemat': a[-1] - b[-1]}
+    return keluaran
+
+
+# --- MICRO-BATCHING ---
+
+class PengumpulBatch:
+    """Kumpulkan skenario tunggal selama `jendela` detik lalu hitung sebagai satu batch."""
+
+    def __init__(self, data, jendela=JENDELA_BATCH_DETIK, ukuran_maks=UKURAN_BATCH_MAKS):
+        self.data = data
+        self.jendela = jendela
+        self.ukuran_maks = ukuran_maks
+        self.antrean = asyncio.Queue()
+        self.jumlah_batch = 0
+        self.jumlah_skenario = 0
+        self._tugas = None
+
+    def mulai(self):
+        self._tugas = asyncio.get_running_loop().create_task(self._jalan())
+
+    async def hitung(self, skenario, dengan_proyeksi=False):
+        masa_depan = asyncio.get_running_loop().create_future()
+        await self.antrean.put((skenario, dengan_proyeksi, masa_depan))
+        return await masa_depan
+
+    async def _jalan(self):
+        while True:
+            kumpulan = [await self.antrean.get()]
+            if self.jendela > 0:
+                await asyncio.sleep(self.jendela)
+            while len(kumpulan) < self.ukuran_maks and not self.antrean.empty():
+                kumpulan.append(self.antrean.get_nowait())
+
+            try:
+                keluaran = hitung_batch(
+                    self.data, [k[0] for k in kumpulan],
+                    dengan_proyeksi=any(k[1] for k in kumpulan)
+                )
+            except Exception:
+                # Jangan biarkan satu skenario menggagalkan yang lain: ulangi per skenario
+                keluaran = []
+                for skenario, proyeksi, masa_depan in kumpulan:
+                    try:
+                        keluaran.append(hitung_batch(self.data, [skenario], dengan_proyeksi=proyeksi)[0])
+                    except Exception as e:
+                        keluaran.append(None)
+                        if not masa_depan.done():
+                            masa_depan.set_exception(e)
+
+            self.jumlah_batch += 1
+            self.jumlah_skenario += len(kumpulan)
+            for (_, proyeksi, masa_depan), hasil in zip(kumpulan, keluaran):
+                if hasil is None:
+                    continue
+                if not proyeksi:
+                    hasil.pop('proyeksi', None)
+                if not masa_depan.done():
+                    masa_depan.set_result(hasil)
+
+    def statistik(self):
+        return {
+            'batch': self.jumlah_batch,
+            'skenario': self.jumlah_skenario,
+            'rata_rata_ukuran_batch': self.jumlah_skenario / self.jumlah_batch if self.jumlah_batch else 0.0,
+        }
+
+
+# --- HTTP ---
+
+class Layanan:
+    """Routing endpoint JSON di atas `asyncio.start_server`."""
+
+    def __init__(self, data, jendela=JENDELA_BATCH_DETIK):
+        self.data = data
+        self.pengumpul = PengumpulBatch(data, jendela)
+
+    async def tangani(self, metode, path, body):
+        bagian = [unquote(p) for p in urlsplit(path).path.strip('/').split('/') if p]
+
+        if bagian == ['kesehatan']:
+            self._wajib(metode, 'GET')
+            return {'status': 'ok', 'jumlah_provinsi': len(self.data.baris),
+                    'micro_batch': self.pengumpul.statistik()}
+
+        if bagian and bagian[0] == 'provinsi' and len(bagian) <= 2:
+            self._wajib(metode, 'GET')
+            if len(bagian) == 1:
+                return {'provinsi': [self.data.metadata(i) for i in range(len(self.data.baris))]}
+            return self.data.metadata(self.data.cari(bagian[1]))
+
+        if bagian in (['skenario'], ['proyeksi']):
+            self._wajib(metode, 'POST')
+            skenario = baca_skenario(self.data, self._json(body))
+            return await self.pengumpul.hitung(skenario, dengan_proyeksi=bagian[0] == 'proyeksi')
+
+        if bagian == ['skenario', 'batch']:
+            self._wajib(metode, 'POST')
+            isi = self._json(body)
+            daftar = isi.get('skenario') if isinstance(isi, dict) else isi
+            if not isinstance(daftar, list):
+                raise GalatPermintaan("Body harus berisi list 'skenario'")
+            if len(daftar) > BATAS_SKENARIO_BATCH:
+                raise GalatPermintaan(f"Maksimal {BATAS_SKENARIO_BATCH} skenario per permintaan", status=413)
+            if len(daftar) >= BATCH_DI_THREAD:
+                hasil = await asyncio.get_running_loop().run_in_executor(None, self._hitung_daftar, daftar)
+            else:
+                hasil = self._hitung_daftar(daftar)
+            return {'hasil': hasil}
+
+        raise GalatPermintaan(f"Endpoint tidak ditemukan: {path}", status=404)
+
+    def _hitung_daftar(self, daftar):
+        tervalidasi = []
+        for i, item in enumerate(daftar):
+            try:
+                tervalidasi.append(baca_skenario(self.data, item))
+            except GalatPermintaan as e:
+                raise GalatPermintaan(f"skenario[{i}]: {e}", e.status)
+        return hitung_batch(self.data, tervalidasi) if tervalidasi else []
+
+    @staticmethod
+    def _wajib(metode, diharapkan):
+        if metode != diharapkan:
+            raise GalatPermintaan(f"Gunakan {diharapkan}", status=405)
+
+    @staticmethod
+    def _json(body):
+        try:
+            return json.loads(body or b'{}')
+        except ValueError:
+            raise GalatPermintaan("Body bukan JSON yang valid")
+
+    async def koneksi(self, reader, writer):
+        """Layani satu koneksi HTTP/1.1 (keep-alive) sampai klien menutupnya."""
+        try:
+            while True:
+                baris_awal = await reader.readline()
+                if not baris_awal:
+                    break
+                try:
+                    metode, path, versi = baris_awal.decode('latin-1').split()
+                except ValueError:
+                    await self._kirim(writer, 400, {'error': 'Baris permintaan tidak valid'}, False)
+                    break
+
+                header = {}
+                while True:
+                    baris = await reader.readline()
+                    if baris in (b'\r\n', b'\n', b''):
+                        break
+                    nama, _, nilai = baris.decode('latin-1').partition(':')
+                    header[nama.strip().lower()] = nilai.strip()
+
+                koneksi = header.get('connection', '').lower()
+                tetap_hidup = koneksi == 'keep-alive' if versi == 'HTTP/1.0' else koneksi != 'close'
+
+                try:
+                    panjang = int(header.get('content-length', 0) or 0)
+                except ValueError:
+                    panjang = -1
+                if panjang < 0:
+                    # Tanpa panjang yang sah batas permintaan berikutnya tidak diketahui
+                    await self._kirim(writer, 400, {'error': 'Content-Length tidak valid'}, False)
+                    break
+                if panjang > BATAS_BODY_BYTE:
+                    await self._kirim(writer, 413, {'error': 'Body terlalu besar'}, False)
+                    break
+                body = await reader.readexactly(panjang) if panjang else b''
+
+                try:
+                    status, isi = 200, await self.tangani(metode.upper(), path, body)
+                except GalatPermintaan as e:
+                    status, isi = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, isi = 500, {'error': f"{type(e).__name__}: {e}"}
+
+                await self._kirim(writer, status, isi, tetap_hidup)
+                if not tetap_hidup:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _kirim(writer, status, isi, tetap_hidup):
+        body = json.dumps(isi, ensure_ascii=False).encode('utf-8')
+        kepala = (
+            f"HTTP/1.1 {status} {ALASAN_HTTP.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if tetap_hidup else 'close'}\r\n\r\n"
+        )
+        writer.write(kepala.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def jalankan_server(host='127.0.0.1', port=8000, path_data=None, jendela=JENDELA_BATCH_DETIK,
+                          siap=None):
+    """Muat data provinsi lalu layani HTTP sampai dibatalkan."""
+    if path_data is None:
+        path_data = FILE_DATA if Path(FILE_DATA).exists() else Path(__file__).parent / FILE_DATA
+    layanan = Layanan(DataProvinsi(baca_baris_provinsi(path_data)), jendela)
+    layanan.pengumpul.mulai()
+    server = await asyncio.start_server(layanan.koneksi, host, port)
+    if siap is not None:
+        siap(server)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP JSON Solar Analyzer")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--data', default=None, help=f"CSV provinsi (default: {FILE_DATA})")
+    parser.add_argument('--jendela-ms', type=float, default=JENDELA_BATCH_DETIK * 1000,
+                        help="Lama menunggu permintaan lain sebelum batch dihitung (0 = langsung)")
+    args = parser.parse_args(argv)
+
+    def siap(server):
+        alamat = ', '.join(str(s.getsockname()[:2]) for s in server.sockets)
+        print(f"Solar Analyzer API siap di {alamat}", file=sys.stderr)
+
+    try:
+        asyncio.run(jalankan_server(args.host, args.port, args.data, args.jendela_ms / 1000, siap))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Evaluasi skenario massal dengan broadcasting NumPy.
+
+Rumus di sini sama persis (urutan operasi floating-point yang sama) dengan
+`engine.hitung_skenario`, sehingga setiap sel grid identik dengan hasil
+jalur skalar yang ditampilkan `project.py`.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from engine import (
+    TARIF_PLN, WP_CHOICES, MIN_PV_MODULES, MAX_PV_MODULES, TAHUN_ANALISIS,
+    ASUMSI_INFLASI_LISTRIK, BIAYA_AWAL_PV_PER_Wp, HARI_PER_BULAN
+)
+from payback import payback_langkah
+
+SUMBU_GRID = ('provinsi', 'wp_modul', 'jumlah_modul', 'tagihan_bulanan')
+
+
+@dataclass(frozen=True)
+class HasilBatch:
+    """Output per skenario; semua array memiliki bentuk broadcast yang sama."""
+    kapasitas_pv_kwp: np.ndarray
+    produksi_pv_bulanan: np.ndarray
+    penghematan_rp: np.ndarray
+    tagihan_baru: np.ndarray
+    biaya_instalasi_pv: np.ndarray
+    payback_tahun: np.ndarray
+    skor_kemandirian: np.ndarray
+    emisi_dicegah_total: np.ndarray
+
+    @property
+    def shape(self):
+        return self.penghematan_rp.shape
+
+
+def evaluasi_array(radiasi_harian, faktor_emisi, tagihan_bulanan, wp_modul, jumlah_modul,
+                   tahun_analisis=TAHUN_ANALISIS):
+    """Hitung skenario elemen-per-elemen untuk input yang bisa di-broadcast."""
+    radiasi_harian = np.asarray(radiasi_harian, dtype=np.float64)
+    faktor_emisi = np.asarray(faktor_emisi, dtype=np.float64)
+    tagihan_bulanan = np.asarray(tagihan_bulanan, dtype=np.float64)
+    kapasitas_pv_wp = np.multiply(wp_modul, jumlah_modul, dtype=np.int64)
+
+    shape = np.broadcast_shapes(radiasi_harian.shape, faktor_emisi.shape,
+                                tagihan_bulanan.shape, kapasitas_pv_wp.shape)
+    kapasitas_pv_kwp = kapasitas_pv_wp / 1000.0
+
+    # B. Perhitungan Konsumsi & Produksi
+    konsumsi_kwh = tagihan_bulanan / TARIF_PLN
+    produksi_pv_bulanan = radiasi_harian * kapasitas_pv_kwp * HARI_PER_BULAN
+
+    # C. Hitung Output Kritis Bulanan
+    penghematan_rp = produksi_pv_bulanan * TARIF_PLN
+    emisi_dicegah_total = produksi_pv_bulanan * faktor_emisi
+    skor_kemandirian = np.minimum((produksi_pv_bulanan / konsumsi_kwh) * 100, 100)
+    tagihan_baru = np.maximum(tagihan_bulanan - penghematan_rp, 0)
+
+    # D. Payback (kurva kumulatif vektor, lihat payback.py)
+    biaya_instalasi_pv = (kapasitas_pv_wp * BIAYA_AWAL_PV_PER_Wp).astype(np.float64)
+    payback_tahun = payback_langkah(
+        tagihan_bulanan, tagihan_baru, biaya_instalasi_pv,
+        tahun_analisis, ASUMSI_INFLASI_LISTRIK
+    ).astype(np.int16)
+
+    return HasilBatch(
+        kapasitas_pv_kwp=np.broadcast_to(kapasitas_pv_kwp, shape),
+        produksi_pv_bulanan=np.broadcast_to(produksi_pv_bulanan, shape),
+        penghematan_rp=np.broadcast_to(penghematan_rp, shape),
+        tagihan_baru=np.broadcast_to(tagihan_baru, shape),
+        biaya_instalasi_pv=np.broadcast_to(biaya_instalasi_pv, shape),
+        payback_tahun=payback_tahun,
+        skor_kemandirian=np.broadcast_to(skor_kemandirian, shape),
+        emisi_dicegah_total=np.broadcast_to(emisi_dicegah_total, shape),
+    )
+
+
+@dataclass(frozen=True)
+class HasilGrid:
+    """Hasil grid provinsi x Wp x jumlah modul x tagihan beserta label sumbunya."""
+    provinsi: np.ndarray
+    wp_modul: np.ndarray
+    jumlah_modul: np.ndarray
+    tagihan_bulanan: np.ndarray
+    hasil: HasilBatch
+
+    def ke_dataframe(self):
+        """Ratakan grid menjadi tabel panjang (satu baris per kombinasi)."""
+        import pandas as pd
+
+        idx = pd.MultiIndex.from_product(
+            [self.provinsi, self.wp_modul, self.jumlah_modul, self.tagihan_bulanan],
+            names=['Provinsi', 'Wp_Modul', 'Jumlah_Modul', 'Tagihan_Bulanan']
+        )
+        kolom = {
+            'Kapasitas_kWp': self.hasil.kapasitas_pv_kwp,
+            'Produksi_Bulanan_kWh': self.hasil.produksi_pv_bulanan,
+            'Penghematan_Rp': self.hasil.penghematan_rp,
+            'Tagihan_Baru_Rp': self.hasil.tagihan_baru,
+            'Biaya_Instalasi_Rp': self.hasil.biaya_instalasi_pv,
+            'Payback_Tahun': self.hasil.payback_tahun,
+            'Skor_Kemandirian': self.hasil.skor_kemandirian,
+            'Emisi_Dicegah_kg': self.hasil.emisi_dicegah_total,
+        }
+        return pd.DataFrame({k: v.ravel() for k, v in kolom.items()}, index=idx).reset_index()
+
+    def keuangan(self, param=None, tarif=TARIF_PLN, hitung_irr=True):
+        """Metrik arus kas bulanan (NPV, IRR, LCOE, payback terdiskonto) untuk setiap sel grid."""
+        from keuangan import ParameterKeuangan, analisis_keuangan
+
+        kapasitas_pv_wp = self.wp_modul[None, :, None, None] * self.jumlah_modul[None, None, :, None]
+        return analisis_keuangan(self.tagihan_bulanan, self.hasil.produksi_pv_bulanan, kapasitas_pv_wp,
+                                 tarif, param or ParameterKeuangan(), hitung_irr)
+
+
+def evaluasi_grid(data_solar, tagihan_bulanan, wp_modul=WP_CHOICES,
+                  jumlah_modul=range(MIN_PV_MODULES, MAX_PV_MODULES + 1),
+                  tahun_analisis=TAHUN_ANALISIS):
+    """Evaluasi seluruh kombinasi provinsi x Wp x modul x tagihan dalam satu panggilan."""
+    provinsi = data_solar['Provinsi'].to_numpy()
+    radiasi = data_solar['Produksi_Harian_kWh'].to_numpy(dtype=np.float64)
+    emisi = data_solar['Faktor_Emisi_kg_per_kWh'].to_numpy(dtype=np.float64)
+    wp_modul = np.asarray(wp_modul, dtype=np.int64)
+    jumlah_modul = np.asarray(jumlah_modul, dtype=np.int64)
+    tagihan_bulanan = np.atleast_1d(np.asarray(tagihan_bulanan, dtype=np.float64))
+
+    hasil = evaluasi_array(
+        radiasi[:, None, None, None],
+        emisi[:, None, None, None],
+        tagihan_bulanan[None, None, None, :],
+        wp_modul[None, :, None, None],
+        jumlah_modul[None, None, :, None],
+        tahun_analisis=tahun_analisis,
+    )
+    return HasilGrid(provinsi, wp_modul, jumlah_modul, tagihan_bulanan, hasil)
@@ -0,0 +1,137 @@
+"""Simulasi dispatch baterai di atas neraca PV/beban per jam.
+
+Rekursi state-of-charge bersifat berurutan terhadap waktu, jadi loop
+berjalan per jam, tetapi setiap langkahnya vektor untuk seluruh batch
+(rumah tangga x ukuran baterai). Biaya per langkah tetap beberapa
+mikrodetik, sehingga sapuan puluhan ukuran baterai sekaligus tetap
+interaktif. Hasilnya berbentuk `HasilKonsumsiMandiri` agar bisa langsung
+dipakai untuk penghematan dan payback seperti jalur tanpa baterai.
+"""
+
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from engine import TARIF_PLN, TAHUN_ANALISIS, ASUMSI_INFLASI_LISTRIK
+from konsumsi_mandiri import ATURAN_EKSPOR, HasilKonsumsiMandiri, faktor_bulan_30, hitung_tagihan
+from payback import payback_langkah
+
+STRATEGI_DISPATCH = ('greedy', 'tou')
+JAM_PUNCAK = (17, 22)   # jam mulai (inklusif) dan akhir (eksklusif) beban puncak
+
+
+@dataclass(frozen=True)
+class ParameterBaterai:
+    """Spesifikasi baterai; setiap field boleh skalar atau array (untuk sapuan)."""
+    kapasitas_kwh: float = 5.0
+    efisiensi_bolak_balik: float = 0.90
+    daya_isi_kw: float = 2.5
+    daya_buang_kw: float = 2.5
+    kedalaman_buang: float = 0.80       # DoD: bagian kapasitas yang boleh dipakai
+    biaya_per_kwh: float = 8_000_000    # Rp per kWh terpasang
+
+
+def simulasi_baterai(waktu, beban, pv, param=ParameterBaterai(), strategi='greedy',
+                     aturan=ATURAN_EKSPOR['tanpa_ekspor'], tarif=TARIF_PLN):
+    """Jalankan dispatch baterai untuk batch (n, jam); kembalikan `HasilKonsumsiMandiri`.
+
+    `beban` dan `pv` berbentuk (jam,) atau (n, jam); field `param` di-broadcast ke (n,).
+    Strategi 'greedy' mengisi dari surplus PV dan membuang kapan pun ada defisit;
+    'tou' hanya membuang pada `JAM_PUNCAK` dan menahan energi di luar jam itu.
+    """
+    if strategi not in STRATEGI_DISPATCH:
+        raise ValueError(f"Strategi tidak dikenal: {strategi}")
+
+    beban = np.atleast_2d(np.asarray(beban, dtype=np.float64))
+    pv = np.atleast_2d(np.asarray(pv, dtype=np.float64))
+    kolom_param = [np.atleast_1d(np.asarray(getattr(param, f), dtype=np.float64))
+                   for f in ('kapasitas_kwh', 'efisiensi_bolak_balik', 'daya_isi_kw',
+                             'daya_buang_kw', 'kedalaman_buang')]
+    n = max(beban.shape[0], pv.shape[0], *(len(p) for p in kolom_param))
+    beban = np.broadcast_to(beban, (n, beban.shape[-1]))
+    pv = np.broadcast_to(pv, (n, pv.shape[-1]))
+    kapasitas, efisiensi, daya_isi, daya_buang, dod = (np.broadcast_to(p, (n,)) for p in kolom_param)
+
+    # Rugi bolak-balik dibagi rata antara pengisian dan pembuangan
+    eta = np.sqrt(efisiensi)
+    soc_min = kapasitas * (1 - dod)
+    soc = soc_min.copy()
+
+    jam = waktu.astype(np.int64) % 24
+    bulan = waktu.astype('datetime64[M]').astype(np.int64) % 12
+    boleh_buang = np.ones(len(waktu), dtype=bool)
+    if strategi == 'tou':
+        boleh_buang = (jam >= JAM_PUNCAK[0]) & (jam < JAM_PUNCAK[1])
+
+    # Bagian tanpa baterai dihitung sekaligus; loop hanya untuk rekursi SoC
+    surplus_semua = pv - beban
+    impor = np.maximum(-surplus_semua, 0.0).T.copy()
+    ekspor = np.maximum(surplus_semua, 0.0).T.copy()
+    surplus_t = np.ascontiguousarray(surplus_semua.T)
+
+    for t in range(len(waktu)):
+        surplus = surplus_t[t]
+        isi = np.minimum(np.minimum(np.maximum(surplus, 0.0), daya_isi), (kapasitas - soc) / eta)
+        soc += isi * eta
+        ekspor[t] -= isi
+        if boleh_buang[t]:
+            buang = np.minimum(np.minimum(np.maximum(-surplus, 0.0), daya_buang), (soc - soc_min) * eta)
+            soc -= buang / eta
+            impor[t] -= buang
+
+    satu_panas = np.zeros((len(waktu), 12))
+    satu_panas[np.arange(len(waktu)), bulan] = 1.0
+    beban_bulanan = beban @ satu_panas
+    pv_bulanan = pv @ satu_panas
+    impor_bulanan = impor.T @ satu_panas
+    ekspor_bulanan = ekspor.T @ satu_panas
+
+    return HasilKonsumsiMandiri(
+        beban_bulanan=beban_bulanan,
+        pv_bulanan=pv_bulanan,
+        mandiri_bulanan=beban_bulanan - impor_bulanan,
+        ekspor_bulanan=ekspor_bulanan,
+        impor_bulanan=impor_bulanan,
+        tagihan_tanpa_pv=beban_bulanan * tarif,
+        tagihan_dengan_pv=hitung_tagihan(impor_bulanan, ekspor_bulanan, aturan, tarif),
+    )
+
+
+@dataclass(frozen=True)
+class HasilSapuanBaterai:
+    """Penghematan dan payback untuk setiap ukuran baterai yang disapu."""
+    kapasitas_kwh: np.ndarray
+    penghematan_bulanan: np.ndarray
+    tagihan_baru: np.ndarray
+    biaya_total: np.ndarray
+    payback_tahun: np.ndarray
+    skor_kemandirian: np.ndarray
+
+
+def sapu_kapasitas(waktu, beban, pv, kapasitas_kwh, biaya_pv, tagihan_bulanan,
+                   param=ParameterBaterai(), c_rate=0.5, strategi='greedy',
+                   aturan=ATURAN_EKSPOR['tanpa_ekspor'], tarif=TARIF_PLN, tahun_analisis=TAHUN_ANALISIS):
+    """Evaluasi banyak ukuran baterai untuk satu rumah tangga dalam satu kali simulasi.
+
+    Daya isi/buang tiap ukuran diskalakan `c_rate` x kapasitas. Penghematan dilaporkan per
+    bulan 30 hari (`faktor_bulan_30`), basis yang sama dengan `tagihan_bulanan`.
+    """
+    kapasitas_kwh = np.asarray(kapasitas_kwh, dtype=np.float64)
+    param = replace(param, kapasitas_kwh=kapasitas_kwh,
+                    daya_isi_kw=c_rate * kapasitas_kwh, daya_buang_kw=c_rate * kapasitas_kwh)
+
+    hasil = simulasi_baterai(waktu, beban, pv, param, strategi, aturan, tarif)
+    biaya_total = biaya_pv + kapasitas_kwh * param.biaya_per_kwh
+    penghematan_bulanan = hasil.penghematan_bulanan * faktor_bulan_30(waktu)
+    tagihan_baru = np.maximum(tagihan_bulanan - penghematan_bulanan, 0)
+    payback_tahun = payback_langkah(
+        tagihan_bulanan, tagihan_baru, biaya_total, tahun_analisis, ASUMSI_INFLASI_LISTRIK
+    )
+    return HasilSapuanBaterai(
+        kapasitas_kwh=kapasitas_kwh,
+        penghematan_bulanan=penghematan_bulanan,
+        tagihan_baru=tagihan_baru,
+        biaya_total=biaya_total,
+        payback_tahun=payback_tahun,
+        skor_kemandirian=hasil.skor_kemandirian,
+    )
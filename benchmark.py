@@ -0,0 +1,331 @@
+"""Benchmark jalur perhitungan & tampilan, dengan baseline tersimpan sebagai gerbang regresi.
+
+Contoh:
+    python benchmark.py                         # jalankan semua kasus, tampilkan tabel
+    python benchmark.py --simpan                # jalankan lalu timpa benchmark_baseline.json
+    python benchmark.py --bandingkan            # exit code 1 jika ada kasus yang melambat
+    python benchmark.py -k batch -k nasa        # hanya kasus yang namanya mengandung 'batch'/'nasa'
+
+Setiap kasus memisahkan persiapan (baca file, bangun input) dari bagian yang
+diukur. Bagian yang diukur dipanggil sekali sebagai pemanasan, lalu diulang
+sampai minimal `putaran_min` kali dan `WAKTU_MIN_DETIK` detik; yang dicatat
+adalah median (tahan terhadap lonjakan sesaat) beserta min dan jumlah putaran.
+
+Gerbang regresi membandingkan median dengan baseline: kasus dianggap melambat
+jika lebih lambat dari `(1 + toleransi) x baseline` *dan* selisihnya di atas
+`AMBANG_ABSOLUT_DETIK` (agar kasus mikrodetik tidak gagal karena derau).
+Kasus ujung-ke-ujung yang berderau (mis. rerun Streamlit) mendaftarkan
+toleransi sendiri lewat `@kasus(..., toleransi=...)`; yang dipakai adalah
+yang lebih longgar antara toleransi kasus dan `--toleransi`.
+Baseline bergantung pada mesin; simpan ulang dengan `--simpan` di mesin CI/
+deploy yang sama sebelum dipakai sebagai gerbang.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+AKAR = Path(__file__).resolve().parent
+FILE_BASELINE = AKAR / 'benchmark_baseline.json'
+WAKTU_MIN_DETIK = 0.5
+PUTARAN_MAKS = 2000
+TOLERANSI = 0.25
+AMBANG_ABSOLUT_DETIK = 0.002
+SEED = 2024
+
+
+@dataclass(frozen=True)
+class HasilUkur:
+    """Ringkasan waktu satu kasus (detik)."""
+    median: float
+    minimum: float
+    rata: float
+    putaran: int
+
+
+# --- KASUS BENCHMARK ---
+# Setiap fungsi `_siapkan_*` melakukan persiapan lalu mengembalikan callable yang diukur.
+
+KASUS = {}
+
+
+def kasus(nama, putaran_min=5, toleransi=None):
+    def daftar(fungsi):
+        KASUS[nama] = (fungsi, putaran_min, toleransi)
+        return fungsi
+    return daftar
+
+
+def _data_provinsi():
+    from engine import FILE_DATA, baca_data_provinsi
+
+    return baca_data_provinsi(AKAR / FILE_DATA)
+
+
+def _input_acak(n):
+    """n skenario acak (radiasi, emisi, tagihan, Wp, modul) dengan seed tetap."""
+    from engine import WP_CHOICES, MIN_PV_MODULES, MAX_PV_MODULES
+
+    data = _data_provinsi()
+    rng = np.random.default_rng(SEED)
+    posisi = rng.integers(0, len(data), n)
+    return (
+        data['Produksi_Harian_kWh'].to_numpy(dtype=np.float64)[posisi],
+        data['Faktor_Emisi_kg_per_kWh'].to_numpy(dtype=np.float64)[posisi],
+        rng.uniform(100_000, 5_000_000, n).round(-3),
+        rng.choice(WP_CHOICES, n),
+        rng.integers(MIN_PV_MODULES, MAX_PV_MODULES + 1, n),
+    )
+
+
+@kasus('referensi_muat')
+def _siapkan_referensi():
+    """Pembukaan dataset referensi (pengganti load_data di project.py)."""
+    from referensi import referensi_bawaan
+
+    referensi_bawaan()  # pastikan dataset sudah dibangun; yang diukur hanya pembukaan
+    return referensi_bawaan
+
+
+@kasus('engine_skalar')
+def _siapkan_engine():
+    """Satu skenario dashboard: hitung_skenario termasuk loop payback."""
+    from engine import InputSkenario, hitung_skenario
+
+    inp = InputSkenario.dari_data(_data_provinsi(), 'Jawa Barat', 500_000, 550, 4)
+    return lambda: hitung_skenario(inp)
+
+
+@kasus('grafik_plotly')
+def _siapkan_grafik():
+    """Bangun + serialisasi JSON keempat figure plotly dashboard."""
+    from engine import InputSkenario, hitung_skenario
+    from grafik import TampilanSkenario
+
+    inp = InputSkenario.dari_data(_data_provinsi(), 'Jawa Barat', 500_000, 550, 4)
+    hasil = hitung_skenario(inp)
+
+    def jalankan():
+        skenario = TampilanSkenario(inp, hasil)  # properti di-cache per objek, jadi buat baru
+        for fig in (skenario.fig_bar, skenario.fig_proj, skenario.fig_monthly, skenario.fig_donut):
+            fig.to_json()
+    return jalankan
+
+
+@kasus('tabel_arrow')
+def _siapkan_tabel():
+    """Serialisasi Arrow kedua st.table di tab Detail Teknis."""
+    from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+    from engine import InputSkenario, hitung_skenario
+    from grafik import TampilanSkenario
+
+    inp = InputSkenario.dari_data(_data_provinsi(), 'Jawa Barat', 500_000, 550, 4)
+    skenario = TampilanSkenario(inp, hitung_skenario(inp))
+    tabel = (skenario.data_sistem, skenario.data_finansial)
+    return lambda: [convert_pandas_df_to_arrow_bytes(df) for df in tabel]
+
+
+@kasus('batch_1e3')
+def _siapkan_batch_kecil():
+    from batch import evaluasi_array
+
+    argumen = _input_acak(1_000)
+    return lambda: evaluasi_array(*argumen)
+
+
+@kasus('batch_1e6', putaran_min=3)
+def _siapkan_batch_besar():
+    from batch import evaluasi_array
+
+    argumen = _input_acak(1_000_000)
+    return lambda: evaluasi_array(*argumen)
+
+
+@kasus('keuangan_1e3')
+def _siapkan_keuangan():
+    from batch import evaluasi_array
+    from keuangan import analisis_keuangan
+
+    radiasi, emisi, tagihan, wp, modul = _input_acak(1_000)
+    hasil = evaluasi_array(radiasi, emisi, tagihan, wp, modul)
+    return lambda: analisis_keuangan(tagihan, hasil.produksi_pv_bulanan, wp * modul)
+
+
+@kasus('nasa_parse')
+def _siapkan_nasa_parse():
+    """Parsing CSV NASA POWER tanpa cache (unggahan pertama di code.py)."""
+    from engine import FILE_NASA
+    from nasa_power import baca_nasa_power
+
+    isi = (AKAR / FILE_NASA).read_bytes()
+    return lambda: baca_nasa_power(isi, cache_dir=None)
+
+
+@kasus('nasa_cache')
+def _siapkan_nasa_cache():
+    """Pemuatan ulang dari cache NPZ (unggahan berikutnya)."""
+    from engine import FILE_NASA
+    from nasa_power import baca_nasa_power
+
+    isi = (AKAR / FILE_NASA).read_bytes()
+    direktori = tempfile.mkdtemp(prefix='bench_nasa_')
+    baca_nasa_power(isi, cache_dir=direktori)
+    return lambda: baca_nasa_power(isi, cache_dir=direktori)
+
+
+@kasus('code_harian')
+def _siapkan_code_harian():
+    """Datetime WIB + agregasi harian di code.py (bagian 4-5)."""
+    from analitik_nasa import agregasi_harian
+    from engine import FILE_NASA
+    from nasa_power import baca_nasa_power
+
+    data = baca_nasa_power(AKAR / FILE_NASA, cache_dir=None)
+
+    def jalankan():
+        data.ke_dataframe(tz='Asia/Jakarta')
+        agregasi_harian(data)
+    return jalankan
+
+
+@kasus('apptest_rerun', putaran_min=15, toleransi=0.6)
+def _siapkan_apptest():
+    """Rerun penuh project.py secara headless (cache Streamlit sudah hangat)."""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(AKAR)
+    at = AppTest.from_file(str(AKAR / 'project.py'), default_timeout=120).run()
+    if at.exception:
+        raise RuntimeError(f'project.py gagal dijalankan: {at.exception[0].message}')
+    return at.run
+
+
+# --- PENGUKURAN ---
+
+def ukur(fungsi, putaran_min=5, waktu_min=WAKTU_MIN_DETIK):
+    """Median/min/rata waktu `fungsi()` setelah satu kali pemanasan."""
+    fungsi()
+    waktu = []
+    mulai = time.perf_counter()
+    while len(waktu) < PUTARAN_MAKS and (len(waktu) < putaran_min or time.perf_counter() - mulai < waktu_min):
+        t0 = time.perf_counter()
+        fungsi()
+        waktu.append(time.perf_counter() - t0)
+    return HasilUkur(statistics.median(waktu), min(waktu), statistics.fmean(waktu), len(waktu))
+
+
+def jalankan_semua(filter_nama=(), waktu_min=WAKTU_MIN_DETIK):
+    hasil = {}
+    for nama, (siapkan, putaran_min, _) in KASUS.items():
+        if filter_nama and not any(f in nama for f in filter_nama):
+            continue
+        hasil[nama] = ukur(siapkan(), putaran_min, waktu_min)
+        print(f'  {nama:<16} {_format_waktu(hasil[nama].median):>10}  ({hasil[nama].putaran} putaran)',
+              file=sys.stderr)
+    return hasil
+
+
+def info_mesin():
+    import pandas as pd
+    import streamlit
+
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'streamlit': streamlit.__version__,
+        'mesin': platform.machine(),
+        'cpu': os.cpu_count(),
+    }
+
+
+def simpan_baseline(hasil, path=FILE_BASELINE):
+    lama = muat_baseline(path) or {'kasus': {}}
+    lama['kasus'].update({nama: asdict(h) for nama, h in hasil.items()})
+    isi = {'dibuat': time.strftime('%Y-%m-%d %H:%M:%S'), 'mesin': info_mesin(), 'kasus': lama['kasus']}
+    Path(path).write_text(json.dumps(isi, indent=2, sort_keys=True) + '\n', encoding='utf-8')
+
+
+def muat_baseline(path=FILE_BASELINE):
+    path = Path(path)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def bandingkan(hasil, baseline, toleransi=TOLERANSI, ambang=AMBANG_ABSOLUT_DETIK):
+    """Daftar (nama, baru, lama, rasio, melambat) untuk kasus yang ada di baseline."""
+    baris = []
+    for nama, h in hasil.items():
+        lama = baseline['kasus'].get(nama)
+        if lama is None:
+            baris.append((nama, h.median, None, None, False))
+            continue
+        rasio = h.median / lama['median']
+        batas = max(toleransi, KASUS[nama][2] or 0.0) if nama in KASUS else toleransi
+        melambat = rasio > 1 + batas and h.median - lama['median'] > ambang
+        baris.append((nama, h.median, lama['median'], rasio, melambat))
+    return baris
+
+
+def _format_waktu(detik):
+    if detik < 1e-3:
+        return f'{detik * 1e6:.1f} µs'
+    if detik < 1:
+        return f'{detik * 1e3:.2f} ms'
+    return f'{detik:.3f} s'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='filter', action='append', default=[],
+                        help='hanya kasus yang namanya mengandung teks ini (boleh diulang)')
+    parser.add_argument('--simpan', action='store_true', help='simpan hasil sebagai baseline')
+    parser.add_argument('--bandingkan', action='store_true', help='gagal (exit 1) jika ada regresi')
+    parser.add_argument('--baseline', type=Path, default=FILE_BASELINE)
+    parser.add_argument('--toleransi', type=float, default=TOLERANSI,
+                        help=f'perlambatan relatif yang masih diterima (default {TOLERANSI * 100:.0f}%%)')
+    parser.add_argument('--waktu-min', type=float, default=WAKTU_MIN_DETIK,
+                        help='lama minimum pengukuran per kasus (detik)')
+    args = parser.parse_args(argv)
+
+    hasil = jalankan_semua(args.filter, args.waktu_min)
+    baseline = muat_baseline(args.baseline)
+
+    regresi = []
+    if baseline is None:
+        for nama, h in hasil.items():
+            print(f'{nama:<16} {_format_waktu(h.median):>10}')
+    else:
+        if baseline.get('mesin') != info_mesin():
+            print(f'Peringatan: baseline dibuat di mesin/versi lain ({baseline.get("mesin")})', file=sys.stderr)
+        print(f'{"kasus":<16} {"median":>10} {"baseline":>10} {"rasio":>7}')
+        for nama, baru, lama, rasio, melambat in bandingkan(hasil, baseline, args.toleransi):
+            if lama is None:
+                print(f'{nama:<16} {_format_waktu(baru):>10} {"-":>10} {"baru":>7}')
+                continue
+            print(f'{nama:<16} {_format_waktu(baru):>10} {_format_waktu(lama):>10} {rasio:>6.2f}x'
+                  + ('  MELAMBAT' if melambat else ''))
+            if melambat:
+                regresi.append(nama)
+
+    if args.simpan:
+        simpan_baseline(hasil, args.baseline)
+        print(f'Baseline disimpan: {args.baseline}', file=sys.stderr)
+    if args.bandingkan and regresi:
+        print(f'Regresi performa: {", ".join(regresi)}', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Cache LRU berbatas untuk hasil per skenario, dipakai bersama oleh semua sesi.
+
+Kuncinya adalah tuple input yang sudah dinormalisasi (lihat `kunci_skenario`),
+sehingga skenario yang sama (mis. default 500000 / 550 Wp / 4 modul) hanya
+dihitung sekali. Aman dipakai dari banyak thread sesi Streamlit.
+"""
+
+import threading
+from collections import OrderedDict
+
+KAPASITAS_CACHE = 256
+
+
+def kunci_skenario(inp):
+    """Tuple hashable dari `InputSkenario` dengan tipe yang seragam."""
+    faktor_musim = None
+    if inp.faktor_musim is not None:
+        faktor_musim = tuple(round(float(f), 9) for f in inp.faktor_musim)
+    return (
+        str(inp.provinsi),
+        round(float(inp.radiasi_harian), 9),
+        round(float(inp.faktor_emisi), 9),
+        round(float(inp.tagihan_bulanan), 9),
+        int(inp.wp_modul),
+        int(inp.jumlah_modul),
+        faktor_musim,
+        inp.zona_musim,
+    )
+
+
+class CacheLRU:
+    """Peta kunci -> nilai dengan batas ukuran; entri paling lama tak dipakai dibuang."""
+
+    def __init__(self, kapasitas=KAPASITAS_CACHE):
+        if kapasitas < 1:
+            raise ValueError("Kapasitas cache minimal 1")
+        self.kapasitas = kapasitas
+        self._data = OrderedDict()
+        self._kunci = threading.Lock()
+        self.hit = 0
+        self.miss = 0
+        self.buang = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, kunci):
+        return kunci in self._data
+
+    def ambil(self, kunci, buat):
+        """Kembalikan nilai untuk `kunci`; panggil `buat()` dan simpan jika belum ada."""
+        with self._kunci:
+            if kunci in self._data:
+                self._data.move_to_end(kunci)
+                self.hit += 1
+                return self._data[kunci]
+            self.miss += 1
+
+        # Dihitung di luar lock agar sesi lain tidak menunggu
+        nilai = buat()
+
+        with self._kunci:
+            if kunci in self._data:
+                # Sesi lain lebih dulu menyimpan: pakai milik mereka
+                self._data.move_to_end(kunci)
+                return self._data[kunci]
+            self._data[kunci] = nilai
+            while len(self._data) > self.kapasitas:
+                self._data.popitem(last=False)
+                self.buang += 1
+        return nilai
+
+    def kosongkan(self):
+        with self._kunci:
+            self._data.clear()
+
+    def statistik(self):
+        """Penghitung hit/miss untuk ditampilkan atau dipantau."""
+        with self._kunci:
+            total = self.hit + self.miss
+            return {
+                'hit': self.hit,
+                'miss': self.miss,
+                'dibuang': self.buang,
+                'ukuran': len(self._data),
+                'kapasitas': self.kapasitas,
+                'rasio_hit': self.hit / total if total else 0.0,
+            }
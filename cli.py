@@ -0,0 +1,295 @@
+"""Runner baris perintah: skor CSV besar berisi rumah tangga tanpa Streamlit.
+
+Contoh:
+    python cli.py pelanggan.csv -o hasil.csv
+    python cli.py pelanggan.csv -o hasil.parquet --workers 4 --chunksize 100000
+
+File input dibaca per potongan (`--chunksize` baris) dan harus memiliki kolom
+provinsi, tagihan, Wp dan modul (nama alternatif: tagihan_bulanan, wp_modul,
+jumlah_modul; huruf besar/kecil bebas). Kolom lain diteruskan apa adanya ke
+output. Provinsi dicocokkan lewat indeks hash (`pd.Index.get_indexer`) dan
+hasilnya ditulis bertahap, sehingga pemakaian memori tetap konstan berapa
+pun jumlah barisnya. Dengan `--workers N` perhitungan dan serialisasi tiap
+potongan dibagi ke N proses.
+"""
+
+import argparse
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from batch import evaluasi_array
+from engine import FILE_DATA, MAX_JUMLAH_MODUL, MAX_WP_MODUL, TAHUN_ANALISIS, baca_data_provinsi
+
+UKURAN_CHUNK = 50_000
+
+# Peran kolom input -> nama-nama yang diterima (dibandingkan dalam huruf kecil)
+KOLOM_INPUT = {
+    'provinsi': ('provinsi',),
+    'tagihan': ('tagihan', 'tagihan_bulanan'),
+    'wp': ('wp', 'wp_modul'),
+    'modul': ('modul', 'jumlah_modul'),
+}
+
+# Kolom output beserta tipe data tetapnya (skema sama di setiap potongan)
+KOLOM_OUTPUT = {
+    'Kapasitas_kWp': 'float64',
+    'Produksi_Bulanan_kWh': 'float64',
+    'Penghematan_Rp': 'float64',
+    'Tagihan_Baru_Rp': 'float64',
+    'Biaya_Instalasi_Rp': 'float64',
+    'Payback_Tahun': 'Int16',
+    'Skor_Kemandirian': 'float64',
+    'Emisi_Dicegah_kg': 'float64',
+    'Status': 'string',
+}
+
+STATUS_OK = 'ok'
+STATUS_PROVINSI = 'provinsi_tidak_dikenal'
+STATUS_INPUT = 'input_tidak_valid'
+
+
+def normalisasi_nama(nama):
+    """Samakan penulisan nama provinsi: spasi berlebih dan huruf besar/kecil."""
+    return pd.Series(nama, dtype='string').str.strip().str.replace(r'\s+', ' ', regex=True).str.casefold()
+
+
+class TabelProvinsi:
+    """Radiasi dan faktor emisi per provinsi dengan pencarian berbasis hash."""
+
+    def __init__(self, data_solar):
+        data_solar = data_solar.assign(_kunci=normalisasi_nama(data_solar['Provinsi']).to_numpy())
+        data_solar = data_solar.drop_duplicates('_kunci')
+        self.indeks = pd.Index(data_solar['_kunci'].to_numpy())
+        self.radiasi = data_solar['Produksi_Harian_kWh'].to_numpy(dtype=np.float64)
+        self.emisi = data_solar['Faktor_Emisi_kg_per_kWh'].to_numpy(dtype=np.float64)
+
+    def cari(self, nama):
+        """Posisi tiap nama di tabel; -1 jika tidak dikenal."""
+        return self.indeks.get_indexer(normalisasi_nama(nama).fillna(''))
+
+
+def petakan_kolom(kolom):
+    """Cocokkan header CSV dengan peran di `KOLOM_INPUT`."""
+    kecil = {str(k).strip().lower(): k for k in kolom}
+    peta, hilang = {}, []
+    for peran, alias in KOLOM_INPUT.items():
+        cocok = next((kecil[a] for a in alias if a in kecil), None)
+        if cocok is None:
+            hilang.append(peran)
+        peta[peran] = cocok
+    if hilang:
+        raise ValueError(f"Kolom wajib tidak ditemukan: {', '.join(hilang)} (header: {list(kolom)})")
+    return peta
+
+
+def skor_potongan(df, tabel, peta, tahun_analisis=TAHUN_ANALISIS):
+    """Tambahkan kolom hasil ke satu potongan input (baris tidak valid diberi NaN + Status)."""
+    posisi = tabel.cari(df[peta['provinsi']])
+    tagihan = pd.to_numeric(df[peta['tagihan']], errors='coerce').to_numpy(dtype=np.float64)
+    wp = pd.to_numeric(df[peta['wp']], errors='coerce').to_numpy(dtype=np.float64)
+    modul = pd.to_numeric(df[peta['modul']], errors='coerce').to_numpy(dtype=np.float64)
+
+    dikenal = posisi >= 0
+    valid = (dikenal & (tagihan > 0) & np.isfinite(tagihan)
+             & (wp > 0) & (wp <= MAX_WP_MODUL) & (modul > 0) & (modul <= MAX_JUMLAH_MODUL)
+             & (wp == np.round(wp)) & (modul == np.round(modul)))
+
+    # Baris tidak valid dihitung dengan nilai pengganti lalu ditutup NaN
+    hasil = evaluasi_array(
+        np.where(valid, tabel.radiasi[posisi], 0.0),
+        np.where(valid, tabel.emisi[posisi], 0.0),
+        np.where(valid, tagihan, 1.0),
+        np.where(valid, wp, 0).astype(np.int64),
+        np.where(valid, modul, 0).astype(np.int64),
+        tahun_analisis=tahun_analisis,
+    )
+
+    kosong = ~valid
+    keluaran = {
+        'Kapasitas_kWp': hasil.kapasitas_pv_kwp,
+        'Produksi_Bulanan_kWh': hasil.produksi_pv_bulanan,
+        'Penghematan_Rp': hasil.penghematan_rp,
+        'Tagihan_Baru_Rp': hasil.tagihan_baru,
+        'Biaya_Instalasi_Rp': hasil.biaya_instalasi_pv,
+        'Payback_Tahun': pd.arrays.IntegerArray(hasil.payback_tahun.astype(np.int16), kosong),
+        'Skor_Kemandirian': hasil.skor_kemandirian,
+        'Emisi_Dicegah_kg': hasil.emisi_dicegah_total,
+        'Status': np.where(valid, STATUS_OK, np.where(dikenal, STATUS_INPUT, STATUS_PROVINSI)),
+    }
+    df = df.copy()
+    for nama, tipe in KOLOM_OUTPUT.items():
+        nilai = keluaran[nama]
+        if tipe == 'float64':
+            nilai = np.where(kosong, np.nan, nilai)
+        df[nama] = pd.array(nilai, dtype=tipe)
+    return df
+
+
+# --- PENULIS OUTPUT (serialisasi bisa berjalan di proses worker) ---
+
+class PenulisCSV:
+    """Tulis potongan CSV secara berurutan; header hanya di potongan pertama."""
+
+    def __init__(self, path):
+        self.berkas = open(path, 'w', encoding='utf-8', newline='')
+        self.ada_header = False
+
+    @staticmethod
+    def serialisasi(df):
+        return df.to_csv(index=False, header=False)
+
+    def tulis(self, isi, kolom):
+        if not self.ada_header:
+            self.berkas.write(pd.DataFrame(columns=kolom).to_csv(index=False))
+            self.ada_header = True
+        self.berkas.write(isi)
+
+    def tutup(self, kolom):
+        if not self.ada_header:
+            self.tulis('', kolom)
+        self.berkas.close()
+
+
+class PenulisParquet:
+    """Tulis setiap potongan sebagai row group Parquet (butuh pyarrow)."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Output Parquet membutuhkan pyarrow: pip install pyarrow")
+        self.path = path
+        self.pq = pq
+        self.penulis = None
+
+    @staticmethod
+    def serialisasi(df):
+        import pyarrow as pa
+
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    def tulis(self, tabel, kolom):
+        if self.penulis is None:
+            self.penulis = self.pq.ParquetWriter(self.path, tabel.schema)
+        self.penulis.write_table(tabel.cast(self.penulis.schema))
+
+    def tutup(self, kolom):
+        if self.penulis is None:
+            self.tulis(self.serialisasi(_kerangka_kosong(kolom)), kolom)
+        self.penulis.close()
+
+
+PENULIS = {'.csv': PenulisCSV, '.parquet': PenulisParquet, '.pq': PenulisParquet}
+
+
+def _kerangka_kosong(kolom):
+    df = pd.DataFrame({k: pd.Series(dtype='string') for k in kolom if k not in KOLOM_OUTPUT})
+    return df.assign(**{k: pd.Series(dtype=v) for k, v in KOLOM_OUTPUT.items()})[kolom]
+
+
+# --- WORKER PROSES ---
+
+_TABEL = None
+
+
+def _siapkan_worker(tabel):
+    global _TABEL
+    _TABEL = tabel
+
+
+def _kerjakan(df, peta, serialisasi, tahun_analisis):
+    hasil = skor_potongan(df, _TABEL, peta, tahun_analisis)
+    return len(hasil), hasil['Status'].value_counts().to_dict(), serialisasi(hasil)
+
+
+def jalankan(path_input, path_output, path_data=None, chunksize=UKURAN_CHUNK, workers=1,
+             sep=',', tahun_analisis=TAHUN_ANALISIS):
+    """Skor seluruh file input dan tulis ke output; kembalikan ringkasan jumlah baris."""
+    path_output = Path(path_output)
+    kelas_penulis = PENULIS.get(path_output.suffix.lower())
+    if kelas_penulis is None:
+        raise ValueError(f"Format output tidak didukung: {path_output.suffix} (pakai .csv atau .parquet)")
+
+    if path_data is None:
+        path_data = FILE_DATA if Path(FILE_DATA).exists() else Path(__file__).parent / FILE_DATA
+    tabel = TabelProvinsi(baca_data_provinsi(path_data))
+
+    # Semua kolom dibaca sebagai teks agar skema output sama di setiap potongan
+    # Header dibersihkan sekali lalu dipakai ulang untuk setiap potongan, agar nama
+    # kolom seperti ' tagihan' sama di pemetaan dan di data
+    header = [str(k).strip() for k in pd.read_csv(path_input, sep=sep, nrows=0,
+                                                  skipinitialspace=True).columns]
+    peta = petakan_kolom(header)
+    pembaca = pd.read_csv(path_input, sep=sep, chunksize=chunksize, dtype=str, header=0,
+                          names=header, keep_default_na=False, skipinitialspace=True)
+    kolom = header + list(KOLOM_OUTPUT)
+
+    penulis = kelas_penulis(path_output)
+    ringkasan = {'baris': 0, STATUS_OK: 0, STATUS_PROVINSI: 0, STATUS_INPUT: 0}
+
+    def catat(hasil):
+        n, status, isi = hasil
+        ringkasan['baris'] += n
+        for k, v in status.items():
+            ringkasan[k] += v
+        penulis.tulis(isi, kolom)
+
+    try:
+        if workers <= 1:
+            _siapkan_worker(tabel)
+            for df in pembaca:
+                catat(_kerjakan(df, peta, kelas_penulis.serialisasi, tahun_analisis))
+        else:
+            # Jendela tugas terbatas: memori konstan dan urutan output terjaga
+            with ProcessPoolExecutor(workers, initializer=_siapkan_worker, initargs=(tabel,)) as pool:
+                antrean = deque()
+                for df in pembaca:
+                    antrean.append(pool.submit(_kerjakan, df, peta, kelas_penulis.serialisasi, tahun_analisis))
+                    if len(antrean) >= 2 * workers:
+                        catat(antrean.popleft().result())
+                while antrean:
+                    catat(antrean.popleft().result())
+    finally:
+        penulis.tutup(kolom)
+    return ringkasan
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Hitung penghematan, payback, CO2 dan kemandirian energi untuk CSV rumah tangga."
+    )
+    parser.add_argument('input', help="CSV dengan kolom provinsi, tagihan, wp, modul")
+    parser.add_argument('-o', '--output', required=True, help="File hasil (.csv atau .parquet)")
+    parser.add_argument('--data', default=None, help=f"CSV provinsi (default: {FILE_DATA})")
+    parser.add_argument('--chunksize', type=int, default=UKURAN_CHUNK, help="Baris per potongan")
+    parser.add_argument('--workers', type=int, default=1, help="Jumlah proses paralel")
+    parser.add_argument('--sep', default=',', help="Delimiter file input")
+    parser.add_argument('--tahun', type=int, default=TAHUN_ANALISIS, help="Horizon analisis payback")
+    args = parser.parse_args(argv)
+
+    mulai = time.perf_counter()
+    try:
+        ringkasan = jalankan(args.input, args.output, args.data, args.chunksize,
+                             args.workers, args.sep, args.tahun)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    durasi = time.perf_counter() - mulai
+    print(
+        f"{ringkasan['baris']:,} baris dalam {durasi:.2f} dtk -> {args.output} "
+        f"(ok: {ringkasan[STATUS_OK]:,}, provinsi tidak dikenal: {ringkasan[STATUS_PROVINSI]:,}, "
+        f"input tidak valid: {ringkasan[STATUS_INPUT]:,})",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,13 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
-import seaborn as sns
+
+import perf
+from nasa_power import baca_nasa_power
+from analitik_nasa import GudangAnalitik, agregasi_harian
+from angin import HUKUM_PROFIL, KURVA_TURBIN, ParameterAngin, PustakaTurbin, aep_weibull, simulasi_angin, ukuran_hibrida
+from engine import BULAN_LIST, format_rupiah
+from downsample import METODE, TITIK_LAYAR
+from grafik import fig_deret_waktu
 
 # ================================
 # CONFIG STREAMLIT
@@ -11,6 +16,48 @@ st.set_page_config(
     page_title="Analisis Energi Surya & Angin – Cibodas",
     layout="wide"
 )
+# Instrumentasi opsional: ?debug=perf atau SOLAR_PERF=1 (lihat perf.py)
+profil = perf.mulai('code')
+# pandas, plotly, matplotlib & seaborn diimpor di bagian yang memakainya:
+# halaman awal (sebelum upload) tampil tanpa menunggu pustaka berat dimuat.
+
+
+def tampilkan_deret(waktu, deret, judul, kunci):
+    """Grafik WebGL ter-downsample; rentang tampilan yang dipersempit memuat detail lebih halus."""
+    waktu = np.asarray(waktu, dtype='datetime64[h]')
+    hari_awal, hari_akhir = (t.astype('datetime64[D]').item() for t in (waktu[0], waktu[-1]))
+    k1, k2, k3 = st.columns([1, 1, 2])
+    metode = k1.radio("Downsampling", METODE, horizontal=True, key=f'{kunci}_metode',
+                      format_func=lambda m: "LTTB" if m == 'lttb' else "Min/Max")
+    jumlah_titik = k2.select_slider("Titik per deret", [500, 1000, 2000, 4000], value=TITIK_LAYAR,
+                                    key=f'{kunci}_titik')
+    rentang = k3.slider("Rentang tampilan (zoom)", hari_awal, hari_akhir, (hari_awal, hari_akhir),
+                        format="DD MMM YYYY", key=f'{kunci}_rentang')
+    if hari_awal == hari_akhir:
+        rentang = (hari_awal, hari_akhir)
+
+    awal, akhir = (np.datetime64(t, 'h') for t in rentang)
+    pilih = (waktu >= awal) & (waktu < akhir + np.timedelta64(24, 'h'))
+    fig = fig_deret_waktu(waktu[pilih], {label: (np.asarray(nilai)[pilih], warna)
+                                         for label, (nilai, warna) in deret.items()},
+                          judul, jumlah_titik, metode)
+    st.plotly_chart(fig, use_container_width=True)
+    tampil, total = len(fig.data[0].x), int(pilih.sum())
+    st.caption(f"{tampil:,} dari {total:,} titik per deret ditampilkan (WebGL)."
+               + (" Persempit rentang untuk melihat detail penuh." if tampil < total else ""))
+    profil.payload(kunci, fig)
+
+
+def tampilkan_tabel(grup, kolom, index):
+    """Tabel dari kolom yang tersedia di `grup`; kolom yang tidak ada disebut di caption."""
+    import pandas as pd
+
+    ada = {label: grup[nama] for label, nama in kolom.items() if nama in grup}
+    hilang = [label for label, nama in kolom.items() if nama not in grup]
+    if ada:
+        st.dataframe(pd.DataFrame(ada, index=index))
+    if hilang:
+        st.caption(f"{', '.join(hilang)}: data tidak tersedia")
 
 st.title("🔎 Analisis Potensi Energi Surya dan Angin – Desa Cibodas")
 st.write("Aplikasi ini melakukan analisis data NASA POWER (GHI & Wind Speed).")
@@ -22,67 +69,66 @@ st.header("📂 Upload File NASA POWER")
 uploaded_file = st.file_uploader("Upload file CSV NASA POWER (misal: Cibodas.csv)", type=["csv"])
 
 if uploaded_file is not None:
+    import pandas as pd
+
     # ================================
-    # 2) LOAD DATA
+    # 2) LOAD DATA (header & timestamp dibaca oleh nasa_power.py)
     # ================================
-    df = pd.read_csv(uploaded_file, skiprows=11)
+    try:
+        data_nasa = baca_nasa_power(uploaded_file)
+    except ValueError as e:
+        st.error(f"File tidak valid: {e}")
+        st.stop()
+    meta = data_nasa.metadata
+    df = data_nasa.ke_dataframe(tz="Asia/Jakarta")
+    profil.tandai('baca_nasa')
+
+    st.caption(
+        f"📍 Lat {meta.lintang}, Lon {meta.bujur} • Elevasi {meta.elevasi} m • "
+        f"{meta.tanggal_mulai} – {meta.tanggal_akhir}"
+    )
 
     st.subheader("📌 Kolom Terbaca")
     st.write(list(df.columns))
 
     # ================================
-    # 3) DATA CLEANING
+    # 3) DATA CLEANING (nilai -999 sudah menjadi NaN)
     # ================================
-    df.replace(-999.0, np.nan, inplace=True)
     df.dropna(inplace=True)
 
-    df[['YEAR', 'MO', 'DY', 'HR']] = df[['YEAR', 'MO', 'DY', 'HR']].astype(int)
-
     # ================================
-    # 4) KONVERSI DATETIME WIB
+    # 4) DATETIME WIB (index sudah dibangun & di-set Asia/Jakarta oleh loader)
     # ================================
-    df['Datetime'] = pd.to_datetime(
-        df['YEAR'].astype(str) + "-" +
-        df['MO'].astype(str).str.zfill(2) + "-" +
-        df['DY'].astype(str).str.zfill(2) + " " +
-        df['HR'].astype(str) + ":00"
-    )
-
-    df = df.set_index('Datetime')
-    df.index = df.index.tz_localize("Asia/Jakarta")
-
     st.success("⏱ Zona waktu berhasil diset ke Asia/Jakarta (WIB).")
 
     # ================================
     # 5) ENERGY ANALYSIS (DAILY)
     # ================================
-    ghi_daily = df['ALLSKY_SFC_SW_DWN'].resample("D").sum() / 1000
-    ghi_daily.name = "GHI_kWh_m2_day"
-
-    wind_daily = df['WS10M'].resample("D").mean()
-    wind_daily.name = "Wind_Speed_m_s"
-
-    energy_stats = pd.concat([ghi_daily, wind_daily], axis=1).dropna()
+    # Agregat harian dihitung oleh analitik_nasa.py (sama dengan ingest gudang)
+    harian = agregasi_harian(data_nasa)
+    energy_stats = pd.DataFrame(
+        {"GHI_kWh_m2_day": harian['ghi_kwh_m2'], "Wind_Speed_m_s": harian['angin_rata']},
+        index=pd.DatetimeIndex(harian['hari'], name=df.index.name).tz_localize("Asia/Jakarta"),
+    )
+    profil.tandai('agregasi_harian')
 
     # ================================
     # 6) VISUALIZATION
     # ================================
     st.header("📊 Visualisasi Data Energi")
 
-    # ——— Plot GHI & Wind Speed ———
-    fig, ax = plt.subplots(2, 1, figsize=(14, 9), sharex=True)
-    fig.suptitle("Analisis Potensi Energi Desa Cibodas (WIB)", fontsize=16, weight='bold')
-
-    ax[0].plot(energy_stats.index, energy_stats['GHI_kWh_m2_day'], linewidth=1.3, color="orange")
-    ax[0].set_ylabel("GHI (kWh/m²/hari)")
-    ax[0].set_title("Potensi Energi Surya")
-
-    ax[1].plot(energy_stats.index, energy_stats['Wind_Speed_m_s'], linewidth=1.3, color="blue")
-    ax[1].set_ylabel("Kecepatan Angin (m/s)")
-    ax[1].set_title("Potensi Energi Angin")
-    ax[1].set_xlabel("Tanggal (WIB)")
-
-    st.pyplot(fig)
+    # ——— Plot GHI & Wind Speed (interaktif, WebGL + downsampling) ———
+    if st.radio("Resolusi Data", ["Harian", "Per Jam"], horizontal=True, key='resolusi') == "Per Jam":
+        tampilkan_deret(df.index.tz_localize(None), {
+            "GHI (Wh/m²)": (df['ALLSKY_SFC_SW_DWN'], "orange"),
+            "Kecepatan Angin (m/s)": (df['WS10M'], "blue"),
+        }, "Analisis Potensi Energi Desa Cibodas per Jam (WIB)", 'fig_energi')
+    else:
+        tampilkan_deret(energy_stats.index.tz_localize(None), {
+            "GHI (kWh/m²/hari)": (energy_stats['GHI_kWh_m2_day'], "orange"),
+            "Kecepatan Angin (m/s)": (energy_stats['Wind_Speed_m_s'], "blue"),
+        }, "Analisis Potensi Energi Desa Cibodas (WIB)", 'fig_energi')
+    profil.tandai('grafik_energi')
 
     # ================================
     # 7) Statistik
@@ -92,14 +138,81 @@ if uploaded_file is not None:
 
     st.write(f"☀️ **Rata-rata GHI Tahunan:** {energy_stats['GHI_kWh_m2_day'].mean():.2f} kWh/m²/hari")
     st.write(f"💨 **Rata-rata Kecepatan Angin Tahunan:** {energy_stats['Wind_Speed_m_s'].mean():.2f} m/s")
+    profil.tandai('statistik')
+
+    # ================================
+    # 7B) ENERGI ANGIN (lihat angin.py)
+    # ================================
+    st.header("🌀 Potensi Energi Angin (Turbin)")
+    a1, a2, a3 = st.columns(3)
+    turbin = a1.selectbox("Turbin", list(KURVA_TURBIN), format_func=lambda k: KURVA_TURBIN[k].nama, key='turbin')
+    tinggi_hub = a2.slider("Tinggi Hub (m)", 10, 120, int(ParameterAngin.tinggi_hub), 5, key='tinggi_hub')
+    hukum = a3.radio("Profil Kecepatan", HUKUM_PROFIL, horizontal=True, key='hukum_angin',
+                     format_func=lambda h: "Hukum Pangkat" if h == 'pangkat' else "Hukum Logaritmik")
+    param_angin = ParameterAngin(tinggi_hub=tinggi_hub, hukum=hukum)
+
+    # Semua turbin dihitung sekaligus (turbin x jam); pilihan hanya menentukan yang ditampilkan
+    hasil_angin = simulasi_angin(data_nasa, tuple(KURVA_TURBIN), param_angin)
+    weibull = hasil_angin.weibull()
+    i_turbin = list(KURVA_TURBIN).index(turbin)
+
+    w1, w2, w3, w4 = st.columns(4)
+    w1.metric(f"Kecepatan Rata-rata di {tinggi_hub} m", f"{np.nanmean(hasil_angin.kecepatan_hub):.2f} m/s")
+    w2.metric("Weibull k / c", f"{float(weibull.k):.2f} / {float(weibull.c):.2f} m/s")
+    w3.metric("Energi Tahunan (AEP)", f"{hasil_angin.aep_kwh[i_turbin]:,.0f} kWh")
+    w4.metric("Faktor Kapasitas", f"{hasil_angin.faktor_kapasitas[i_turbin]:.1%}")
+
+    import plotly.express as px
+
+    fig_angin = px.bar(
+        pd.DataFrame({"Bulan": BULAN_LIST, "Energi (kWh)": hasil_angin.per_bulan()[i_turbin]}),
+        x="Bulan", y="Energi (kWh)", title=f"Produksi Bulanan {KURVA_TURBIN[turbin].nama}",
+        color_discrete_sequence=["#2980b9"]
+    )
+    st.plotly_chart(fig_angin, use_container_width=True)
+    st.dataframe(pd.DataFrame({
+        "Turbin": hasil_angin.nama_turbin,
+        "Kapasitas (kW)": hasil_angin.kapasitas_kw,
+        "AEP Deret Jam (kWh)": hasil_angin.aep_kwh,
+        "AEP Weibull (kWh)": aep_weibull(weibull, PustakaTurbin.dari_nama(KURVA_TURBIN), param_angin.rugi_sistem),
+        "Faktor Kapasitas": hasil_angin.faktor_kapasitas,
+    }), hide_index=True)
+
+    # ——— Hibrida PV + Angin (ekonomi sama dengan jalur surya) ———
+    st.subheader("☀️🌀 Ukuran Sistem Hibrida PV + Angin")
+    tagihan_hibrida = st.number_input("Tagihan Listrik per Bulan (Rp):", min_value=10000, value=500000,
+                                      step=50000, key='tagihan_hibrida')
+    hibrida = ukuran_hibrida(data_nasa, tagihan_hibrida, np.arange(0, 11), np.arange(0, 6), turbin, param_angin)
+    i_pv_saja = int(np.nanargmax(hibrida.npv[:, 0]))
+    st.dataframe(pd.DataFrame([
+        {
+            "Konfigurasi": label,
+            "PV (kWp)": hibrida.kapasitas_pv_kwp[i],
+            "Jumlah Turbin": int(hibrida.jumlah_turbin[j]),
+            "Produksi (kWh/bulan)": hibrida.produksi_bulanan[i, j],
+            "Porsi Angin": f"{hibrida.porsi_angin[i, j]:.0%}",
+            "Jam Tanpa Produksi": f"{hibrida.jam_tanpa_produksi[i, j]:.0%}",
+            "Biaya Instalasi": format_rupiah(hibrida.biaya_instalasi[i, j]),
+            "Masa Balik Modal (Tahun)": hibrida.payback_tahun[i, j],
+            "NPV": format_rupiah(hibrida.npv[i, j]),
+        }
+        for label, (i, j) in (("Hanya PV (terbaik)", (i_pv_saja, 0)), ("Terbaik dari semua kombinasi", hibrida.terbaik))
+    ]), hide_index=True)
+    st.caption(f"Kandidat: PV 0–10 kWp × 0–5 turbin {hibrida.nama_turbin}; NPV memakai tarif, inflasi dan "
+               f"diskonto yang sama dengan dashboard surya.")
+    profil.payload('fig_angin', fig_angin)
+    profil.tandai('angin')
 
     # ================================
     # 8) VISUALISASI BARU (Area Chart + Boxplot)
     # ================================
     st.header("📊 Visualisasi Tambahan")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
 
     # Tambahkan kolom bulan
-    energy_stats['Month'] = energy_stats.index.month_name(locale='id_ID')
+    # Nama bulan dari BULAN_LIST (month_name(locale='id_ID') gagal jika locale tidak terpasang)
+    energy_stats['Month'] = pd.Categorical.from_codes(energy_stats.index.month - 1, BULAN_LIST)
 
     # ——— Area Chart GHI ———
     fig1 = plt.figure(figsize=(15, 5))
@@ -109,6 +222,7 @@ if uploaded_file is not None:
     plt.ylabel("GHI (kWh/m²/hari)")
     plt.grid(alpha=0.3)
     st.pyplot(fig1)
+    profil.payload('fig_area_ghi', fig1)
 
     # ——— Boxplot Wind Speed per Bulan ———
     fig2 = plt.figure(figsize=(15, 5))
@@ -117,6 +231,72 @@ if uploaded_file is not None:
     plt.ylabel("Kecepatan Angin (m/s)")
     plt.grid(axis="y", linestyle='--', alpha=0.3)
     st.pyplot(fig2)
+    profil.payload('fig_boxplot_angin', fig2)
+    profil.tandai('grafik_tambahan')
 
 else:
     st.info("Silakan upload file CSV untuk memulai analisis.")
+
+# ================================
+# 9) GUDANG MULTI-TAHUN (hasil `python analitik_nasa.py ingest <direktori>`)
+# ================================
+gudang = GudangAnalitik()
+if gudang.situs():
+    import pandas as pd
+
+    st.header("🗂 Analisis Multi-Tahun & Multi-Situs")
+    daftar_situs = gudang.situs()
+    kunci = st.selectbox(
+        "Pilih situs", list(daftar_situs),
+        format_func=lambda k: f"{daftar_situs[k]['nama']} ({daftar_situs[k]['lintang']}, {daftar_situs[k]['bujur']})",
+    )
+    ringkasan = gudang.ringkasan(kunci)
+
+    # Situs tanpa kolom PV (mis. hanya angin) tidak punya P50/P90 dan faktor musim
+    p = ringkasan.get('p50_p90')
+    if p is None:
+        st.info("Yield P50/P90: data tidak tersedia (file situs ini tanpa kolom radiasi).")
+    else:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Yield P50", f"{float(p['p50_kwh_per_kwp']):,.0f} kWh/kWp/tahun")
+        col2.metric("Yield P90", f"{float(p['p90_kwh_per_kwp']):,.0f} kWh/kWp/tahun"
+                    if np.isfinite(p['p90_kwh_per_kwp']) else "butuh ≥ 2 tahun")
+        col3.metric("Tahun Lengkap", int(p['jumlah_tahun']))
+
+    # Deret harian seluruh tahun situs ini (bisa puluhan ribu titik)
+    deret_harian = gudang.harian(kunci)
+    warna_deret = {
+        "GHI (kWh/m²/hari)": ('ghi_kwh_m2', "orange"),
+        "Yield PV (kWh/kWp/hari)": ('pv_kwh_per_kwp', "green"),
+        "Angin (m/s)": ('angin_rata', "blue"),
+    }
+    tampilkan_deret(deret_harian['hari'], {
+        label: (deret_harian[nama], warna) for label, (nama, warna) in warna_deret.items() if nama in deret_harian
+    }, f"Deret Harian {daftar_situs[kunci]['nama']}", 'fig_gudang')
+
+    tahunan = ringkasan['tahunan']
+    st.subheader("📅 Ringkasan Tahunan")
+    tampilkan_tabel(tahunan, {
+        "Hari Berdata": 'hari',
+        "GHI (kWh/m²)": 'ghi_kwh_m2',
+        "Yield PV (kWh/kWp)": 'pv_kwh_per_kwp',
+        "Angin Rata-rata (m/s)": 'angin_rata',
+    }, pd.Index(tahunan['tahun'], name="Tahun"))
+
+    st.subheader("🌦 Klimatologi Bulanan (rata-rata harian)")
+    tampilkan_tabel(ringkasan.get('klimatologi', {}), {
+        "GHI (kWh/m²/hari)": 'ghi_kwh_m2',
+        "Yield PV (kWh/kWp/hari)": 'pv_kwh_per_kwp',
+        "Angin (m/s)": 'angin_rata',
+        "Faktor Musim": 'faktor_musim',
+    }, BULAN_LIST)
+
+    persentil = ringkasan.get('persentil', {})
+    st.subheader("📊 Persentil Harian")
+    tampilkan_tabel(persentil, {
+        "GHI (kWh/m²/hari)": 'ghi_kwh_m2',
+        "Yield PV (kWh/kWp/hari)": 'pv_kwh_per_kwp',
+    }, [f"P{q}" for q in persentil.get('persentil', [])])
+    profil.tandai('gudang_analitik')
+
+profil.selesai()
@@ -0,0 +1,88 @@
+"""Penurunan resolusi deret waktu untuk grafik (min/max per bucket dan LTTB).
+
+Grafik hanya butuh kira-kira satu titik per piksel lebar layar; mengirim
+8.760 titik per tahun (atau puluhan ribu untuk data multi-tahun) hanya
+memperbesar payload dan waktu render browser. Kedua metode di sini
+mengembalikan *indeks* titik yang dipertahankan, sehingga x dan y (dan kolom
+lain) bisa dipilih bersamaan, dan jumlah titiknya tetap berapa pun panjang data.
+
+    minmax  titik terendah & tertinggi setiap bucket: puncak/lembah tidak
+            pernah hilang (cocok untuk iradiansi dan hembusan angin)
+    lttb    Largest-Triangle-Three-Buckets (Steinarsson, 2013): satu titik
+            per bucket yang paling menjaga bentuk visual garis
+"""
+
+import numpy as np
+
+TITIK_LAYAR = 2000
+METODE = ('lttb', 'minmax')
+
+
+def _sebagai_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[s]').astype(np.float64)
+    return x.astype(np.float64)
+
+
+def indeks_minmax(y, jumlah_titik=TITIK_LAYAR):
+    """Indeks urut min & max tiap bucket (sekitar `jumlah_titik` titik, ditambah titik pertama & terakhir)."""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    jumlah_bucket = max(jumlah_titik // 2, 1)
+    if n <= jumlah_titik:
+        return np.arange(n)
+
+    # Bucket berukuran sama; sisa di ujung diisi nilai terakhir agar bisa di-reshape
+    lebar = -(-n // jumlah_bucket)
+    jumlah_bucket = -(-n // lebar)
+    blok = np.empty(jumlah_bucket * lebar)
+    blok[:n] = y
+    blok[n:] = y[-1]
+    blok = blok.reshape(jumlah_bucket, lebar)
+    awal = np.arange(jumlah_bucket) * lebar
+    indeks = np.concatenate([awal + blok.argmin(axis=1), awal + blok.argmax(axis=1), [0, n - 1]])
+    return np.unique(np.minimum(indeks, n - 1))
+
+
+def indeks_lttb(x, y, jumlah_titik=TITIK_LAYAR):
+    """Indeks titik pilihan LTTB (titik pertama & terakhir selalu ikut)."""
+    x = _sebagai_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= jumlah_titik or jumlah_titik < 3:
+        return np.arange(n)
+
+    # Batas bucket untuk titik 1..n-2 dibagi ke (jumlah_titik - 2) bucket
+    batas = 1 + (np.arange(jumlah_titik - 1) * (n - 2)) // (jumlah_titik - 2)
+    # Rata-rata tiap bucket (dipakai sebagai titik "berikutnya"); bucket terakhir = titik akhir
+    rata_x = np.append(np.add.reduceat(x[1:n - 1], batas[:-1] - 1) / np.diff(batas), x[-1])
+    rata_y = np.append(np.add.reduceat(y[1:n - 1], batas[:-1] - 1) / np.diff(batas), y[-1])
+
+    terpilih = np.empty(jumlah_titik, dtype=np.int64)
+    terpilih[0], terpilih[-1] = 0, n - 1
+    a = 0
+    for i in range(jumlah_titik - 2):
+        awal, akhir = batas[i], batas[i + 1]
+        xa, ya = x[a], y[a]
+        # Dua kali luas segitiga (titik terpilih sebelumnya, kandidat, rata-rata bucket berikutnya)
+        luas = np.abs((xa - rata_x[i + 1]) * (y[awal:akhir] - ya) - (xa - x[awal:akhir]) * (rata_y[i + 1] - ya))
+        a = awal + int(luas.argmax())
+        terpilih[i + 1] = a
+    return terpilih
+
+
+def turunkan(x, y, jumlah_titik=TITIK_LAYAR, metode='lttb'):
+    """(x, y) yang sudah diturunkan resolusinya; titik NaN dibuang lebih dulu."""
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~np.isnan(y)
+    if not valid.all():
+        x, y = x[valid], y[valid]
+    if metode == 'minmax':
+        indeks = indeks_minmax(y, jumlah_titik)
+    elif metode == 'lttb':
+        indeks = indeks_lttb(x, y, jumlah_titik)
+    else:
+        raise ValueError(f"Metode downsampling tidak dikenal: {metode} (pilih {', '.join(METODE)})")
+    return x[indeks], y[indeks]
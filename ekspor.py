@@ -0,0 +1,326 @@
+"""Ekspor laporan statis (PDF/PNG) hasil Solar Analyzer tanpa browser.
+
+Satu halaman A4 berisi kartu metrik, grafik tagihan, proyeksi biaya
+kumulatif, profil produksi bulanan, donut emisi dan dua tabel Detail Teknis,
+dengan angka dan warna yang sama seperti dashboard `project.py`. Grafik
+digambar ulang dengan matplotlib (Agg), jadi tidak butuh kaleido/Chrome.
+
+Render dijalankan di process pool (konteks `spawn`, aman dari thread server
+Streamlit) dan hasilnya disimpan di cache disk berdasarkan kunci skenario
+(`cache_skenario.kunci_skenario`), sehingga konfigurasi populer hanya
+di-render sekali untuk semua sesi maupun ekspor massal.
+
+Contoh ekspor massal (kolom CSV sama dengan cli.py, kolom `id` opsional
+dipakai sebagai nama file):
+    python ekspor.py pelanggan.csv -o laporan/ --format pdf --workers 4
+"""
+
+import argparse
+import hashlib
+import io
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+from cache_skenario import kunci_skenario
+from engine import (
+    TAHUN_ANALISIS, BULAN_LIST, MAX_JUMLAH_MODUL, MAX_WP_MODUL, InputSkenario, hitung_skenario,
+    format_rupiah, format_payback
+)
+from nasa_power import DIR_CACHE
+
+DIR_LAPORAN = DIR_CACHE.parent / 'laporan'
+VERSI_LAPORAN = 1       # naikkan jika tata letak berubah agar cache lama tidak dipakai
+FORMAT = ('pdf', 'png')
+DPI_PNG = 150
+UKURAN_A4 = (8.27, 11.69)
+MIME = {'pdf': 'application/pdf', 'png': 'image/png'}
+
+
+def nama_aman(ident):
+    """Id pelanggan sebagai nama file: hanya huruf, angka, '_', '-', '.' (tanpa titik di depan)."""
+    return re.sub(r'[^\w.-]', '_', str(ident)).lstrip('.')
+
+
+def kunci_berkas(inp, format='pdf'):
+    """Nama file cache laporan untuk satu skenario & format."""
+    isi = repr((VERSI_LAPORAN, format, kunci_skenario(inp))).encode()
+    return f'{hashlib.blake2b(isi, digest_size=16).hexdigest()}.{format}'
+
+
+# --- RENDER ---
+
+def _kartu(ax, judul, nilai, keterangan=''):
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_facecolor('#f4f6f7')
+    for sisi in ax.spines.values():
+        sisi.set_color('#d5dbdb')
+    ax.text(0.05, 0.75, judul, fontsize=7, color='#566573', transform=ax.transAxes)
+    ax.text(0.05, 0.38, nilai, fontsize=12, weight='bold', color='#1c2833', transform=ax.transAxes)
+    if keterangan:
+        ax.text(0.05, 0.1, keterangan, fontsize=6.5, color='#27ae60', transform=ax.transAxes)
+
+
+def _tabel(ax, df, judul):
+    ax.set_axis_off()
+    ax.set_title(judul, fontsize=9, weight='bold', loc='left')
+    tabel = ax.table(cellText=[[k, v] for k, v in zip(df.index, df['Nilai'])], colLabels=['Keterangan', 'Nilai'],
+                     loc='upper center', cellLoc='left', colWidths=[0.55, 0.45])
+    tabel.auto_set_font_size(False)
+    tabel.set_fontsize(7)
+    tabel.scale(1, 1.3)
+
+
+def gambar_laporan(inp, hasil=None):
+    """Figure matplotlib satu halaman untuk skenario `inp` (tanpa pyplot, aman antar-thread)."""
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+    from grafik import TampilanSkenario
+
+    hasil = hasil or hitung_skenario(inp)
+    skenario = TampilanSkenario(inp, hasil)
+    rupiah = FuncFormatter(lambda x, _: format_rupiah(x))
+
+    fig = Figure(figsize=UKURAN_A4)
+    gs = fig.add_gridspec(5, 4, height_ratios=[0.55, 1.5, 1.5, 1.5, 1.2], hspace=0.55, wspace=0.35,
+                          left=0.09, right=0.96, top=0.92, bottom=0.04)
+    fig.suptitle("☀ Solar Analyzer – Ringkasan Analisis PV Rumahan", fontsize=13, weight='bold')
+    fig.text(0.5, 0.935, f"{inp.provinsi} • {inp.jumlah_modul} × {inp.wp_modul} Wp ({hasil.kapasitas_pv_kwp:.2f} kWp) • "
+                         f"Tagihan {format_rupiah(inp.tagihan_bulanan)}/bulan", ha='center', fontsize=8, color='#566573')
+
+    # Kartu metrik (sama dengan scorecard dashboard)
+    kartu = (
+        ("Hemat Biaya Bulanan", format_rupiah(int(hasil.penghematan_rp)), f"Tagihan akhir {format_rupiah(int(hasil.tagihan_baru))}"),
+        ("Masa Balik Modal", skenario.payback_display, f"Biaya {format_rupiah(hasil.biaya_instalasi_pv)}"),
+        ("Emisi CO₂ Dicegah (Bln)", f"{hasil.emisi_dicegah_total:.1f} kg", f"{hasil.emisi_total_ton:.1f} ton / {TAHUN_ANALISIS} thn"),
+        ("Skor Kemandirian Energi", f"{hasil.skor_kemandirian:.1f}%", ""),
+    )
+    for i, isi in enumerate(kartu):
+        _kartu(fig.add_subplot(gs[0, i]), *isi)
+
+    # Tagihan sebelum vs sesudah
+    ax = fig.add_subplot(gs[1, :2])
+    batang = ax.bar(['Tagihan Awal', 'Tagihan Akhir'], [inp.tagihan_bulanan, hasil.tagihan_baru],
+                    color=['#34495e', '#2ecc71'])
+    ax.bar_label(batang, labels=[format_rupiah(inp.tagihan_bulanan), format_rupiah(hasil.tagihan_baru)], fontsize=7)
+    ax.set_title('Tagihan Listrik: Sebelum vs Sesudah PV', fontsize=9)
+    ax.margins(y=0.12)
+    ax.yaxis.set_major_formatter(rupiah)
+
+    # Donut emisi
+    ax = fig.add_subplot(gs[1, 2:])
+    ax.pie([hasil.emisi_dicegah_grafik, hasil.emisi_tersisa_pln], labels=['Dicegah (PV)', 'Sisa (PLN)'],
+           colors=['#2ecc71', '#bdc3c7'], autopct='%1.0f%%', pctdistance=0.75, startangle=90,
+           counterclock=False, wedgeprops=dict(width=0.4), textprops=dict(fontsize=7))
+    ax.text(0, 0, f"{hasil.skor_kemandirian:.0f}%", ha='center', va='center', fontsize=13, weight='bold')
+    ax.set_title('Jejak Karbon (CO₂)', fontsize=9)
+
+    # Proyeksi biaya kumulatif
+    ax = fig.add_subplot(gs[2, :])
+    df = skenario.df_proyeksi
+    ax.plot(df['Tahun'], df['Tanpa PV'], marker='o', markersize=3, color='#e74c3c', label='Tanpa PV')
+    ax.plot(df['Tahun'], df['Dengan PV'], marker='o', markersize=3, color='#2ecc71', label='Dengan PV')
+    if hasil.payback_tahun <= TAHUN_ANALISIS:
+        ax.plot([hasil.payback_tahun], [df['Dengan PV'].iloc[hasil.payback_tahun - 1]], 'o', color='#3498db',
+                markersize=8, label=f'Balik modal: {format_payback(hasil.payback_tahun)}')
+    ax.set_title('Perbandingan Biaya Kumulatif Jangka Panjang', fontsize=9)
+    ax.set_xlabel('Tahun', fontsize=8)
+    ax.yaxis.set_major_formatter(rupiah)
+    ax.legend(fontsize=7)
+    ax.grid(alpha=0.3)
+
+    # Profil produksi bulanan
+    ax = fig.add_subplot(gs[3, :])
+    batang = ax.bar(BULAN_LIST, hasil.produksi_bulanan_simulasi,
+                    color='#e74c3c' if skenario.musim_tinggi else '#f39c12', width=0.7)
+    ax.bar_label(batang, fmt='%.0f', fontsize=6.5)
+    ax.set_title(f"Profil Energi Bulanan - {inp.provinsi}", fontsize=9)
+    ax.set_ylabel('Energi (kWh)', fontsize=8)
+    ax.margins(y=0.1)
+
+    _tabel(fig.add_subplot(gs[4, :2]), skenario.data_sistem, 'Sistem & Energi')
+    _tabel(fig.add_subplot(gs[4, 2:]), skenario.data_finansial, 'Finansial & Dampak')
+
+    for ax in fig.axes:
+        ax.tick_params(labelsize=7)
+    return fig
+
+
+def render_laporan(inp, format='pdf'):
+    """Bytes PDF/PNG satu skenario (tanpa cache)."""
+    if format not in FORMAT:
+        raise ValueError(f"Format laporan tidak dikenal: {format} (pilih {', '.join(FORMAT)})")
+    buffer = io.BytesIO()
+    gambar_laporan(inp).savefig(buffer, format=format, dpi=DPI_PNG if format == 'png' else None)
+    return buffer.getvalue()
+
+
+def _simpan_atomik(path, isi):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sementara = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    sementara.write_bytes(isi)
+    os.replace(sementara, path)
+
+
+def laporan_tercache(inp, format='pdf', direktori=DIR_LAPORAN):
+    """Path laporan di cache jika sudah pernah di-render, selain itu None."""
+    path = Path(direktori) / kunci_berkas(inp, format)
+    return path if path.exists() else None
+
+
+def _worker_render(tugas):
+    """Dijalankan di proses worker: render lalu simpan ke cache; kembalikan path."""
+    inp, format, direktori = tugas
+    path = Path(direktori) / kunci_berkas(inp, format)
+    if not path.exists():
+        _simpan_atomik(path, render_laporan(inp, format))
+    return str(path)
+
+
+# --- POOL ---
+
+class PoolEkspor:
+    """Process pool untuk render laporan; satu instance dibagi semua sesi Streamlit."""
+
+    def __init__(self, workers=None, direktori=DIR_LAPORAN):
+        self.workers = workers or max(1, min(4, os.cpu_count() or 1))
+        self.direktori = Path(direktori)
+        self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return self._pool
+
+    def kirim(self, inp, format='pdf'):
+        """Future berisi path laporan; langsung selesai jika sudah ada di cache."""
+        path = laporan_tercache(inp, format, self.direktori)
+        if path is not None:
+            selesai = Future()
+            selesai.set_result(str(path))
+            return selesai
+        return self.pool.submit(_worker_render, (inp, format, str(self.direktori)))
+
+    def ekspor_massal(self, daftar_input, tujuan, format='pdf', nama=None):
+        """Render banyak skenario paralel lalu salin ke `tujuan`/<nama>.<format>.
+
+        Skenario identik hanya di-render sekali; `nama` dibersihkan dengan `nama_aman`
+        dan harus unik. Kembalikan daftar path hasil.
+        """
+        if nama is None:
+            nama = [f'laporan_{i + 1:06d}' for i in range(len(daftar_input))]
+        nama = [nama_aman(n) for n in nama]
+        if len(nama) != len(daftar_input) or '' in nama:
+            raise ValueError("Setiap laporan butuh satu nama file yang tidak kosong")
+        ganda = sorted({n for n in nama if nama.count(n) > 1})
+        if ganda:
+            raise ValueError(f"Nama laporan ganda (file akan saling menimpa): {', '.join(ganda[:10])}")
+        tujuan = Path(tujuan)
+        tujuan.mkdir(parents=True, exist_ok=True)
+        unik = {}
+        for inp in daftar_input:
+            unik.setdefault(kunci_berkas(inp, format), inp)
+        future = {k: self.kirim(inp, format) for k, inp in unik.items()}
+        hasil = []
+        for i, inp in enumerate(daftar_input):
+            berkas = tujuan / f'{nama[i]}.{format}'
+            shutil.copyfile(future[kunci_berkas(inp, format)].result(), berkas)
+            hasil.append(berkas)
+        return hasil
+
+    def tutup(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# --- CLI ---
+
+def _angka(teks, bulat=False, maks=float('inf')):
+    """Angka positif dari sel CSV, paling besar `maks` (bulat jika `bulat`); ValueError jika tidak valid."""
+    nilai = float(teks)
+    if not (0 < nilai < float('inf') and nilai <= maks) or (bulat and nilai != round(nilai)):
+        raise ValueError(teks)
+    return int(nilai) if bulat else nilai
+
+
+def _baca_input(path):
+    """Daftar (id, InputSkenario) dari CSV pelanggan, memakai dataset referensi bawaan.
+
+    Id dibersihkan dengan `nama_aman`. Baris dengan provinsi tidak dikenal, angka tidak
+    valid, atau id yang sudah dipakai baris sebelumnya dikembalikan sebagai (id, alasan).
+    """
+    import pandas as pd
+    from cli import STATUS_INPUT, STATUS_PROVINSI, petakan_kolom
+    from referensi import referensi_bawaan
+
+    df = pd.read_csv(path, dtype=str, keep_default_na=False, skipinitialspace=True)
+    df.columns = [str(k).strip() for k in df.columns]
+    peta = petakan_kolom(df.columns)
+    kolom_id = next((k for k in df.columns if k.lower() == 'id'), None)
+    referensi = referensi_bawaan()
+    daftar, dilewati, terpakai = [], [], set()
+    for i, baris in enumerate(df.to_dict('records')):
+        ident = nama_aman(baris[kolom_id].strip()) if kolom_id else ''
+        ident = ident or f'laporan_{i + 1:06d}'
+        if ident in terpakai:
+            dilewati.append((ident, 'id_ganda'))
+            continue
+        terpakai.add(ident)
+        try:
+            situs = referensi.situs(referensi.cari(baris[peta['provinsi']]))
+        except KeyError:
+            dilewati.append((ident, STATUS_PROVINSI))
+            continue
+        try:
+            tagihan = _angka(baris[peta['tagihan']])
+            wp = _angka(baris[peta['wp']], bulat=True, maks=MAX_WP_MODUL)
+            modul = _angka(baris[peta['modul']], bulat=True, maks=MAX_JUMLAH_MODUL)
+        except ValueError:
+            dilewati.append((ident, STATUS_INPUT))
+            continue
+        klimatologi = referensi.klimatologi(situs.indeks)
+        daftar.append((ident, InputSkenario(
+            provinsi=situs.nama, radiasi_harian=situs.radiasi, faktor_emisi=situs.emisi,
+            tagihan_bulanan=tagihan, wp_modul=wp, jumlah_modul=modul,
+            faktor_musim=klimatologi.faktor, zona_musim=klimatologi.zona,
+        )))
+    return daftar, dilewati
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekspor laporan PDF/PNG massal dari CSV pelanggan")
+    parser.add_argument('input', help="CSV dengan kolom provinsi, tagihan, wp, modul (opsional id)")
+    parser.add_argument('-o', '--output', required=True, help="Direktori tujuan laporan")
+    parser.add_argument('--format', choices=FORMAT, default='pdf')
+    parser.add_argument('--workers', type=int, default=None, help="Jumlah proses render (default: min(4, core))")
+    args = parser.parse_args(argv)
+
+    mulai = time.perf_counter()
+    try:
+        daftar, dilewati = _baca_input(args.input)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    pool = PoolEkspor(args.workers)
+    try:
+        hasil = pool.ekspor_massal([inp for _, inp in daftar], args.output, args.format,
+                                   nama=[ident for ident, _ in daftar])
+    finally:
+        pool.tutup()
+    print(f"{len(hasil)} laporan ditulis ke {args.output} ({time.perf_counter() - mulai:.1f} dtk)", file=sys.stderr)
+    if dilewati:
+        contoh = ', '.join(f'{ident} ({alasan})' for ident, alasan in dilewati[:10])
+        print(f"{len(dilewati)} baris dilewati: {contoh}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
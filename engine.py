@@ -0,0 +1,245 @@
+"""Mesin perhitungan Solar Analyzer.
+
+Modul ini berisi seluruh matematika penghematan, payback dan emisi yang
+sebelumnya tertanam di `project.py`. Tidak ada pemanggilan `st.*` maupun
+plotly di sini, sehingga modul bisa dipakai langsung untuk batch job,
+benchmark, maupun halaman Streamlit (yang kini hanya menjadi tampilan).
+"""
+
+from dataclasses import dataclass
+
+from payback import kurva_kumulatif, titik_impas
+
+# --- 1. KONSTANTA PROYEK ---
+TARIF_PLN = 1400
+FILE_DATA = 'produksi_emisi_provinsi.csv'
+FILE_NASA = 'Cibodas.csv'
+WP_CHOICES = [300, 350, 400, 450, 500, 550]
+MIN_PV_MODULES = 1
+MAX_PV_MODULES = 50
+# Batas input massal (cli.py, ekspor.py, api.py): wp x modul tetap jauh di bawah batas int64
+MAX_WP_MODUL = 2_000
+MAX_JUMLAH_MODUL = 1_000_000
+TAHUN_ANALISIS = 15
+ASUMSI_INFLASI_LISTRIK = 0.05
+BIAYA_AWAL_PV_PER_Wp = 15000
+
+HARI_PER_BULAN = 30
+BULAN_LIST = ['Jan', 'Feb', 'Mar', 'Apr', 'Mei', 'Jun', 'Jul', 'Agu', 'Sep', 'Okt', 'Nov', 'Des']
+DAYS_IN_MONTH = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+
+# Pola musim per zona (faktor pengali produksi harian per bulan)
+POLA_MONSUN = [0.80, 0.85, 0.90, 0.98, 1.05, 1.10, 1.15, 1.18, 1.12, 1.02, 0.90, 0.85]
+POLA_KHATULISTIWA = [0.95, 0.98, 1.05, 1.02, 0.98, 0.96, 0.98, 1.02, 1.05, 1.02, 0.98, 0.96]
+KATA_KUNCI_MONSUN = ['jawa', 'jakarta', 'banten', 'yogyakarta', 'bali', 'nusa']
+ZONA_DATA_PER_JAM = 'Data Per Jam'
+
+
+# --- 2. FUNGSI UTILITY ---
+def format_rupiah(x):
+    """Format angka menjadi Rupiah untuk label grafik dan tampilan."""
+    if x >= 1e9:
+        return f"Rp {x/1e9:,.2f} M"
+    if x >= 1e6:
+        return f"Rp {x/1e6:,.1f} Jt"
+    return f"Rp {x:,.0f}"
+
+
+def format_payback(payback_tahun, tahun_analisis=TAHUN_ANALISIS):
+    """Teks masa balik modal untuk kartu metrik dan tabel."""
+    if payback_tahun <= tahun_analisis:
+        return f"{payback_tahun} Tahun"
+    return f"> {tahun_analisis} Tahun"
+
+
+KOLOM_PROVINSI = ['Provinsi', 'Produksi_Harian_kWh', 'Faktor_Emisi_kg_per_kWh']
+
+
+def _angka(teks):
+    """Angka dari sel CSV provinsi (desimal koma dan satuan kWh/kWp diterima); None jika kosong/rusak."""
+    try:
+        nilai = float(teks.replace(',', '.').replace(' kWh/kWp', ''))
+    except ValueError:
+        return None
+    return None if nilai != nilai else nilai
+
+
+def baca_baris_provinsi(file_path):
+    """Baca dan normalisasi CSV provinsi tanpa pandas: list (provinsi, radiasi, faktor emisi)."""
+    import csv
+
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        teks = f.read()
+
+    baris = list(csv.reader(teks.splitlines(), delimiter=','))
+    if baris and len(baris[0]) <= 2:
+        baris = list(csv.reader(teks.splitlines(), delimiter=';'))
+    if not baris:
+        return []
+
+    mulai = 1 if baris[0][0].lower() in ['no', 'no.'] else 0
+    hasil = []
+    for b in baris[1:]:
+        b = b[mulai:mulai + 3]
+        if len(b) < 3 or not b[0]:
+            continue
+        radiasi, emisi = _angka(b[1]), _angka(b[2])
+        if radiasi is not None and emisi is not None:
+            hasil.append((b[0], radiasi, emisi))
+    return hasil
+
+
+def baca_data_provinsi(file_path):
+    """Baca dan normalisasi CSV provinsi (delimiter, kolom No, desimal koma) sebagai DataFrame."""
+    import pandas as pd
+
+    return pd.DataFrame(baca_baris_provinsi(file_path), columns=KOLOM_PROVINSI)
+
+
+def pola_musim(nama_prov):
+    """Kembalikan (nama zona, 12 faktor musim) berdasarkan nama provinsi."""
+    nama = nama_prov.lower()
+
+    # ZONA 1: TIPE MONSUN (Jawa, Bali, Nusa Tenggara)
+    if any(x in nama for x in KATA_KUNCI_MONSUN):
+        return 'Monsun', POLA_MONSUN
+
+    # ZONA 2: TIPE KHATULISTIWA (Sumatra, Kalimantan, Sulawesi, Papua, dll)
+    return 'Khatulistiwa', POLA_KHATULISTIWA
+
+
+# --- 3. INPUT & HASIL ---
+@dataclass(frozen=True)
+class InputSkenario:
+    """Satu skenario analisis: lokasi, tagihan dan konfigurasi PV."""
+    provinsi: str
+    radiasi_harian: float       # PV Out, kWh/kWp/hari
+    faktor_emisi: float         # kg CO2/kWh
+    tagihan_bulanan: float      # Rp/bulan
+    wp_modul: int = 550
+    jumlah_modul: int = 4
+    faktor_musim: tuple = None  # 12 faktor bulanan; None = pola zona provinsi (`pola_musim`)
+    zona_musim: str = None      # asal `faktor_musim` (mis. 'Monsun'); None = ZONA_DATA_PER_JAM
+
+    @classmethod
+    def dari_data(cls, data_solar, provinsi, tagihan_bulanan, wp_modul, jumlah_modul):
+        """Bangun input dari tabel provinsi hasil `baca_data_provinsi`."""
+        data_lokasi = data_solar[data_solar['Provinsi'] == provinsi].iloc[0]
+        return cls(
+            provinsi=provinsi,
+            radiasi_harian=data_lokasi['Produksi_Harian_kWh'],
+            faktor_emisi=data_lokasi['Faktor_Emisi_kg_per_kWh'],
+            tagihan_bulanan=tagihan_bulanan,
+            wp_modul=wp_modul,
+            jumlah_modul=jumlah_modul,
+        )
+
+
+@dataclass(frozen=True)
+class HasilSkenario:
+    """Seluruh angka yang ditampilkan dashboard untuk satu skenario."""
+    kapasitas_pv_wp: float
+    kapasitas_pv_kwp: float
+    konsumsi_kwh: float
+    produksi_pv_harian: float
+    produksi_pv_bulanan: float
+    penghematan_rp: float
+    emisi_dicegah_total: float
+    skor_kemandirian: float
+    tagihan_baru: float
+    biaya_instalasi_pv: float
+    payback_tahun: int
+    biaya_kumulatif_tanpa_pv: tuple
+    biaya_kumulatif_dengan_pv: tuple
+    emisi_total_ton: float
+    emisi_awal_total: float
+    emisi_dicegah_grafik: float
+    emisi_tersisa_pln: float
+    zona_musim: str
+    faktor_musim: tuple
+    produksi_bulanan_simulasi: tuple
+
+    @property
+    def total_hemat(self):
+        """Selisih biaya kumulatif tanpa dan dengan PV di akhir horizon."""
+        return self.biaya_kumulatif_tanpa_pv[-1] - self.biaya_kumulatif_dengan_pv[-1]
+
+    @property
+    def df_proyeksi(self):
+        """Tabel proyeksi biaya kumulatif per tahun (pandas diimpor saat dipakai)."""
+        import pandas as pd
+
+        return pd.DataFrame({
+            'Tahun': range(1, len(self.biaya_kumulatif_tanpa_pv) + 1),
+            'Tanpa PV': self.biaya_kumulatif_tanpa_pv,
+            'Dengan PV': self.biaya_kumulatif_dengan_pv
+        })
+
+
+# --- 4. PROSES ALGORITMA ---
+def hitung_skenario(inp, tahun_analisis=TAHUN_ANALISIS):
+    """Hitung penghematan, payback, emisi dan profil bulanan satu skenario."""
+    kapasitas_pv_wp = inp.wp_modul * inp.jumlah_modul
+    kapasitas_pv_kwp = kapasitas_pv_wp / 1000.0
+
+    # B. Perhitungan Konsumsi & Produksi
+    konsumsi_kwh = inp.tagihan_bulanan / TARIF_PLN
+    produksi_pv_harian = inp.radiasi_harian * kapasitas_pv_kwp
+    produksi_pv_bulanan = produksi_pv_harian * HARI_PER_BULAN
+
+    # C. Hitung Output Kritis Bulanan
+    penghematan_rp = produksi_pv_bulanan * TARIF_PLN
+    emisi_dicegah_total = produksi_pv_bulanan * inp.faktor_emisi
+    skor_kemandirian = (produksi_pv_bulanan / konsumsi_kwh) * 100
+    skor_kemandirian = min(skor_kemandirian, 100)
+    tagihan_baru = inp.tagihan_bulanan - penghematan_rp
+    if tagihan_baru < 0: tagihan_baru = 0
+
+    # D. Hitung Output Kritis Jangka Panjang (Payback Fix, lihat payback.py)
+    biaya_instalasi_pv = kapasitas_pv_wp * BIAYA_AWAL_PV_PER_Wp
+    biaya_kumulatif_tanpa_pv, biaya_kumulatif_dengan_pv = kurva_kumulatif(
+        inp.tagihan_bulanan, tagihan_baru, biaya_instalasi_pv,
+        tahun_analisis, ASUMSI_INFLASI_LISTRIK
+    )
+    payback_tahun = int(titik_impas(
+        biaya_kumulatif_tanpa_pv, biaya_kumulatif_dengan_pv, biaya_instalasi_pv
+    ).langkah)
+
+    emisi_total_ton = emisi_dicegah_total * 12 * tahun_analisis / 1000
+
+    # E. VARIABEL KHUSUS UNTUK GRAFIK DONUT
+    emisi_awal_total = konsumsi_kwh * inp.faktor_emisi
+    emisi_dicegah_grafik = min(emisi_dicegah_total, emisi_awal_total)
+    emisi_tersisa_pln = emisi_awal_total - emisi_dicegah_grafik
+
+    # F. Profil Produksi Bulanan (Simulasi Musiman)
+    if inp.faktor_musim is not None:
+        zona_musim, faktor_musim = inp.zona_musim or ZONA_DATA_PER_JAM, inp.faktor_musim
+    else:
+        zona_musim, faktor_musim = pola_musim(inp.provinsi)
+    produksi_bulanan_simulasi = tuple(
+        produksi_pv_harian * DAYS_IN_MONTH[i] * faktor_musim[i] for i in range(12)
+    )
+
+    return HasilSkenario(
+        kapasitas_pv_wp=kapasitas_pv_wp,
+        kapasitas_pv_kwp=kapasitas_pv_kwp,
+        konsumsi_kwh=konsumsi_kwh,
+        produksi_pv_harian=produksi_pv_harian,
+        produksi_pv_bulanan=produksi_pv_bulanan,
+        penghematan_rp=penghematan_rp,
+        emisi_dicegah_total=emisi_dicegah_total,
+        skor_kemandirian=skor_kemandirian,
+        tagihan_baru=tagihan_baru,
+        biaya_instalasi_pv=biaya_instalasi_pv,
+        payback_tahun=payback_tahun,
+        biaya_kumulatif_tanpa_pv=tuple(biaya_kumulatif_tanpa_pv.tolist()),
+        biaya_kumulatif_dengan_pv=tuple(biaya_kumulatif_dengan_pv.tolist()),
+        emisi_total_ton=emisi_total_ton,
+        emisi_awal_total=emisi_awal_total,
+        emisi_dicegah_grafik=emisi_dicegah_grafik,
+        emisi_tersisa_pln=emisi_tersisa_pln,
+        zona_musim=zona_musim,
+        faktor_musim=tuple(faktor_musim),
+        produksi_bulanan_simulasi=produksi_bulanan_simulasi,
+    )
@@ -0,0 +1,247 @@
+"""Grafik plotly dan tabel dashboard untuk satu skenario (tanpa Streamlit).
+
+`TampilanSkenario` membungkus `InputSkenario` + `HasilSkenario` dan
+membangun setiap grafik/tabel saat pertama kali diminta, lalu menyimpannya.
+Satu objek bisa dipakai ulang oleh banyak rerun dan sesi lewat
+`cache_skenario.CacheLRU`.
+
+pandas dan plotly baru diimpor saat grafik/tabel pertama dibangun, sehingga
+membuat `TampilanSkenario` (dan mengimpor modul ini) tidak memperlambat start
+aplikasi.
+"""
+
+from functools import cached_property
+
+from engine import TAHUN_ANALISIS, BULAN_LIST, format_rupiah, format_payback
+
+
+class TampilanSkenario:
+    """Hasil perhitungan beserta grafik & tabel yang dibangun sesuai permintaan."""
+
+    def __init__(self, inp, hasil):
+        self.inp = inp
+        self.hasil = hasil
+
+    @cached_property
+    def df_proyeksi(self):
+        return self.hasil.df_proyeksi
+
+    @cached_property
+    def payback_display(self):
+        return format_payback(self.hasil.payback_tahun)
+
+    @cached_property
+    def fig_bar(self):
+        """Tab 1: tagihan sebelum vs sesudah PV."""
+        import pandas as pd
+        import plotly.express as px
+
+        hasil, tagihan_bulanan = self.hasil, self.inp.tagihan_bulanan
+        data_biaya = pd.DataFrame({
+            'Kategori': ['Tagihan Awal', 'Tagihan Akhir'],
+            'Rupiah': [tagihan_bulanan, hasil.tagihan_baru],
+            'Teks': [format_rupiah(tagihan_bulanan), format_rupiah(hasil.tagihan_baru)]
+        })
+
+        fig_bar = px.bar(
+            data_biaya,
+            x='Kategori',
+            y='Rupiah',
+            text='Teks',
+            color='Kategori',
+            color_discrete_map={'Tagihan Awal': '#34495e', 'Tagihan Akhir': '#2ecc71'},
+            title='Perbandingan Tagihan Listrik: Sebelum vs Sesudah PV'
+        )
+
+        fig_bar.update_layout(yaxis_title="", xaxis_title="", showlegend=False)
+
+        if hasil.penghematan_rp > 0 and hasil.tagihan_baru < tagihan_bulanan:
+            y_pos_annotasi = (tagihan_bulanan + hasil.tagihan_baru) / 2
+            fig_bar.add_annotation(
+                x=0.5, y=y_pos_annotasi,
+                text=f"Hemat: {format_rupiah(hasil.penghematan_rp)}",
+                showarrow=False,
+                font=dict(size=14, color="black"),
+                bgcolor="rgba(255, 255, 0, 0.8)",
+                borderpad=4
+            )
+        return fig_bar
+
+    @cached_property
+    def fig_proj(self):
+        """Tab 2: biaya kumulatif tanpa vs dengan PV."""
+        import plotly.express as px
+
+        hasil, df_proyeksi = self.hasil, self.df_proyeksi
+        df_plot_longterm = df_proyeksi.melt('Tahun', var_name='Skenario', value_name='Total Biaya Kumulatif')
+
+        fig_proj = px.line(
+            df_plot_longterm,
+            x='Tahun',
+            y='Total Biaya Kumulatif',
+            color='Skenario',
+            color_discrete_map={'Tanpa PV': '#e74c3c', 'Dengan PV': '#2ecc71'},
+            title='Perbandingan Biaya Kumulatif Jangka Panjang',
+            markers=True
+        )
+
+        fig_proj.update_layout(yaxis=dict(tickformat=",.0f", tickprefix="Rp "))
+
+        if hasil.payback_tahun <= TAHUN_ANALISIS:
+            payback_cost = df_proyeksi[df_proyeksi['Tahun'] == hasil.payback_tahun]['Dengan PV'].iloc[0]
+            fig_proj.add_scatter(
+                x=[hasil.payback_tahun], y=[payback_cost],
+                mode='markers', marker=dict(size=10, color='#3498db'),
+                name='Masa Balik Modal', showlegend=False
+            )
+        return fig_proj
+
+    @cached_property
+    def df_monthly(self):
+        import pandas as pd
+
+        return pd.DataFrame({
+            'Bulan': BULAN_LIST,
+            'Produksi (kWh)': self.hasil.produksi_bulanan_simulasi
+        })
+
+    @cached_property
+    def musim_tinggi(self):
+        return max(self.hasil.faktor_musim) > 1.10
+
+    @cached_property
+    def fig_monthly(self):
+        """Tab 3: profil produksi energi bulanan."""
+        import plotly.express as px
+
+        warna_bar = '#e74c3c' if self.musim_tinggi else '#f39c12'
+
+        fig_monthly = px.bar(
+            self.df_monthly,
+            x='Bulan',
+            y='Produksi (kWh)',
+            text_auto='.0f',
+            title=f"Profil Energi Bulanan - {self.inp.provinsi}",
+            color_discrete_sequence=[warna_bar]
+        )
+
+        # Tanpa 'hovermode="x unified"' dan anotasi puncak agar grafik bersih
+        fig_monthly.update_layout(
+            yaxis_title="Energi (kWh)",
+            xaxis_title="",
+            bargap=0.3,
+            plot_bgcolor='rgba(0,0,0,0)'
+        )
+        return fig_monthly
+
+    @cached_property
+    def fig_donut(self):
+        """Tab 4: emisi dicegah vs sisa dari PLN."""
+        import plotly.graph_objects as go
+
+        hasil = self.hasil
+        fig_donut = go.Figure(data=[go.Pie(
+            labels=['Dicegah (PV)', 'Sisa (PLN)'],
+            values=[hasil.emisi_dicegah_grafik, hasil.emisi_tersisa_pln],
+            hole=.6,
+            marker_colors=['#2ecc71', '#bdc3c7'],
+            hoverinfo="label+value+percent",
+            textinfo='percent'
+        )])
+
+        fig_donut.update_layout(
+            annotations=[dict(text=f"{hasil.skor_kemandirian:.0f}%", x=0.5, y=0.5, font_size=20, showarrow=False)],
+            showlegend=True,
+            legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
+        )
+        return fig_donut
+
+    @cached_property
+    def data_sistem(self):
+        """Tab 5: ringkasan teknis sistem."""
+        import pandas as pd
+
+        inp, hasil = self.inp, self.hasil
+        return pd.DataFrame({
+            "Keterangan": ["Kapasitas PV Total", "Jumlah Modul", "Kapasitas 1 Modul", "Produksi Energi Bulanan"],
+            "Nilai": [f"{hasil.kapasitas_pv_kwp:.2f} kWp", f"{inp.jumlah_modul} unit", f"{inp.wp_modul} Wp", f"{hasil.produksi_pv_bulanan:.2f} kWh"]
+        }).set_index('Keterangan')
+
+    @cached_property
+    def data_finansial(self):
+        """Tab 5: rincian finansial & dampak."""
+        import pandas as pd
+
+        hasil = self.hasil
+        return pd.DataFrame({
+            "Keterangan": ["Biaya Instalasi Awal", "Tagihan Bulanan Baru", "Penghematan Bulanan", "Masa Balik Modal", f"Total Emisi Dicegah ({TAHUN_ANALISIS} Thn)"],
+            "Nilai": [format_rupiah(hasil.biaya_instalasi_pv), format_rupiah(hasil.tagihan_baru), format_rupiah(hasil.penghematan_rp), self.payback_display, f"{hasil.emisi_total_ton:.1f} ton CO₂"]
+        }).set_index('Keterangan')
+
+
+def fig_kipas(hasil_mc):
+    """Tab 2 (mode Monte Carlo): fan chart posisi kas kumulatif P10–P90."""
+    import plotly.graph_objects as go
+    from monte_carlo import PERSENTIL_KIPAS
+
+    tahun = list(range(1, hasil_mc.tahun + 1))
+    pita = dict(zip(PERSENTIL_KIPAS, hasil_mc.kipas))
+    fig = go.Figure()
+    for bawah, atas, warna in ((10, 90, 'rgba(46, 204, 113, 0.2)'), (25, 75, 'rgba(46, 204, 113, 0.4)')):
+        fig.add_scatter(x=tahun, y=pita[atas], mode='lines', line_width=0, showlegend=False, hoverinfo='skip')
+        fig.add_scatter(x=tahun, y=pita[bawah], mode='lines', line_width=0, fill='tonexty',
+                        fillcolor=warna, name=f'P{bawah}–P{atas}')
+    fig.add_scatter(x=tahun, y=pita[50], mode='lines+markers', line_color='#27ae60', name='P50')
+    fig.add_hline(y=0, line_dash='dash', line_color='#7f8c8d')
+    fig.update_layout(
+        title='Sebaran Posisi Kas Kumulatif (Penghematan − Biaya Instalasi)',
+        xaxis_title='Tahun', yaxis=dict(title='', tickformat=",.0f", tickprefix="Rp "),
+        legend=dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5)
+    )
+    return fig
+
+
+def fig_arus_kas(hasil_keu):
+    """Tab 2 (model arus kas): posisi kas kumulatif bulanan, nominal dan terdiskonto."""
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+
+    arus = hasil_keu.arus_kas_bulanan()
+    bulan = np.arange(1, len(arus) + 1)
+    v = (1 + hasil_keu.param.diskonto) ** (-bulan / 12)
+    df = pd.DataFrame({
+        'Tahun': bulan / 12,
+        'Nominal': np.cumsum(arus) - hasil_keu.biaya_instalasi,
+        'Terdiskonto': np.cumsum(arus * v) - hasil_keu.biaya_instalasi,
+    }).melt('Tahun', var_name='Arus Kas', value_name='Posisi Kas Kumulatif')
+    fig = px.line(
+        df, x='Tahun', y='Posisi Kas Kumulatif', color='Arus Kas',
+        color_discrete_map={'Nominal': '#2ecc71', 'Terdiskonto': '#3498db'},
+        title='Posisi Kas Kumulatif Bulanan (Penghematan − O&M − Inverter − Investasi)'
+    )
+    fig.add_hline(y=0, line_dash='dash', line_color='#7f8c8d')
+    fig.update_layout(yaxis=dict(tickformat=",.0f", tickprefix="Rp "))
+    return fig
+
+
+def fig_deret_waktu(waktu, deret, judul, jumlah_titik=None, metode='lttb'):
+    """Deret waktu panjang (per jam / multi-tahun) sebagai subplot WebGL bertumpuk.
+
+    `deret` = {judul sumbu y: (nilai, warna)}. Setiap deret diturunkan ke
+    sekitar `jumlah_titik` titik (lihat downsample.py), jadi ukuran payload
+    tetap walau datanya bertambah.
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    from downsample import TITIK_LAYAR, turunkan
+
+    fig = make_subplots(rows=len(deret), cols=1, shared_xaxes=True, vertical_spacing=0.06)
+    for baris, (label, (nilai, warna)) in enumerate(deret.items(), start=1):
+        x, y = turunkan(waktu, nilai, jumlah_titik or TITIK_LAYAR, metode)
+        fig.add_trace(go.Scattergl(x=x, y=y, mode='lines', line=dict(color=warna, width=1.3), name=label),
+                      row=baris, col=1)
+        fig.update_yaxes(title_text=label, row=baris, col=1)
+    fig.update_layout(title=judul, height=300 * len(deret), showlegend=False, hovermode='x unified',
+                      uirevision=judul)
+    return fig
@@ -0,0 +1,320 @@
+"""Model arus kas bulanan: degradasi, O&M, penggantian inverter, diskonto, golongan tarif.
+
+Arus kas dihitung per bulan selama horizon berapa pun. Produksi, tarif dan
+O&M berubah per tahun (degradasi, inflasi), sehingga dua belas bulan dalam satu
+tahun membawa arus yang sama; diskonto bulanan satu tahun cukup diringkas
+menjadi faktor `S = v + v^2 + ... + v^12` dengan `v` faktor diskonto bulanan.
+
+Arus tiap skenario terpisah menjadi besaran per skenario (produksi, konsumsi,
+tarif, Wp) kali tabel per tahun yang sama untuk semua skenario. Metrik (NPV,
+IRR, LCOE, payback biasa & terdiskonto) dihitung dengan loop pendek per tahun
+atas vektor skenario, tanpa array (skenario x bulan), sehingga bisa dipakai
+langsung pada seluruh grid `batch.evaluasi_grid`.
+
+Tarif memakai golongan rumah tangga PLN berdasarkan daya tersambung (VA);
+`engine.TARIF_PLN` tetap menjadi tarif rata-rata untuk dashboard utama.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from engine import TAHUN_ANALISIS, TARIF_PLN, BIAYA_AWAL_PV_PER_Wp, ASUMSI_INFLASI_LISTRIK
+from optimasi import TINGKAT_DISKONTO
+
+ITERASI_IRR = 50
+TOLERANSI_IRR = 1e-10
+
+
+@dataclass(frozen=True)
+class GolonganTarif:
+    """Satu golongan tarif rumah tangga PLN."""
+    kode: str
+    daya_maks_va: float     # batas atas daya tersambung golongan ini
+    tarif: float            # Rp/kWh
+
+
+# Tarif tenaga listrik rumah tangga (tegangan rendah), Rp/kWh
+GOLONGAN_TARIF = (
+    GolonganTarif('R-1/TR 450 VA (subsidi)', 450, 415.0),
+    GolonganTarif('R-1/TR 900 VA (subsidi)', 900, 605.0),
+    GolonganTarif('R-1/TR 900 VA-RTM', 900, 1352.0),
+    GolonganTarif('R-1/TR 1.300 VA', 1300, 1444.70),
+    GolonganTarif('R-1/TR 2.200 VA', 2200, 1444.70),
+    GolonganTarif('R-2/TR 3.500-5.500 VA', 5500, 1699.53),
+    GolonganTarif('R-3/TR >= 6.600 VA', np.inf, 1699.53),
+)
+DAYA_TERSAMBUNG_VA = (450, 900, 1300, 2200, 3500, 4400, 5500, 6600, 7700, 11000, 13200)
+
+# Golongan non-subsidi (dipakai `tarif_golongan`), terurut menurut batas daya
+_GOLONGAN_UMUM = [g for g in GOLONGAN_TARIF if 'subsidi' not in g.kode or g.daya_maks_va == 450]
+_BATAS_DAYA = np.array([g.daya_maks_va for g in _GOLONGAN_UMUM])
+_TARIF_GOLONGAN = np.array([g.tarif for g in _GOLONGAN_UMUM])
+
+
+def golongan_tarif(daya_va, subsidi=False):
+    """Golongan tarif untuk satu daya tersambung (VA)."""
+    if subsidi and daya_va == 900:
+        return GOLONGAN_TARIF[1]
+    return _GOLONGAN_UMUM[int(np.searchsorted(_BATAS_DAYA, daya_va))]
+
+
+def tarif_golongan(daya_va):
+    """Tarif Rp/kWh per daya tersambung (array; 900 VA dihitung sebagai non-subsidi)."""
+    return _TARIF_GOLONGAN[np.searchsorted(_BATAS_DAYA, np.asarray(daya_va, dtype=np.float64))]
+
+
+@dataclass(frozen=True)
+class ParameterKeuangan:
+    """Asumsi model arus kas; nilai bawaan mengikuti asumsi dashboard."""
+    tahun: int = TAHUN_ANALISIS
+    inflasi_tarif: float = ASUMSI_INFLASI_LISTRIK
+    diskonto: float = TINGKAT_DISKONTO           # per tahun
+    biaya_per_wp: float = BIAYA_AWAL_PV_PER_Wp
+    degradasi: float = 0.005                     # per tahun
+    om_per_kwp_tahun: float = 150_000            # Rp/kWp/tahun (pembersihan, inspeksi)
+    inflasi_om: float = 0.03
+    umur_inverter: int = 10                      # tahun; 0 = tanpa penggantian
+    biaya_inverter_per_wp: float = 2_000         # Rp/Wp, harga tahun ke-0
+
+
+@dataclass(frozen=True)
+class TabelTahunan:
+    """Faktor per tahun yang sama untuk semua skenario (panjang = horizon)."""
+    tarif: np.ndarray       # pengali tarif (inflasi, tahun ke-1 sudah naik seperti engine)
+    produksi: np.ndarray    # pengali produksi (degradasi)
+    om: np.ndarray          # Rp O&M per Wp per bulan
+    inverter: np.ndarray    # Rp penggantian inverter per Wp di akhir tahun
+
+    @classmethod
+    def dari_param(cls, param):
+        tahun_ke = np.arange(param.tahun)
+        akhir_tahun = tahun_ke + 1
+        # Inverter diganti di akhir tahun umur_inverter, 2*umur_inverter, ... (bukan di akhir horizon)
+        ganti = np.zeros(param.tahun)
+        if param.umur_inverter > 0:
+            ganti = np.where((akhir_tahun % param.umur_inverter == 0) & (akhir_tahun < param.tahun),
+                             param.biaya_inverter_per_wp * (1 + param.inflasi_om) ** akhir_tahun, 0.0)
+        return cls(
+            tarif=(1 + param.inflasi_tarif) ** akhir_tahun,
+            produksi=(1 - param.degradasi) ** tahun_ke,
+            om=param.om_per_kwp_tahun / 12 / 1000 * (1 + param.inflasi_om) ** tahun_ke,
+            inverter=ganti,
+        )
+
+
+@dataclass(frozen=True)
+class HasilKeuangan:
+    """Metrik per skenario (bentuk = bentuk broadcast input)."""
+    tagihan_bulanan: np.ndarray
+    produksi_pv_bulanan: np.ndarray
+    kapasitas_pv_wp: np.ndarray
+    tarif: np.ndarray
+    biaya_instalasi: np.ndarray
+    npv: np.ndarray
+    irr: np.ndarray                 # per tahun; NaN jika tidak ada akar
+    lcoe: np.ndarray                # Rp/kWh
+    payback_tahun: np.ndarray       # pecahan, NaN jika tidak balik modal dalam horizon
+    payback_diskonto_tahun: np.ndarray
+    param: ParameterKeuangan
+
+    def arus_tahunan(self):
+        """Arus per bulan di tiap tahun, masing-masing berbentuk (..., tahun)."""
+        tabel = TabelTahunan.dari_param(self.param)
+        produksi = self.produksi_pv_bulanan[..., None] * tabel.produksi
+        konsumsi = (self.tagihan_bulanan / self.tarif)[..., None]
+        return {
+            'produksi_kwh': produksi,
+            'hemat': np.minimum(produksi, konsumsi) * (self.tarif[..., None] * tabel.tarif),
+            'om': self.kapasitas_pv_wp[..., None] * tabel.om,
+            'inverter': self.kapasitas_pv_wp[..., None] * tabel.inverter,
+        }
+
+    def arus_kas_bulanan(self):
+        """Arus kas bersih per bulan (..., tahun*12), tanpa biaya instalasi di bulan ke-0."""
+        arus = self.arus_tahunan()
+        bersih = np.repeat(arus['hemat'] - arus['om'], 12, axis=-1)
+        bersih[..., 11::12] -= arus['inverter']
+        return bersih
+
+
+def _faktor_tahun(v):
+    """S(v) = v + v^2 + ... + v^12 dan x = v^12 untuk v skalar atau array."""
+    pangkat = np.cumprod(np.broadcast_to(np.asarray(v, dtype=np.float64)[..., None],
+                                         np.shape(v) + (12,)), axis=-1)
+    return pangkat.sum(axis=-1), pangkat[..., -1]
+
+
+def _arus_tahun(y, p, k, tarif, wp, tabel):
+    """Arus bersih per bulan pada tahun ke-y (tanpa inverter) untuk vektor skenario."""
+    return np.minimum(p * tabel.produksi[y], k) * (tarif * tabel.tarif[y]) - wp * tabel.om[y]
+
+
+def _payback(p, k, tarif, wp, biaya, tabel, v):
+    """Titik impas (tahun pecahan) arus bulanan terdiskonto v.
+
+    Tahun impas dicari dari kumulatif akhir tahun; di dalam tahun itu bulan
+    impas diselesaikan dari deret diskonto bulanan (kontinu dalam bulan).
+    """
+    s, x = _faktor_tahun(v)
+    kumulatif = np.zeros(biaya.shape)
+    tahun = np.full(biaya.shape, np.nan)
+    sisa = np.zeros(biaya.shape)            # kekurangan di awal tahun impas, dalam satuan arus bulanan
+    belum = biaya > 0
+    tahun[~belum] = 0.0
+    d = 1.0
+    for y in range(len(tabel.tarif)):
+        arus = _arus_tahun(y, p, k, tarif, wp, tabel) * d
+        sebelum = kumulatif
+        kumulatif = sebelum + arus * s - wp * tabel.inverter[y] * (d * x)
+        impas = belum & (kumulatif >= biaya)
+        if impas.any():
+            tahun[impas] = y
+            with np.errstate(divide='ignore', invalid='ignore'):
+                sisa[impas] = ((biaya - sebelum) / arus)[impas]
+            belum &= ~impas
+        d *= x
+    # Cari m dengan v + ... + v^m = sisa (m = sisa jika tanpa diskonto)
+    if v == 1:
+        bulan = sisa
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bulan = np.log1p(-sisa * (1 - v) / v) / np.log(v)
+    return tahun + np.clip(bulan, 0, 12) / 12
+
+
+def _irr(p, k, tarif, wp, biaya, tabel):
+    """IRR tahunan lewat Newton pada faktor diskonto bulanan v (semua skenario sekaligus).
+
+    f(v) = S(v) * A(x) - wp * B(x) - biaya dengan x = v^12, A(x) = sum a_y x^y
+    dan B(x) = sum inverter_y x^(y+1); polinom dievaluasi dengan Horner per tahun
+    dan skenario yang sudah konvergen dikeluarkan dari iterasi.
+    """
+    n_tahun = len(tabel.tarif)
+    a = np.stack([_arus_tahun(y, p, k, tarif, wp, tabel) for y in range(n_tahun)])    # (tahun, skenario)
+    c = biaya.copy()
+    tahun_inverter = np.flatnonzero(tabel.inverter)
+
+    # Tebakan awal: IRR anuitas tetap dengan arus tahunan rata-rata (beberapa iterasi titik tetap)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        rasio = 12 * a.mean(axis=0) / c
+        r0 = rasio.copy()
+        for _ in range(6):
+            r0 = rasio * (1 - (1 + np.maximum(r0, -0.9)) ** -n_tahun)
+        r0 = np.clip(np.nan_to_num(r0, nan=0.1), -0.5, 2.0)
+    v = (1 + r0) ** (-1 / 12)
+    hasil = v.copy()
+    idx = np.arange(len(c))
+    for _ in range(ITERASI_IRR):
+        # S(v) = v * (1 + v + ... + v^11) dan turunannya, juga dengan Horner (operasi in-place)
+        q, dq = np.ones_like(v), np.zeros_like(v)
+        for _ in range(11):
+            dq *= v
+            dq += q
+            q *= v
+            q += 1
+        s, ds = v * q, q + v * dq
+        x = v ** 12
+        nilai_a, turunan_a = np.zeros_like(v), np.zeros_like(v)
+        for y in range(n_tahun - 1, -1, -1):
+            turunan_a *= x
+            turunan_a += nilai_a
+            nilai_a *= x
+            nilai_a += a[y]
+        nilai_b, turunan_b = np.zeros_like(v), np.zeros_like(v)
+        for y in tahun_inverter:
+            xy = x ** (y + 1)
+            nilai_b += tabel.inverter[y] * xy
+            turunan_b += tabel.inverter[y] * (y + 1) * xy / x
+        dx = 12 * x / v
+        f = s * nilai_a - wp[idx] * nilai_b - c
+        df = ds * nilai_a + (s * turunan_a - wp[idx] * turunan_b) * dx
+        with np.errstate(divide='ignore', invalid='ignore'):
+            v_baru = np.clip(v - f / df, 1e-3, 10.0)
+        v_baru = np.where(np.isfinite(v_baru), v_baru, v)
+        hasil[idx] = v_baru
+        # Berhenti jika NPV sudah ~0 atau langkah Newton sudah sangat kecil
+        lanjut = (np.abs(f) > TOLERANSI_IRR * c) & (np.abs(v_baru - v) > TOLERANSI_IRR * v)
+        if not lanjut.any():
+            break
+        idx, v, a, c = idx[lanjut], v_baru[lanjut], a[:, lanjut], c[lanjut]
+
+    f = _npv(p, k, tarif, wp, tabel, hasil) - biaya
+    irr = np.where(np.abs(f) <= 1e-6 * np.maximum(biaya, 1), hasil ** -12 - 1, np.nan)
+
+    # Sisa yang tidak konvergen (biasanya IRR sangat negatif): bagi dua pada subset kecil
+    gagal = np.flatnonzero(np.isnan(irr))
+    if len(gagal):
+        irr[gagal] = _irr_bagi_dua(p[gagal], k[gagal], tarif[gagal], wp[gagal], biaya[gagal], tabel)
+    return irr
+
+
+def _irr_bagi_dua(p, k, tarif, wp, biaya, tabel, bawah=-0.99, atas=10.0, iterasi=100):
+    """IRR dengan metode bagi dua; NaN jika NPV tidak berganti tanda di [bawah, atas]."""
+    npv_r = lambda r: _npv(p, k, tarif, wp, tabel, (1 + r) ** (-1 / 12)) - biaya
+    lo, hi = np.full(biaya.shape, bawah), np.full(biaya.shape, atas)
+    f_lo = npv_r(lo)
+    ada_akar = np.sign(f_lo) != np.sign(npv_r(hi))
+    for _ in range(iterasi):
+        tengah = (lo + hi) / 2
+        f_tengah = npv_r(tengah)
+        kiri = np.sign(f_tengah) == np.sign(f_lo)
+        lo, f_lo = np.where(kiri, tengah, lo), np.where(kiri, f_tengah, f_lo)
+        hi = np.where(kiri, hi, tengah)
+    return np.where(ada_akar, (lo + hi) / 2, np.nan)
+
+
+def _npv(p, k, tarif, wp, tabel, v):
+    """Nilai kini seluruh arus (tanpa biaya instalasi) dengan faktor diskonto bulanan v."""
+    s, x = _faktor_tahun(v)
+    total = np.zeros(np.broadcast_shapes(np.shape(p), np.shape(v)))
+    d = 1.0
+    for y in range(len(tabel.tarif)):
+        total += _arus_tahun(y, p, k, tarif, wp, tabel) * (d * s)
+        if tabel.inverter[y]:
+            total -= wp * tabel.inverter[y] * (d * x)
+        d = d * x
+    return total
+
+
+def analisis_keuangan(tagihan_bulanan, produksi_pv_bulanan, kapasitas_pv_wp, tarif=TARIF_PLN,
+                      param=ParameterKeuangan(), hitung_irr=True):
+    """NPV, IRR, LCOE dan payback (biasa & terdiskonto); semua input boleh array."""
+    tagihan_bulanan, produksi_pv_bulanan, kapasitas_pv_wp, tarif = np.broadcast_arrays(
+        *(np.asarray(a, dtype=np.float64) for a in (tagihan_bulanan, produksi_pv_bulanan, kapasitas_pv_wp, tarif))
+    )
+    shape = tagihan_bulanan.shape
+    tabel = TabelTahunan.dari_param(param)
+
+    # Vektor datar per skenario
+    p = produksi_pv_bulanan.ravel()
+    k = (tagihan_bulanan / tarif).ravel()
+    t = tarif.ravel()
+    wp = kapasitas_pv_wp.ravel()
+    biaya = wp * param.biaya_per_wp
+
+    v = (1 + param.diskonto) ** (-1 / 12)
+    s, x = _faktor_tahun(v)
+    npv = _npv(p, k, t, wp, tabel, v) - biaya
+
+    # LCOE: biaya kini (instalasi + O&M + inverter) / energi kini; faktor per Wp & per kWh sama untuk semua
+    d = x ** np.arange(param.tahun)
+    biaya_kini_per_wp = param.biaya_per_wp + (tabel.om * d * s + tabel.inverter * d * x).sum()
+    energi_kini_per_kwh = (tabel.produksi * d * s).sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lcoe = wp * biaya_kini_per_wp / (p * energi_kini_per_kwh)
+
+    ke_bentuk = lambda a: a.reshape(shape)
+    return HasilKeuangan(
+        tagihan_bulanan=tagihan_bulanan,
+        produksi_pv_bulanan=produksi_pv_bulanan,
+        kapasitas_pv_wp=kapasitas_pv_wp,
+        tarif=tarif,
+        biaya_instalasi=ke_bentuk(biaya),
+        npv=ke_bentuk(npv),
+        irr=ke_bentuk(_irr(p, k, t, wp, biaya, tabel)) if hitung_irr else np.full(shape, np.nan),
+        lcoe=ke_bentuk(lcoe),
+        payback_tahun=ke_bentuk(_payback(p, k, t, wp, biaya, tabel, 1.0)),
+        payback_diskonto_tahun=ke_bentuk(_payback(p, k, t, wp, biaya, tabel, v)),
+        param=param,
+    )
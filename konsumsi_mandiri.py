@@ -0,0 +1,141 @@
+"""Neraca energi per jam: beban rumah tangga vs produksi PV.
+
+Setiap jam, energi PV dipakai sendiri sampai sebesar beban; sisanya
+diekspor ke jaringan dan kekurangannya diimpor dari PLN. Tagihan dihitung
+per bulan menurut aturan kredit ekspor yang bisa dikonfigurasi. Semua
+operasi berbentuk (rumah tangga, jam) dan diproses per blok rumah tangga,
+sehingga ribuan rumah tangga x 8.760 jam selesai dalam hitungan detik.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from engine import TARIF_PLN, HARI_PER_BULAN
+from simulasi_pv import agregasi_bulanan
+
+# Bentuk beban harian rumah tangga (jam 0..23), puncak malam hari
+PROFIL_BEBAN_RUMAH = np.array([
+    0.030, 0.028, 0.027, 0.027, 0.029, 0.035, 0.040, 0.038,
+    0.034, 0.032, 0.033, 0.036, 0.038, 0.037, 0.036, 0.037,
+    0.041, 0.050, 0.064, 0.068, 0.066, 0.060, 0.050, 0.040,
+])
+PROFIL_BEBAN_RUMAH = PROFIL_BEBAN_RUMAH / PROFIL_BEBAN_RUMAH.sum()
+
+UKURAN_BLOK = 512
+
+
+@dataclass(frozen=True)
+class AturanEkspor:
+    """Cara energi ekspor dihargai di tagihan bulanan."""
+    nama: str
+    faktor_kredit: float        # bagian tarif yang dikreditkan per kWh ekspor
+    kredit_terbawa: bool        # sisa kredit bulan ini boleh dipakai bulan berikutnya
+
+
+ATURAN_EKSPOR = {
+    'tanpa_ekspor': AturanEkspor('Tanpa kredit ekspor', 0.0, False),
+    'net_metering_65': AturanEkspor('Net metering 65%', 0.65, True),
+    'net_metering_100': AturanEkspor('Net metering 100%', 1.0, True),
+}
+
+
+@dataclass(frozen=True)
+class HasilKonsumsiMandiri:
+    """Ringkasan per rumah tangga; kolom bulanan berbentuk (..., 12)."""
+    beban_bulanan: np.ndarray
+    pv_bulanan: np.ndarray
+    mandiri_bulanan: np.ndarray
+    ekspor_bulanan: np.ndarray
+    impor_bulanan: np.ndarray
+    tagihan_tanpa_pv: np.ndarray
+    tagihan_dengan_pv: np.ndarray
+
+    @property
+    def penghematan_bulanan(self):
+        """Rata-rata penghematan per bulan (Rp) selama periode data."""
+        return (self.tagihan_tanpa_pv - self.tagihan_dengan_pv).mean(axis=-1)
+
+    @property
+    def tagihan_baru(self):
+        """Rata-rata tagihan per bulan dengan PV (Rp)."""
+        return self.tagihan_dengan_pv.mean(axis=-1)
+
+    @property
+    def skor_kemandirian(self):
+        """Persentase beban yang dipenuhi langsung oleh PV."""
+        return 100 * self.mandiri_bulanan.sum(axis=-1) / self.beban_bulanan.sum(axis=-1)
+
+    @property
+    def rasio_konsumsi_mandiri(self):
+        """Persentase produksi PV yang dipakai sendiri (bukan diekspor)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.nan_to_num(100 * self.mandiri_bulanan.sum(axis=-1) / self.pv_bulanan.sum(axis=-1))
+
+
+def profil_beban(waktu, konsumsi_bulanan_kwh, profil_harian=PROFIL_BEBAN_RUMAH):
+    """Beban per jam (..., jam) dari konsumsi bulanan, memakai bulan 30 hari seperti `engine`."""
+    jam = waktu.astype(np.int64) % 24
+    harian = np.asarray(konsumsi_bulanan_kwh, dtype=np.float64) / HARI_PER_BULAN
+    return harian[..., None] * profil_harian[jam]
+
+
+def faktor_bulan_30(waktu):
+    """Pengali rata-rata bulanan neraca (bulan kalender) ke bulan 30 hari seperti tagihan input."""
+    return HARI_PER_BULAN / (len(waktu) / 24 / 12)
+
+
+def hitung_tagihan(impor_bulanan, ekspor_bulanan, aturan, tarif=TARIF_PLN):
+    """Tagihan per bulan (..., 12) setelah kredit ekspor."""
+    kredit = ekspor_bulanan * tarif * aturan.faktor_kredit
+    biaya = impor_bulanan * tarif
+    if not aturan.kredit_terbawa:
+        return np.maximum(biaya - kredit, 0.0)
+
+    # Sisa kredit berurutan antar bulan: loop 12 langkah, vektor untuk semua rumah tangga
+    tagihan = np.empty_like(biaya)
+    sisa = np.zeros(biaya.shape[:-1])
+    for b in range(biaya.shape[-1]):
+        bersih = biaya[..., b] - kredit[..., b] - sisa
+        tagihan[..., b] = np.maximum(bersih, 0.0)
+        sisa = np.maximum(-bersih, 0.0)
+    return tagihan
+
+
+def neraca_per_jam(beban, pv):
+    """Energi dipakai sendiri, diekspor dan diimpor per jam (bentuk sama dengan input)."""
+    mandiri = np.minimum(beban, pv)
+    return mandiri, pv - mandiri, beban - mandiri
+
+
+def simulasi_konsumsi_mandiri(waktu, konsumsi_bulanan_kwh, pv_per_jam, aturan=ATURAN_EKSPOR['tanpa_ekspor'],
+                              tarif=TARIF_PLN, profil_harian=PROFIL_BEBAN_RUMAH, ukuran_blok=UKURAN_BLOK):
+    """Simulasikan neraca per jam untuk satu atau banyak rumah tangga.
+
+    `konsumsi_bulanan_kwh` berbentuk (n,) atau skalar; `pv_per_jam` berbentuk
+    (jam,) (sama untuk semua) atau (n, jam).
+    """
+    konsumsi = np.atleast_1d(np.asarray(konsumsi_bulanan_kwh, dtype=np.float64))
+    pv_per_jam = np.asarray(pv_per_jam, dtype=np.float64)
+    n = max(len(konsumsi), pv_per_jam.shape[0] if pv_per_jam.ndim > 1 else 1)
+    konsumsi = np.broadcast_to(konsumsi, (n,))
+    pv = np.broadcast_to(pv_per_jam, (n, pv_per_jam.shape[-1]))
+
+    kolom = {k: np.empty((n, 12)) for k in ('beban', 'pv', 'mandiri', 'ekspor', 'impor')}
+    for mulai in range(0, n, ukuran_blok):
+        blok = slice(mulai, mulai + ukuran_blok)
+        beban = profil_beban(waktu, konsumsi[blok], profil_harian)
+        mandiri, ekspor, impor = neraca_per_jam(beban, pv[blok])
+        for nama, nilai in (('beban', beban), ('pv', pv[blok]), ('mandiri', mandiri),
+                            ('ekspor', ekspor), ('impor', impor)):
+            kolom[nama][blok] = agregasi_bulanan(waktu, nilai)
+
+    return HasilKonsumsiMandiri(
+        beban_bulanan=kolom['beban'],
+        pv_bulanan=kolom['pv'],
+        mandiri_bulanan=kolom['mandiri'],
+        ekspor_bulanan=kolom['ekspor'],
+        impor_bulanan=kolom['impor'],
+        tagihan_tanpa_pv=kolom['beban'] * tarif,
+        tagihan_dengan_pv=hitung_tagihan(kolom['impor'], kolom['ekspor'], aturan, tarif),
+    )
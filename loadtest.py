@@ -0,0 +1,489 @@
+"""Uji beban project.py: banyak sesi websocket simulasi terhadap server Streamlit lokal.
+
+Contoh:
+    python loadtest.py                          # 20 sesi x 10 interaksi, server lokal otomatis
+    python loadtest.py --sesi 200 --jeda 2      # 200 pengguna, rata-rata 2 detik antar klik
+    python loadtest.py --url ws://127.0.0.1:8501 --sesi 50
+    python loadtest.py --gerbang                # exit code 1 jika melewati ANGGARAN memori
+    python loadtest.py --mulai-dingin --app code.py --gerbang   # waktu render pertama vs TARGET
+
+Setiap sesi berbicara dengan protokol yang sama dengan browser: BackMsg
+`rerun_script` berisi semua state widget dikirim lewat /_stcore/stream, lalu
+ForwardMsg dibaca sampai `script_finished`. Waktu di antaranya adalah latensi
+satu rerun (CSS, skrip penuh, JSON plotly). Hash pesan besar yang sudah
+diterima ikut dikirim balik seperti cache pesan di browser. Interaksi dipilih
+acak dari widget yang biasa disentuh pengguna (`WIDGET_INTERAKSI`).
+
+Urutan pengukuran (server lokal):
+    1. server kosong            RSS proses setelah start
+    2. pemanasan                satu sesi membuka semua tab -> cache bersama terisi
+    3. sesi terhubung           semua sesi menjalankan rerun pertama lalu diam;
+                                (RSS - RSS hangat) / sesi = memori per sesi
+    4. interaksi                semua sesi mengubah widget secara acak;
+                                rerun/detik, persentil latensi, RSS puncak
+
+Anggaran memori (`ANGGARAN`) dan cara menghitungnya dijelaskan di
+Readme.txt BAGIAN 6; `--anggaran` hanya menghitung ukuran session_state dan
+entri cache secara in-process tanpa menjalankan server.
+
+`--mulai-dingin` mengukur waktu start container baru: proses server dibuat
+dengan cache kosong, lalu satu sesi menunggu elemen pertama dan
+`script_finished`. Targetnya ada di `TARGET_MULAI_DINGIN`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import pickle
+import random
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+AKAR = Path(__file__).resolve().parent
+WIDGET_INTERAKSI = ('provinsi_key', 'tagihan_bulanan', 'pv_module_watt', 'pv_module_count', 'tab_grafik')
+BATAS_WAKTU_RERUN = 120
+SEED = 2024
+
+# Anggaran memori (MB) untuk menentukan ukuran instance; lihat Readme.txt BAGIAN 6.
+# Terukur di Python 3.11 / Streamlit 1.65: 0,19 / 0,001 / 0,40 / 1,53 MB; batas = kira-kira 2x.
+ANGGARAN = {
+    'rss_per_sesi_mb': 0.5,             # session_state + state widget + antrean pesan per sesi
+    'session_state_mb': 0.05,           # isi st.session_state satu sesi (pickle)
+    'entri_skenario_mb': 0.8,           # satu TampilanSkenario lengkap di CacheLRU (maks. 256 entri)
+    'entri_monte_carlo_mb': 3.0,        # satu hasil load_monte_carlo 100.000 sampel (maks. 64 entri)
+}
+
+# Target waktu render pertama (detik sejak proses server dibuat, cache kosong).
+# Terukur di 1 core: project.py 2,2 dtk (elemen pertama 1,4), code.py 1,6 dtk.
+TARGET_MULAI_DINGIN = {'project.py': 3.0, 'code.py': 2.5}
+
+
+# --- SERVER LOKAL ---
+
+def _port_bebas():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def rss_mb(pid):
+    """Resident set size proses dari /proc (Linux); None jika tidak tersedia."""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            baris = next(b for b in f if b.startswith('VmRSS:'))
+    except (OSError, StopIteration):
+        return None
+    return int(baris.split()[1]) / 1024
+
+
+class ServerLokal:
+    """`streamlit run` di port bebas sebagai subprocess; dipakai dengan `with`."""
+
+    def __init__(self, app='project.py', port=None, env=None):
+        self.app = app
+        self.port = port or _port_bebas()
+        self.env = env
+        self.proses = None
+        self.waktu_siap = None      # detik dari start proses sampai /_stcore/health menjawab
+
+    @property
+    def url(self):
+        return f'ws://127.0.0.1:{self.port}'
+
+    def rss_mb(self):
+        return rss_mb(self.proses.pid)
+
+    def __enter__(self):
+        self.waktu_mulai = time.perf_counter()
+        self.proses = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', self.app, '--server.headless', 'true',
+             '--server.port', str(self.port), '--browser.gatherUsageStats', 'false',
+             '--server.fileWatcherType', 'none'],
+            cwd=AKAR, env=None if self.env is None else {**os.environ, **self.env},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        batas = time.monotonic() + 60
+        while time.monotonic() < batas:
+            if self.proses.poll() is not None:
+                raise RuntimeError(f'Server Streamlit berhenti (exit {self.proses.returncode})')
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{self.port}/_stcore/health', timeout=1):
+                    self.waktu_siap = time.perf_counter() - self.waktu_mulai
+                    return self
+            except OSError:
+                time.sleep(0.2)
+        self.__exit__()
+        raise RuntimeError('Server Streamlit tidak siap dalam 60 detik')
+
+    def __exit__(self, *_):
+        self.proses.terminate()
+        try:
+            self.proses.wait(10)
+        except subprocess.TimeoutExpired:
+            self.proses.kill()
+
+
+# --- SESI SIMULASI ---
+
+@dataclass
+class StatistikSesi:
+    latensi: list = field(default_factory=list)     # detik per rerun
+    byte: int = 0                                   # total ForwardMsg diterima
+    galat: int = 0                                  # exception di skrip / koneksi putus
+
+
+class SesiSimulasi:
+    """Satu 'browser': simpan state widget dan kirim rerun seperti frontend Streamlit."""
+
+    def __init__(self, url, rng):
+        self.url = url.rstrip('/') + '/_stcore/stream'
+        self.rng = rng
+        self.ws = None
+        self.widget = {}        # key -> proto elemen/blok widget
+        self.state = {}         # id widget -> WidgetState terakhir
+        self.hash_cache = set()
+        self.label_tab = []
+        self.elemen_pertama = None  # detik sampai delta pertama pada rerun terakhir
+        self.statistik = StatistikSesi()
+
+    async def hubungkan(self):
+        from websockets.asyncio.client import connect
+
+        self.ws = await connect(self.url, subprotocols=['streamlit'], max_size=None, open_timeout=30)
+
+    async def tutup(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def _catat_widget(self, proto, jenis):
+        if proto.id:
+            self.widget[proto.id.rsplit('-', 1)[-1]] = (jenis, proto)
+
+    def _baca(self, pesan):
+        jenis = pesan.WhichOneof('type')
+        if pesan.metadata.cacheable:
+            self.hash_cache.add(pesan.hash)
+        if jenis != 'delta':
+            return jenis
+        delta = pesan.delta
+        if delta.WhichOneof('type') == 'new_element':
+            elemen = delta.new_element
+            tipe = elemen.WhichOneof('type')
+            if tipe == 'exception':
+                self.statistik.galat += 1
+            elif tipe in ('selectbox', 'number_input'):
+                self._catat_widget(getattr(elemen, tipe), tipe)
+        elif delta.WhichOneof('type') == 'add_block':
+            blok = delta.add_block
+            if blok.WhichOneof('type') == 'tab_container':
+                self._catat_widget(blok.tab_container, 'tab')
+                self.label_tab = []
+            elif blok.WhichOneof('type') == 'tab':
+                self.label_tab.append(blok.tab.label)
+        return jenis
+
+    async def rerun(self):
+        """Kirim state widget sekarang dan tunggu `script_finished`; kembalikan latensi (detik)."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.widget_states.widgets.extend(self.state.values())
+        msg.rerun_script.cached_message_hashes.extend(self.hash_cache)
+        mulai = time.perf_counter()
+        self.elemen_pertama = None
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            isi = await asyncio.wait_for(self.ws.recv(), BATAS_WAKTU_RERUN)
+            self.statistik.byte += len(isi)
+            pesan = ForwardMsg()
+            pesan.ParseFromString(isi)
+            jenis = self._baca(pesan)
+            if jenis == 'delta' and self.elemen_pertama is None:
+                self.elemen_pertama = time.perf_counter() - mulai
+            elif jenis == 'script_finished':
+                break
+        latensi = time.perf_counter() - mulai
+        self.statistik.latensi.append(latensi)
+        return latensi
+
+    def _set(self, kunci, **nilai):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        proto = self.widget[kunci][1]
+        self.state[proto.id] = WidgetState(id=proto.id, **nilai)
+
+    def ubah_acak(self):
+        """Ubah satu widget dari `WIDGET_INTERAKSI` ke nilai acak yang valid."""
+        from streamlit.proto.NumberInput_pb2 import NumberInput
+
+        kunci = self.rng.choice([k for k in WIDGET_INTERAKSI if k in self.widget])
+        jenis, proto = self.widget[kunci]
+        if jenis == 'selectbox':
+            self._set(kunci, string_value=self.rng.choice(list(proto.options)))
+        elif jenis == 'tab':
+            self._set(kunci, string_value=self.rng.choice(self.label_tab))
+        elif jenis == 'number_input':
+            bawah = proto.min if proto.has_min else 0
+            atas = min(proto.max if proto.has_max else bawah + 100, bawah + 100 * (proto.step or 1))
+            nilai = bawah + self.rng.randint(0, int((atas - bawah) / (proto.step or 1))) * (proto.step or 1)
+            if proto.data_type == NumberInput.INT:
+                self._set(kunci, int_value=int(nilai))
+            else:
+                self._set(kunci, double_value=float(nilai))
+        return kunci
+
+
+async def _pemanasan(url):
+    """Satu sesi membuka setiap tab agar cache bersama (referensi, skenario default) terisi."""
+    sesi = SesiSimulasi(url, random.Random(SEED))
+    await sesi.hubungkan()
+    try:
+        await sesi.rerun()
+        for label in list(sesi.label_tab):
+            sesi._set('tab_grafik', string_value=label)
+            await sesi.rerun()
+    finally:
+        await sesi.tutup()
+
+
+async def _pantau_rss(server, puncak, berhenti):
+    while not berhenti.is_set():
+        puncak.append(server.rss_mb() or 0.0)
+        await asyncio.sleep(0.25)
+
+
+async def uji_beban(url, jumlah_sesi, interaksi, jeda=0.5, ramp=2.0, seed=SEED, server=None):
+    """Jalankan skenario uji beban; kembalikan dict ringkasan (lihat `_cetak`)."""
+    ringkasan = {'sesi': jumlah_sesi, 'interaksi': interaksi, 'jeda_detik': jeda}
+    if server is not None:
+        ringkasan['rss_kosong_mb'] = server.rss_mb()
+    await _pemanasan(url)
+    if server is not None:
+        await asyncio.sleep(0.5)
+        ringkasan['rss_hangat_mb'] = server.rss_mb()
+
+    rng = random.Random(seed)
+    semua = [SesiSimulasi(url, random.Random(rng.random())) for _ in range(jumlah_sesi)]
+
+    async def buka(i, sesi):
+        await asyncio.sleep(ramp * i / max(jumlah_sesi, 1))
+        await sesi.hubungkan()
+        await sesi.rerun()
+
+    async def main(sesi):
+        for _ in range(interaksi):
+            await asyncio.sleep(sesi.rng.uniform(0.5, 1.5) * jeda)
+            sesi.ubah_acak()
+            await sesi.rerun()
+
+    async def aman(coro, sesi):
+        try:
+            await coro
+        except Exception:
+            sesi.statistik.galat += 1
+
+    try:
+        await asyncio.gather(*(aman(buka(i, s), s) for i, s in enumerate(semua)))
+        if server is not None:
+            await asyncio.sleep(0.5)
+            ringkasan['rss_sesi_mb'] = server.rss_mb()
+            ringkasan['rss_per_sesi_mb'] = (ringkasan['rss_sesi_mb'] - ringkasan['rss_hangat_mb']) / jumlah_sesi
+        terhubung = [s for s in semua if s.ws is not None and s.statistik.latensi]
+
+        puncak, berhenti = [], asyncio.Event()
+        pemantau = asyncio.create_task(_pantau_rss(server, puncak, berhenti)) if server is not None else None
+        sebelum = sum(len(s.statistik.latensi) for s in terhubung)
+        mulai = time.perf_counter()
+        await asyncio.gather(*(aman(main(s), s) for s in terhubung))
+        durasi = time.perf_counter() - mulai
+        berhenti.set()
+        if pemantau is not None:
+            await pemantau
+            ringkasan['rss_puncak_mb'] = max(puncak, default=None)
+    finally:
+        await asyncio.gather(*(s.tutup() for s in semua), return_exceptions=True)
+
+    latensi = np.array([t for s in semua for t in s.statistik.latensi[1:]] or [np.nan]) * 1000
+    jumlah_rerun = sum(len(s.statistik.latensi) for s in terhubung) - sebelum
+    ringkasan.update({
+        'sesi_terhubung': len(terhubung),
+        'rerun': jumlah_rerun,
+        'durasi_detik': durasi,
+        'rerun_per_detik': jumlah_rerun / durasi if durasi > 0 else float('nan'),
+        'latensi_ms': {f'p{p}': float(np.nanpercentile(latensi, p)) for p in (50, 90, 99)}
+                      | {'maks': float(np.nanmax(latensi))},
+        'latensi_awal_ms': float(np.median([s.statistik.latensi[0] for s in terhubung] or [np.nan]) * 1000),
+        'kb_per_rerun': sum(s.statistik.byte for s in semua) / 1024 / max(sum(len(s.statistik.latensi) for s in semua), 1),
+        'galat': sum(s.statistik.galat for s in semua),
+    })
+    return ringkasan
+
+
+# --- MULAI DINGIN ---
+
+async def _render_pertama(url):
+    sesi = SesiSimulasi(url, random.Random(SEED))
+    await sesi.hubungkan()
+    try:
+        total = await sesi.rerun()
+        return sesi.elemen_pertama, total, sesi.statistik.galat
+    finally:
+        await sesi.tutup()
+
+
+def ukur_mulai_dingin(app='project.py', ulang=3):
+    """Median waktu mulai dingin (detik sejak proses server dibuat), seperti container baru.
+
+    Setiap putaran memakai SOLAR_CACHE_DIR kosong, jadi hanya aset yang ikut
+    di repo (mis. dataset referensi bawaan) yang sudah siap.
+    """
+    import tempfile
+
+    putaran = []
+    for _ in range(ulang):
+        with tempfile.TemporaryDirectory() as cache, ServerLokal(app, env={'SOLAR_CACHE_DIR': cache}) as server:
+            pertama, total, galat = asyncio.run(_render_pertama(server.url))
+            if galat:
+                raise RuntimeError(f'{app} menghasilkan exception saat render pertama')
+            putaran.append((server.waktu_siap, server.waktu_siap + pertama, server.waktu_siap + total))
+    median = np.median(np.array(putaran), axis=0)
+    return dict(zip(('server_siap_detik', 'elemen_pertama_detik', 'render_pertama_detik'), map(float, median)))
+
+
+# --- ANGGARAN MEMORI (IN-PROCESS) ---
+
+def _ukuran_teralokasi(fungsi):
+    """(hasil, MB) memori Python yang masih dipegang setelah `fungsi()` (tracemalloc)."""
+    tracemalloc.start()
+    try:
+        awal = tracemalloc.get_traced_memory()[0]
+        hasil = fungsi()
+        return hasil, (tracemalloc.get_traced_memory()[0] - awal) / 1024 ** 2
+    finally:
+        tracemalloc.stop()
+
+
+def _ukuran_pickle_mb(isi):
+    total = 0
+    for nilai in isi.values():
+        try:
+            total += len(pickle.dumps(nilai))
+        except Exception:
+            total += sys.getsizeof(nilai)
+    return total / 1024 ** 2
+
+
+def ukur_anggaran():
+    """Ukuran session_state satu sesi dan satu entri setiap cache utama (MB)."""
+    from streamlit.testing.v1 import AppTest
+    from engine import InputSkenario, hitung_skenario
+    from grafik import TampilanSkenario
+    from monte_carlo import ParameterMonteCarlo, simulasi_monte_carlo
+
+    os.chdir(AKAR)
+    at = AppTest.from_file(str(AKAR / 'project.py'), default_timeout=BATAS_WAKTU_RERUN).run()
+    for tab in [t.label for t in at.tabs]:
+        at.session_state['tab_grafik'] = tab
+        at.run()
+    ukuran = {'session_state_mb': _ukuran_pickle_mb(at.session_state.to_dict())}
+
+    def entri_skenario(tagihan):
+        inp = InputSkenario('Jawa Barat', 4.0, 0.87, tagihan, 550, 6)
+        tampilan = TampilanSkenario(inp, hitung_skenario(inp))
+        for nama in ('fig_bar', 'fig_proj', 'fig_monthly', 'fig_donut', 'data_sistem', 'data_finansial'):
+            getattr(tampilan, nama)
+        return tampilan
+
+    entri_skenario(400_000)     # pemanasan: impor & template plotly tidak ikut terhitung
+    ukuran['entri_skenario_mb'] = _ukuran_teralokasi(lambda: entri_skenario(500_000))[1]
+    ukuran['entri_monte_carlo_mb'] = _ukuran_teralokasi(
+        lambda: simulasi_monte_carlo(500_000, 350.0, 2200, ParameterMonteCarlo()))[1]
+    return ukuran
+
+
+def cek_anggaran(ukuran, anggaran=ANGGARAN):
+    """Daftar (nama, nilai, batas) yang melewati anggaran."""
+    return [(k, ukuran[k], batas) for k, batas in anggaran.items()
+            if ukuran.get(k) is not None and ukuran[k] > batas]
+
+
+def _cetak(ringkasan):
+    baris = [
+        ('sesi terhubung', f"{ringkasan['sesi_terhubung']}/{ringkasan['sesi']}"),
+        ('rerun/detik', f"{ringkasan['rerun_per_detik']:.2f} ({ringkasan['rerun']} rerun, {ringkasan['durasi_detik']:.1f} dtk)"),
+        ('latensi awal', f"{ringkasan['latensi_awal_ms']:.0f} ms (median rerun pertama)"),
+        ('latensi interaksi', '  '.join(f'{k} {v:.0f} ms' for k, v in ringkasan['latensi_ms'].items())),
+        ('data per rerun', f"{ringkasan['kb_per_rerun']:.1f} kB"),
+        ('galat', str(ringkasan['galat'])),
+    ]
+    for kunci, label in (('rss_kosong_mb', 'RSS server kosong'), ('rss_hangat_mb', 'RSS setelah pemanasan'),
+                         ('rss_sesi_mb', 'RSS semua sesi terhubung'), ('rss_puncak_mb', 'RSS puncak interaksi'),
+                         ('rss_per_sesi_mb', 'memori per sesi')):
+        if ringkasan.get(kunci) is not None:
+            baris.append((label, f'{ringkasan[kunci]:.2f} MB'))
+    for label, nilai in baris:
+        print(f'{label:<26} {nilai}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='server yang sudah berjalan (mis. ws://127.0.0.1:8501); '
+                                      'default: jalankan project.py lokal di port bebas')
+    parser.add_argument('--app', default='project.py', help='skrip untuk server lokal')
+    parser.add_argument('--sesi', type=int, default=20, help='jumlah sesi bersamaan')
+    parser.add_argument('--interaksi', type=int, default=10, help='perubahan widget per sesi')
+    parser.add_argument('--jeda', type=float, default=0.5, help='rata-rata jeda antar interaksi (detik)')
+    parser.add_argument('--ramp', type=float, default=2.0, help='lama membuka semua sesi (detik)')
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--json', type=Path, help='simpan ringkasan ke file JSON')
+    parser.add_argument('--anggaran', action='store_true', help='hanya ukur session_state & entri cache')
+    parser.add_argument('--mulai-dingin', action='store_true', help='hanya ukur waktu render pertama server baru')
+    parser.add_argument('--ulang', type=int, default=3, help='jumlah putaran --mulai-dingin (median)')
+    parser.add_argument('--gerbang', action='store_true', help='gagal (exit 1) jika melewati ANGGARAN')
+    args = parser.parse_args(argv)
+
+    lewat = []
+    if args.mulai_dingin:
+        ringkasan = ukur_mulai_dingin(args.app, args.ulang)
+        for k, v in ringkasan.items():
+            print(f'{k:<26} {v:6.2f} dtk')
+        target = TARGET_MULAI_DINGIN.get(Path(args.app).name)
+        if target is not None:
+            print(f'{"target render pertama":<26} {target:6.2f} dtk')
+            if ringkasan['render_pertama_detik'] > target:
+                lewat.append(('render_pertama_detik', ringkasan['render_pertama_detik'], target))
+    elif args.anggaran:
+        ringkasan = ukur_anggaran()
+        for k, v in ringkasan.items():
+            print(f'{k:<26} {v * 1024:9.1f} kB  (anggaran {ANGGARAN[k] * 1024:.0f} kB)')
+    elif args.url:
+        ringkasan = asyncio.run(uji_beban(args.url, args.sesi, args.interaksi, args.jeda, args.ramp, args.seed))
+        _cetak(ringkasan)
+    else:
+        with ServerLokal(args.app) as server:
+            ringkasan = asyncio.run(uji_beban(server.url, args.sesi, args.interaksi, args.jeda, args.ramp,
+                                              args.seed, server))
+        _cetak(ringkasan)
+
+    if args.json:
+        args.json.write_text(json.dumps(ringkasan, indent=1))
+    lewat += cek_anggaran(ringkasan)
+    if args.gerbang and lewat:
+        for nama, nilai, batas in lewat:
+            print(f'Melewati anggaran: {nama} = {nilai:.3f} (batas {batas})', file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
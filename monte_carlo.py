@@ -0,0 +1,114 @@
+"""Mode ketidakpastian: distribusi payback & NPV dengan simulasi Monte Carlo.
+
+Model dasarnya sama dengan `engine.hitung_skenario` (tagihan naik mengikuti
+inflasi tarif, penghematan dibatasi tagihan), tetapi empat asumsi tetapnya
+diganti sampel acak:
+
+    inflasi tarif       normal per sampel, dipotong ke rentang wajar
+    biaya per Wp        lognormal per sampel (rata-rata tetap = asumsi engine)
+    degradasi modul     uniform per sampel, majemuk per tahun
+    yield tahunan       bootstrap rasio yield tahunan historis NASA POWER
+                        (atau normal dengan koefisien variasi bawaan)
+
+Semua sampel dihitung sekaligus sebagai array (sampel x tahun), jadi 100 ribu
+sampel selesai dalam sepersekian detik. Generator `numpy.random.default_rng`
+dengan seed tetap membuat hasilnya bisa diulang.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from engine import TAHUN_ANALISIS, TARIF_PLN, BIAYA_AWAL_PV_PER_Wp, ASUMSI_INFLASI_LISTRIK
+from optimasi import TINGKAT_DISKONTO
+from payback import titik_impas
+
+PERSENTIL_KIPAS = (10, 25, 50, 75, 90)
+PERSENTIL_RINGKAS = (10, 50, 90)
+
+
+@dataclass(frozen=True)
+class ParameterMonteCarlo:
+    """Jumlah sampel, seed dan sebaran setiap asumsi."""
+    jumlah_sampel: int = 100_000
+    seed: int = 2024
+    inflasi_rata: float = ASUMSI_INFLASI_LISTRIK
+    inflasi_sd: float = 0.02
+    inflasi_batas: tuple = (-0.02, 0.15)
+    biaya_per_wp: float = BIAYA_AWAL_PV_PER_Wp
+    biaya_sd_relatif: float = 0.15
+    degradasi_min: float = 0.003       # per tahun
+    degradasi_maks: float = 0.008
+    variasi_yield: float = 0.04        # koefisien variasi yield tahunan jika tanpa data historis
+    diskonto: float = TINGKAT_DISKONTO
+
+
+@dataclass(frozen=True)
+class HasilMonteCarlo:
+    """Hasil per sampel dan ringkasan persentilnya."""
+    payback_tahun: np.ndarray       # (sampel,) pecahan, inf jika tidak impas dalam horizon
+    npv: np.ndarray                 # (sampel,)
+    kipas: np.ndarray               # (len(PERSENTIL_KIPAS), tahun) posisi kas kumulatif (hemat - biaya)
+    tahun: int
+    sumber_yield: str
+
+    @property
+    def peluang_impas(self):
+        """Bagian sampel yang balik modal dalam horizon."""
+        return float(np.isfinite(self.payback_tahun).mean())
+
+    def persentil_payback(self, q=PERSENTIL_RINGKAS):
+        # inverted_cdf: tanpa interpolasi, sehingga sampel tak-impas (inf) tetap inf
+        return np.percentile(self.payback_tahun, q, method='inverted_cdf')
+
+    def persentil_npv(self, q=PERSENTIL_RINGKAS):
+        return np.percentile(self.npv, q)
+
+
+def rasio_yield_tahunan(yield_tahunan):
+    """Rasio yield tiap tahun terhadap rata-ratanya (bahan bootstrap)."""
+    yield_tahunan = np.asarray(yield_tahunan, dtype=np.float64)
+    return yield_tahunan / yield_tahunan.mean()
+
+
+def _pangkat_berulang(faktor, n):
+    """Array (sampel, n) berisi faktor^1..faktor^n lewat cumprod (lebih murah dari `**`)."""
+    hasil = np.empty((len(faktor), n))
+    hasil[:] = faktor[:, None]
+    return np.cumprod(hasil, axis=1, out=hasil)
+
+
+def simulasi_monte_carlo(tagihan_bulanan, produksi_pv_bulanan, kapasitas_pv_wp,
+                         param=ParameterMonteCarlo(), rasio_yield=None, tahun=TAHUN_ANALISIS):
+    """Sampel payback/NPV satu skenario; `rasio_yield` dari `rasio_yield_tahunan` (opsional)."""
+    rng = np.random.default_rng(param.seed)
+    n = param.jumlah_sampel
+
+    inflasi = np.clip(rng.normal(param.inflasi_rata, param.inflasi_sd, n), *param.inflasi_batas)
+    s = param.biaya_sd_relatif
+    biaya = kapasitas_pv_wp * param.biaya_per_wp * rng.lognormal(-s * s / 2, s, n)
+    degradasi = rng.uniform(param.degradasi_min, param.degradasi_maks, n)
+    if rasio_yield is not None and len(rasio_yield) > 1:
+        pengali_yield = rng.choice(np.asarray(rasio_yield, dtype=np.float64), size=(n, tahun))
+        sumber_yield = f'historis ({len(rasio_yield)} tahun)'
+    else:
+        pengali_yield = rng.normal(1.0, param.variasi_yield, (n, tahun))
+        sumber_yield = f'normal (CV {param.variasi_yield:.0%})'
+
+    tahun_ke = np.arange(tahun)
+    produksi = pengali_yield * produksi_pv_bulanan
+    produksi[:, 1:] *= _pangkat_berulang(1 - degradasi, tahun - 1)
+    # Seperti engine: penghematan bulanan tidak melebihi tagihan, lalu ikut naik dengan tarif
+    hemat_tahunan = np.minimum(produksi * TARIF_PLN, tagihan_bulanan) * 12
+    hemat_tahunan *= _pangkat_berulang(1 + inflasi, tahun)
+
+    kumulatif = np.cumsum(hemat_tahunan, axis=1)
+    impas = titik_impas(kumulatif, np.broadcast_to(biaya[:, None], kumulatif.shape), biaya)
+    payback_tahun = np.where(np.isnan(impas.tahun), np.inf, impas.tahun)
+
+    npv = hemat_tahunan @ (1 + param.diskonto) ** -(tahun_ke + 1.0) - biaya
+    # Persentil per tahun dihitung pada baris kontigu (tahun x sampel), jauh lebih cepat dari axis=0
+    posisi = np.ascontiguousarray((kumulatif - biaya[:, None]).T)
+    kipas = np.percentile(posisi, PERSENTIL_KIPAS, axis=1)
+    return HasilMonteCarlo(payback_tahun=payback_tahun, npv=npv, kipas=kipas,
+                           tahun=tahun, sumber_yield=sumber_yield)
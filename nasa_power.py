@@ -0,0 +1,210 @@
+"""Pembaca cepat file CSV per jam NASA POWER.
+
+Blok `-BEGIN HEADER-` ... `-END HEADER-` dideteksi otomatis (tidak lagi
+`skiprows=11`), metadata lokasi dan parameter diambil dari header, dan
+timestamp dibangun secara aritmetika dari kolom YEAR/MO/DY/HR. Salinan
+kolomnya disimpan sebagai NPZ dengan kunci hash isi file, sehingga membuka
+ulang file yang sama hanya butuh beberapa milidetik.
+"""
+
+import hashlib
+import io
+import json
+import os
+import re
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+import numpy as np
+
+KOLOM_WAKTU = ['YEAR', 'MO', 'DY', 'HR']
+ZONA_WAKTU = 'Asia/Jakarta'
+DIR_CACHE = Path(os.environ.get('SOLAR_CACHE_DIR', Path(__file__).parent / '.cache')) / 'nasa_power'
+VERSI_CACHE = 1
+
+_RE_LOKASI = re.compile(r'Latitude\s+(-?[\d.]+)\s+Longitude\s+(-?[\d.]+)')
+_RE_ELEVASI = re.compile(r'=\s*(-?[\d.]+)\s*meters')
+_RE_HILANG = re.compile(r'availability range:\s*(-?[\d.]+)')
+_RE_TANGGAL = re.compile(r'(\d{2}/\d{2}/\d{4}) through (\d{2}/\d{2}/\d{4})')
+
+
+@dataclass(frozen=True)
+class MetadataNasaPower:
+    """Informasi yang dibaca dari blok header NASA POWER."""
+    judul: str
+    lintang: float
+    bujur: float
+    elevasi: float
+    nilai_hilang: float
+    tanggal_mulai: str
+    tanggal_akhir: str
+    parameter: dict         # kode parameter -> deskripsi
+    baris_header: int       # jumlah baris sebelum baris nama kolom
+
+
+@dataclass(frozen=True)
+class DataNasaPower:
+    """Data per jam dalam bentuk kolom NumPy (nilai hilang sudah NaN)."""
+    metadata: MetadataNasaPower
+    waktu: np.ndarray       # datetime64[h], waktu lokal (LST)
+    kolom: dict             # nama kolom -> np.ndarray
+
+    def __getitem__(self, nama):
+        return self.kolom[nama]
+
+    def __len__(self):
+        return len(self.waktu)
+
+    def ke_dataframe(self, tz=ZONA_WAKTU):
+        """DataFrame ber-index `Datetime` (tz-aware) seperti yang dipakai `code.py`."""
+        import pandas as pd
+
+        index = pd.DatetimeIndex(self.waktu.astype('datetime64[ns]'), name='Datetime')
+        if tz:
+            index = index.tz_localize(tz)
+        return pd.DataFrame(self.kolom, index=index)
+
+
+def baca_header(baris):
+    """Parse baris-baris teks awal file; kembalikan `MetadataNasaPower`."""
+    if not baris or not baris[0].startswith('-BEGIN HEADER-'):
+        # File tanpa header: baris pertama langsung nama kolom
+        return MetadataNasaPower('', np.nan, np.nan, np.nan, -999.0, '', '', {}, 0)
+
+    akhir = next((i for i, b in enumerate(baris) if b.startswith('-END HEADER-')), None)
+    if akhir is None:
+        raise ValueError("Header NASA POWER tidak lengkap: baris -END HEADER- tidak ditemukan")
+    isi = baris[1:akhir]
+    teks = '\n'.join(isi)
+
+    lokasi = _RE_LOKASI.search(teks)
+    elevasi = _RE_ELEVASI.search(teks)
+    hilang = _RE_HILANG.search(teks)
+    tanggal = _RE_TANGGAL.search(teks)
+
+    parameter = {}
+    if any(b.startswith('Parameter(s)') for b in isi):
+        mulai = next(i for i, b in enumerate(isi) if b.startswith('Parameter(s)')) + 1
+        for b in isi[mulai:]:
+            kode, _, deskripsi = b.strip().partition(' ')
+            if kode:
+                parameter[kode] = deskripsi.strip()
+
+    return MetadataNasaPower(
+        judul=isi[0].strip() if isi else '',
+        lintang=float(lokasi.group(1)) if lokasi else np.nan,
+        bujur=float(lokasi.group(2)) if lokasi else np.nan,
+        elevasi=float(elevasi.group(1)) if elevasi else np.nan,
+        nilai_hilang=float(hilang.group(1)) if hilang else -999.0,
+        tanggal_mulai=tanggal.group(1) if tanggal else '',
+        tanggal_akhir=tanggal.group(2) if tanggal else '',
+        parameter=parameter,
+        baris_header=akhir + 1,
+    )
+
+
+def bangun_waktu(tahun, bulan, hari, jam):
+    """Timestamp datetime64[h] dari kolom integer, tanpa parsing string."""
+    tahun = np.asarray(tahun, dtype=np.int64)
+    bulan = np.asarray(bulan, dtype=np.int64)
+    awal_bulan = ((tahun - 1970) * 12 + (bulan - 1)).astype('datetime64[M]')
+    tanggal = awal_bulan.astype('datetime64[D]') + np.asarray(hari, dtype=np.int64) - 1
+    return tanggal.astype('datetime64[h]') + np.asarray(jam, dtype=np.int64)
+
+
+def _isi_bytes(sumber):
+    """Ambil isi mentah dari path, bytes, atau objek file (mis. UploadedFile)."""
+    if isinstance(sumber, (bytes, bytearray)):
+        return bytes(sumber)
+    if hasattr(sumber, 'getvalue'):
+        return sumber.getvalue()
+    if hasattr(sumber, 'read'):
+        return sumber.read()
+    return Path(sumber).read_bytes()
+
+
+def _parse(isi):
+    import pandas as pd
+
+    # Header dibaca sampai baris -END HEADER- berapa pun panjangnya
+    kepala = isi[:8192]
+    if isi.startswith(b'-BEGIN HEADER-'):
+        akhir = isi.find(b'-END HEADER-')
+        kepala = isi if akhir < 0 else isi[:akhir + len(b'-END HEADER-')]
+    metadata = baca_header(kepala.decode('utf-8', errors='replace').splitlines())
+
+    try:
+        df = pd.read_csv(io.BytesIO(isi), skiprows=metadata.baris_header, engine='c')
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise ValueError(f"File tidak bisa dibaca sebagai CSV: {e}") from None
+    df.columns = [str(c).strip() for c in df.columns]
+    hilang = [k for k in KOLOM_WAKTU if k not in df.columns]
+    if hilang:
+        raise ValueError(f"Bukan file NASA POWER per jam: kolom {', '.join(hilang)} tidak ditemukan")
+
+    kolom = {}
+    for nama in df.columns:
+        nilai = df[nama].to_numpy()
+        if nama in KOLOM_WAKTU:
+            kolom[nama] = nilai.astype(np.int64)
+        else:
+            try:
+                nilai = nilai.astype(np.float64)
+            except (TypeError, ValueError):
+                raise ValueError(f"Kolom {nama} berisi nilai non-angka") from None
+            nilai[nilai == metadata.nilai_hilang] = np.nan
+            kolom[nama] = nilai
+
+    waktu = bangun_waktu(kolom['YEAR'], kolom['MO'], kolom['DY'], kolom['HR'])
+    return DataNasaPower(metadata, waktu, kolom)
+
+
+def _simpan_cache(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = json.dumps({'versi': VERSI_CACHE, 'metadata': asdict(data.metadata)})
+    sementara = path.with_suffix('.tmp.npz')
+    np.savez(sementara, __meta__=np.array(meta), __waktu__=data.waktu.astype(np.int64),
+             **{f'k_{nama}': nilai for nama, nilai in data.kolom.items()})
+    os.replace(sementara, path)
+
+
+def _muat_cache(path):
+    with np.load(path, allow_pickle=False) as npz:
+        meta = json.loads(str(npz['__meta__']))
+        if meta.get('versi') != VERSI_CACHE:
+            return None
+        waktu = npz['__waktu__'].astype('datetime64[h]')
+        kolom = {nama[2:]: npz[nama] for nama in npz.files if nama.startswith('k_')}
+    return DataNasaPower(MetadataNasaPower(**meta['metadata']), waktu, kolom)
+
+
+def hash_isi(isi):
+    """Kunci cache: hash BLAKE2b dari isi file."""
+    return hashlib.blake2b(isi, digest_size=16).hexdigest()
+
+
+def baca_nasa_power(sumber, cache_dir=DIR_CACHE):
+    """Baca file NASA POWER per jam; gunakan cache NPZ jika isi file sudah pernah dibaca.
+
+    `sumber` boleh berupa path, bytes, atau objek file. `cache_dir=None`
+    mematikan cache.
+    """
+    isi = _isi_bytes(sumber)
+    if cache_dir is None:
+        return _parse(isi)
+
+    path = Path(cache_dir) / f'{hash_isi(isi)}.npz'
+    if path.exists():
+        try:
+            data = _muat_cache(path)
+            if data is not None:
+                return data
+        except (OSError, ValueError, KeyError):
+            pass  # cache rusak: parse ulang dan timpa
+
+    data = _parse(isi)
+    try:
+        _simpan_cache(path, data)
+    except OSError:
+        pass  # direktori cache tidak bisa ditulis: tetap kembalikan data
+    return data
@@ -0,0 +1,124 @@
+"""Pencarian jumlah modul (dan Wp) terbaik dalam satu evaluasi batch.
+
+Semua kandidat Wp x 1..MAX_PV_MODULES dihitung sekaligus lewat
+`batch.evaluasi_array`, lalu dipilih yang memaksimalkan NPV atau
+meminimalkan masa balik modal, opsional dengan batas luas atap dan anggaran.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from batch import evaluasi_array
+from engine import (
+    WP_CHOICES, MIN_PV_MODULES, MAX_PV_MODULES, TAHUN_ANALISIS, ASUMSI_INFLASI_LISTRIK
+)
+from payback import payback_tertutup
+
+TUJUAN_OPTIMASI = ('npv', 'payback')
+TINGKAT_DISKONTO = 0.08
+
+# Perkiraan luas satu modul (m^2) per kelas Wp
+LUAS_MODUL_M2 = {300: 1.64, 350: 1.72, 400: 1.95, 450: 2.10, 500: 2.28, 550: 2.58}
+
+
+def npv_penghematan(tagihan_bulanan, tagihan_baru, biaya_instalasi, tahun=TAHUN_ANALISIS,
+                    inflasi=ASUMSI_INFLASI_LISTRIK, diskonto=TINGKAT_DISKONTO):
+    """NPV penghematan tahunan (dengan kenaikan tarif) dikurangi biaya instalasi."""
+    tahun_ke = np.arange(1, tahun + 1)
+    faktor = ((1 + inflasi) / (1 + diskonto)) ** tahun_ke
+    hemat = 12 * (np.asarray(tagihan_bulanan) - np.asarray(tagihan_baru))
+    return hemat * faktor.sum() - np.asarray(biaya_instalasi)
+
+
+@dataclass(frozen=True)
+class HasilOptimasi:
+    """Seluruh kandidat (bentuk Wp x modul) beserta pilihan terbaik."""
+    wp_modul: np.ndarray
+    jumlah_modul: np.ndarray
+    kapasitas_kwp: np.ndarray
+    biaya_instalasi: np.ndarray
+    penghematan_rp: np.ndarray
+    payback_tahun: np.ndarray       # bulat, sama dengan dashboard
+    payback_pecahan: np.ndarray     # kontinu, untuk membedakan kandidat berpayback sama
+    npv: np.ndarray
+    layak: np.ndarray               # memenuhi batas atap & anggaran
+    terbaik: tuple                  # indeks (i_wp, i_modul), None jika tidak ada yang layak
+    tujuan: str
+
+    @property
+    def wp_terbaik(self):
+        return None if self.terbaik is None else int(self.wp_modul[self.terbaik[0]])
+
+    @property
+    def modul_terbaik(self):
+        return None if self.terbaik is None else int(self.jumlah_modul[self.terbaik[1]])
+
+    def kurva(self):
+        """Tabel panjang untuk grafik trade-off (satu baris per kandidat)."""
+        import pandas as pd
+
+        wp, modul = np.meshgrid(self.wp_modul, self.jumlah_modul, indexing='ij')
+        return pd.DataFrame({
+            'Wp': wp.ravel(),
+            'Jumlah Modul': modul.ravel(),
+            'Kapasitas (kWp)': self.kapasitas_kwp.ravel(),
+            'Biaya Instalasi': self.biaya_instalasi.ravel(),
+            'Penghematan Bulanan': self.penghematan_rp.ravel(),
+            'Masa Balik Modal': self.payback_pecahan.ravel(),
+            'NPV': self.npv.ravel(),
+            'Layak': self.layak.ravel(),
+        })
+
+
+def optimasi_ukuran(radiasi_harian, faktor_emisi, tagihan_bulanan, wp_modul=WP_CHOICES,
+                    tujuan='npv', luas_atap_m2=None, anggaran_rp=None,
+                    diskonto=TINGKAT_DISKONTO, tahun_analisis=TAHUN_ANALISIS):
+    """Evaluasi semua kandidat Wp x jumlah modul dan pilih yang terbaik menurut `tujuan`."""
+    if tujuan not in TUJUAN_OPTIMASI:
+        raise ValueError(f"Tujuan optimasi tidak dikenal: {tujuan}")
+
+    wp_modul = np.atleast_1d(np.asarray(wp_modul, dtype=np.int64))
+    jumlah_modul = np.arange(MIN_PV_MODULES, MAX_PV_MODULES + 1)
+    hasil = evaluasi_array(
+        radiasi_harian, faktor_emisi, tagihan_bulanan,
+        wp_modul[:, None], jumlah_modul[None, :], tahun_analisis=tahun_analisis
+    )
+
+    npv = npv_penghematan(tagihan_bulanan, hasil.tagihan_baru, hasil.biaya_instalasi_pv,
+                          tahun_analisis, ASUMSI_INFLASI_LISTRIK, diskonto)
+    payback_pecahan = payback_tertutup(tagihan_bulanan, hasil.tagihan_baru,
+                                       hasil.biaya_instalasi_pv, ASUMSI_INFLASI_LISTRIK)
+
+    layak = np.ones(hasil.shape, dtype=bool)
+    if luas_atap_m2:
+        luas = np.array([LUAS_MODUL_M2.get(int(w), w / 210.0) for w in wp_modul])
+        layak &= luas[:, None] * jumlah_modul[None, :] <= luas_atap_m2
+    if anggaran_rp:
+        layak &= hasil.biaya_instalasi_pv <= anggaran_rp
+
+    if tujuan == 'npv':
+        skor = np.where(layak, npv, -np.inf)
+    else:
+        # Payback terpendek; NPV sebagai pemecah seri
+        pb = np.where(layak & np.isfinite(payback_pecahan), payback_pecahan, np.inf)
+        terpendek = np.isfinite(pb) & np.isclose(pb, pb.min(), rtol=1e-9, atol=0)
+        skor = np.where(terpendek, npv, -np.inf)
+
+    terbaik = None
+    if np.isfinite(skor.max()):
+        terbaik = tuple(int(i) for i in np.unravel_index(np.argmax(skor), skor.shape))
+
+    return HasilOptimasi(
+        wp_modul=wp_modul,
+        jumlah_modul=jumlah_modul,
+        kapasitas_kwp=hasil.kapasitas_pv_kwp,
+        biaya_instalasi=hasil.biaya_instalasi_pv,
+        penghematan_rp=hasil.penghematan_rp,
+        payback_tahun=hasil.payback_tahun,
+        payback_pecahan=payback_pecahan,
+        npv=npv,
+        layak=layak,
+        terbaik=terbaik,
+        tujuan=tujuan,
+    )
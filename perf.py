@@ -0,0 +1,253 @@
+"""Instrumentasi performa opsional untuk `project.py` dan `code.py`.
+
+Aktif jika environment `SOLAR_PERF=1` (semua sesi) atau URL memuat
+`?debug=perf` (satu sesi). Saat aktif, setiap rerun mencatat:
+
+    waktu per bagian    `profil.tandai(nama)`: waktu sejak tanda sebelumnya
+    hit/miss cache      fungsi `st.cache_*` yang dibungkus `pantau_cache`
+    ukuran payload      `profil.payload(nama, objek)`: byte yang dikirim ke
+                        browser (JSON plotly, PNG matplotlib, Arrow tabel)
+
+Hasilnya tampil di panel "Profil Performa" di akhir halaman dan diekspor
+dalam format teks Prometheus di http://127.0.0.1:9464/metrics (port diatur
+lewat `SOLAR_PERF_PORT`). Jika tidak aktif, `tandai`/`payload` langsung
+kembali sehingga biayanya praktis nol; penghitung cache selalu berjalan
+karena hanya berupa penambahan integer.
+"""
+
+import functools
+import io
+import os
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENV_AKTIF = 'SOLAR_PERF'
+ENV_PORT = 'SOLAR_PERF_PORT'
+PORT_BAWAAN = 9464
+PARAM_DEBUG = ('debug', 'perf')
+
+
+class _Metrik:
+    """Penampung metrik tingkat proses (dibagi semua sesi, aman antar-thread)."""
+
+    def __init__(self):
+        self.kunci = threading.Lock()
+        self.cache_panggilan = defaultdict(int)     # fungsi -> jumlah panggilan
+        self.cache_miss = defaultdict(int)          # fungsi -> jumlah eksekusi asli
+        self.bagian_jumlah = defaultdict(float)     # (halaman, bagian) -> total detik
+        self.bagian_hitung = defaultdict(int)       # (halaman, bagian) -> jumlah rerun
+        self.payload = {}                           # (halaman, nama) -> byte terakhir
+        self.rerun = defaultdict(int)               # halaman -> jumlah rerun terukur
+
+
+METRIK = _Metrik()
+_server = None
+_kunci_server = threading.Lock()
+
+
+def pantau_cache(dekorator_cache):
+    """Bungkus `st.cache_data`/`st.cache_resource` agar hit & miss-nya terhitung.
+
+    Contoh: `@pantau_cache(st.cache_data(max_entries=64))`.
+    """
+    def bungkus(fungsi):
+        nama = fungsi.__name__
+
+        @functools.wraps(fungsi)
+        def asli(*args, **kwargs):
+            with METRIK.kunci:
+                METRIK.cache_miss[nama] += 1
+            return fungsi(*args, **kwargs)
+
+        tercache = dekorator_cache(asli)
+
+        @functools.wraps(fungsi)
+        def panggil(*args, **kwargs):
+            with METRIK.kunci:
+                METRIK.cache_panggilan[nama] += 1
+            return tercache(*args, **kwargs)
+
+        panggil.clear = tercache.clear
+        return panggil
+    return bungkus
+
+
+def ukuran_payload(objek):
+    """Perkiraan byte yang dikirim Streamlit untuk figure plotly/matplotlib atau DataFrame."""
+    if hasattr(objek, 'to_plotly_json'):
+        import plotly.io
+
+        return len(plotly.io.to_json(objek, validate=False).encode())
+    if hasattr(objek, 'savefig'):
+        buffer = io.BytesIO()
+        objek.savefig(buffer, format='png', dpi=200, bbox_inches='tight')  # sama dengan st.pyplot
+        return buffer.tell()
+    from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+    return len(convert_pandas_df_to_arrow_bytes(objek))
+
+
+class Profil:
+    """Pencatat satu rerun halaman; tidak melakukan apa pun jika `aktif=False`."""
+
+    def __init__(self, halaman, aktif):
+        self.halaman = halaman
+        self.aktif = aktif
+        self.waktu = {}
+        self.ukuran = {}
+        self._awal = self._tanda = time.perf_counter()
+        with METRIK.kunci:
+            self._cache_awal = (dict(METRIK.cache_panggilan), dict(METRIK.cache_miss))
+
+    def tandai(self, nama):
+        """Catat waktu sejak tanda sebelumnya sebagai bagian `nama` (dijumlah jika berulang)."""
+        if not self.aktif:
+            return
+        sekarang = time.perf_counter()
+        self.waktu[nama] = self.waktu.get(nama, 0.0) + sekarang - self._tanda
+        self._tanda = sekarang
+
+    def payload(self, nama, objek):
+        """Catat ukuran payload; waktu pengukurannya tidak dibebankan ke bagian mana pun."""
+        if not self.aktif:
+            return
+        mulai = time.perf_counter()
+        self.ukuran[nama] = ukuran_payload(objek)
+        self._tanda += time.perf_counter() - mulai
+
+    def _delta_cache(self):
+        panggilan_awal, miss_awal = self._cache_awal
+        with METRIK.kunci:
+            panggilan = {k: v - panggilan_awal.get(k, 0) for k, v in METRIK.cache_panggilan.items()}
+            miss = {k: METRIK.cache_miss.get(k, 0) - miss_awal.get(k, 0) for k in panggilan}
+        return {k: (panggilan[k] - miss[k], miss[k]) for k in panggilan if panggilan[k]}
+
+    def selesai(self):
+        """Tutup rerun: simpan ke metrik proses lalu tampilkan panel profil."""
+        if not self.aktif:
+            return
+        self.tandai('lainnya')
+        total = time.perf_counter() - self._awal
+        with METRIK.kunci:
+            METRIK.rerun[self.halaman] += 1
+            for nama, detik in {**self.waktu, 'total': total}.items():
+                METRIK.bagian_jumlah[self.halaman, nama] += detik
+                METRIK.bagian_hitung[self.halaman, nama] += 1
+            for nama, byte in self.ukuran.items():
+                METRIK.payload[self.halaman, nama] = byte
+        self._tampilkan(total)
+
+    def _tampilkan(self, total):
+        import pandas as pd
+        import streamlit as st
+
+        with st.expander(f"⏱ Profil Performa ({total * 1000:.0f} ms)"):
+            st.dataframe(pd.DataFrame({
+                'Bagian': list(self.waktu),
+                'Waktu (ms)': [d * 1000 for d in self.waktu.values()],
+                'Porsi (%)': [d / total * 100 for d in self.waktu.values()],
+            }), hide_index=True)
+            cache = self._delta_cache()
+            if cache:
+                st.dataframe(pd.DataFrame({
+                    'Fungsi Cache': list(cache),
+                    'Hit': [h for h, _ in cache.values()],
+                    'Miss': [m for _, m in cache.values()],
+                }), hide_index=True)
+            if self.ukuran:
+                st.dataframe(pd.DataFrame({
+                    'Payload': list(self.ukuran),
+                    'Ukuran (kB)': [b / 1024 for b in self.ukuran.values()],
+                }), hide_index=True)
+            alamat = _server and f"http://127.0.0.1:{_server.server_address[1]}/metrics"
+            st.caption(f"Metrik Prometheus: {alamat}" if alamat else "Endpoint metrik tidak aktif (port terpakai).")
+
+
+def _aktif_dari_query():
+    import streamlit as st
+
+    kunci, nilai = PARAM_DEBUG
+    try:
+        return nilai in st.query_params.get_all(kunci)
+    except Exception:
+        return False  # di luar `streamlit run` (mis. impor biasa) tidak ada query params
+
+
+def mulai(halaman):
+    """Profil untuk rerun ini; menyalakan endpoint metrik saat pertama kali aktif."""
+    aktif = os.environ.get(ENV_AKTIF, '') not in ('', '0') or _aktif_dari_query()
+    if aktif:
+        layani_metrik()
+    return Profil(halaman, aktif)
+
+
+# --- EKSPOR PROMETHEUS ---
+
+def _escape(nilai):
+    return str(nilai).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label(**label):
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in label.items()) + '}'
+
+
+def teks_prometheus(metrik=METRIK):
+    """Semua metrik dalam format eksposisi teks Prometheus 0.0.4."""
+    baris = []
+    with metrik.kunci:
+        baris += ['# HELP solar_rerun_total Jumlah rerun terukur per halaman.',
+                  '# TYPE solar_rerun_total counter']
+        baris += [f'solar_rerun_total{_label(halaman=h)} {n}' for h, n in sorted(metrik.rerun.items())]
+
+        baris += ['# HELP solar_bagian_detik Waktu per bagian rerun.',
+                  '# TYPE solar_bagian_detik summary']
+        for (h, b), detik in sorted(metrik.bagian_jumlah.items()):
+            baris.append(f'solar_bagian_detik_sum{_label(halaman=h, bagian=b)} {detik:.6f}')
+            baris.append(f'solar_bagian_detik_count{_label(halaman=h, bagian=b)} {metrik.bagian_hitung[h, b]}')
+
+        baris += ['# HELP solar_cache_panggilan_total Panggilan fungsi st.cache_* yang dipantau.',
+                  '# TYPE solar_cache_panggilan_total counter']
+        baris += [f'solar_cache_panggilan_total{_label(fungsi=f)} {n}'
+                  for f, n in sorted(metrik.cache_panggilan.items())]
+        baris += ['# HELP solar_cache_miss_total Eksekusi ulang (cache miss) fungsi yang dipantau.',
+                  '# TYPE solar_cache_miss_total counter']
+        baris += [f'solar_cache_miss_total{_label(fungsi=f)} {metrik.cache_miss.get(f, 0)}'
+                  for f in sorted(metrik.cache_panggilan)]
+
+        baris += ['# HELP solar_payload_bytes Ukuran payload terakhir per figure/tabel.',
+                  '# TYPE solar_payload_bytes gauge']
+        baris += [f'solar_payload_bytes{_label(halaman=h, nama=n)} {b}'
+                  for (h, n), b in sorted(metrik.payload.items())]
+    return '\n'.join(baris) + '\n'
+
+
+class _PenanganMetrik(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        isi = teks_prometheus().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(isi)))
+        self.end_headers()
+        self.wfile.write(isi)
+
+    def log_message(self, format, *args):
+        pass  # jangan campur log akses dengan log Streamlit
+
+
+def layani_metrik(port=None):
+    """Jalankan endpoint /metrics di thread latar (sekali per proses); None jika port terpakai."""
+    global _server
+    with _kunci_server:
+        if _server is None:
+            port = int(os.environ.get(ENV_PORT, PORT_BAWAAN)) if port is None else port
+            try:
+                _server = ThreadingHTTPServer(('127.0.0.1', port), _PenanganMetrik)
+            except OSError:
+                return None
+            threading.Thread(target=_server.serve_forever, name='perf-metrik', daemon=True).start()
+        return _server
@@ -1,8 +1,10 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go 
+
+import perf
+
+# pandas & plotly diimpor di bagian yang memakainya (lihat grafik.py), jadi
+# banner, input dan kartu metrik sudah tampil sebelum pustaka berat dimuat.
 
 # --- 1. KONFIGURASI HALAMAN ---
 st.set_page_config(
@@ -10,6 +12,8 @@ st.set_page_config(
     layout="wide",
     page_icon="☀️"
 )
+# Instrumentasi opsional: ?debug=perf atau SOLAR_PERF=1 (lihat perf.py)
+profil = perf.mulai('project')
 
 # --- 2. CUSTOM CSS (MODERN UI & FLOATING TITLE) ---
 st.markdown("""
@@ -67,57 +71,133 @@ st.markdown("""
     }
 </style>
 """, unsafe_allow_html=True)
+profil.tandai('css')
 
 
 # --- 3. KONSTANTA PROYEK ---
-TARIF_PLN = 1400 
-FILE_DATA = 'produksi_emisi_provinsi.csv' 
-WP_CHOICES = [300, 350, 400, 450, 500, 550] 
-MIN_PV_MODULES = 1 
-MAX_PV_MODULES = 50 
-TAHUN_ANALISIS = 15 
-ASUMSI_INFLASI_LISTRIK = 0.05 
-BIAYA_AWAL_PV_PER_Wp = 15000 
+from engine import (
+    WP_CHOICES, MIN_PV_MODULES, MAX_PV_MODULES,
+    TAHUN_ANALISIS, ASUMSI_INFLASI_LISTRIK,
+    InputSkenario, hitung_skenario, format_rupiah, format_payback
+)
+from referensi import JARAK_MAKS_KLIMATOLOGI_KM, GalatReferensi, referensi_bawaan
+from simulasi_pv import profil_lokasi, simulasi
+from konsumsi_mandiri import ATURAN_EKSPOR, faktor_bulan_30, simulasi_konsumsi_mandiri, profil_beban
+from baterai import ParameterBaterai, sapu_kapasitas
+from payback import payback_langkah
+from optimasi import TUJUAN_OPTIMASI, optimasi_ukuran
+from grafik import TampilanSkenario, fig_kipas, fig_arus_kas
+from keuangan import DAYA_TERSAMBUNG_VA, ParameterKeuangan, analisis_keuangan, golongan_tarif
+from analitik_nasa import GudangAnalitik, penanda_gudang
+from monte_carlo import ParameterMonteCarlo, rasio_yield_tahunan, simulasi_monte_carlo
+from cache_skenario import CacheLRU, kunci_skenario
+from ekspor import MIME, PoolEkspor, kunci_berkas, laporan_tercache
+
+SUMBER_PRODUKSI = ["Rata-rata Provinsi", "Simulasi Per Jam (NASA POWER)"]
+
+KETERANGAN_MUSIM = {
+    'Monsun': "ℹ️ Pola Musim: Monsun (Puncak kemarau di pertengahan tahun).",
+    'Khatulistiwa': "ℹ️ Pola Musim: Khatulistiwa (Cenderung stabil sepanjang tahun).",
+    'Data Per Jam': "ℹ️ Pola Musim: Klimatologi bulanan dari data iradiansi & suhu per jam NASA POWER."
+}
 
 # --- 4. FUNGSI UTILITY ---
-def format_rupiah(x):
-    """Format angka menjadi Rupiah untuk label grafik dan tampilan."""
-    if x >= 1e9:
-        return f"Rp {x/1e9:,.2f} M"
-    if x >= 1e6:
-        return f"Rp {x/1e6:,.1f} Jt"
-    return f"Rp {x:,.0f}"
-
-@st.cache_data
-def load_data(file_path):
+@perf.pantau_cache(st.cache_resource)
+def load_referensi():
+    """Dataset referensi lokasi (memory-mapped); dibangun dari CSV bawaan saat pertama kali."""
     try:
-        df = pd.read_csv(file_path, delimiter=',')
-        if len(df.columns) <= 2:
-            df = pd.read_csv(file_path, delimiter=';')
-
-        if df.columns[0].lower() in ['no', 'no.']:
-            df = df.iloc[:, 1:].copy() 
-            
-        df.columns = ['Provinsi', 'Produksi_Harian_kWh', 'Faktor_Emisi_kg_per_kWh']
-        
-        for col in ['Produksi_Harian_kWh', 'Faktor_Emisi_kg_per_kWh']:
-            if df[col].dtype == object: 
-                df[col] = df[col].astype(str).str.replace(',', '.', regex=True)
-                df[col] = df[col].astype(str).str.replace(' kWh/kWp', '', regex=False) 
-            df[col] = pd.to_numeric(df[col], errors='coerce') 
-
-        df.dropna(inplace=True) 
-        if df.empty:
-            st.error("Data tidak valid. Pastikan kolom data Anda terisi angka.")
-        return df
-    except Exception as e:
+        return referensi_bawaan()
+    except (GalatReferensi, OSError) as e:
         st.error(f"Error: {e}")
-        return pd.DataFrame()
+        return None
+
+@perf.pantau_cache(st.cache_data)
+def load_profil_jam(versi, indeks_situs):
+    """Profil produksi per-kWp sebuah lokasi berseri dari simulasi per jam (dihitung sekali)."""
+    data_nasa = load_referensi().seri(indeks_situs)
+    produksi_harian, faktor_musim = profil_lokasi(data_nasa)
+    return {
+        'nama': load_referensi().situs(indeks_situs).nama,
+        'produksi_harian': produksi_harian,
+        'faktor_musim': faktor_musim,
+        'lintang': data_nasa.metadata.lintang,
+        'bujur': data_nasa.metadata.bujur,
+        'waktu': data_nasa.waktu,
+        'profil_per_kwp': simulasi(data_nasa, 1.0).energi_kwh
+    }
+
+@perf.pantau_cache(st.cache_data)
+def load_rasio_yield(penanda_gudang, lintang, bujur):
+    """Rasio yield tahunan historis situs gudang analitik terdekat.
+
+    None jika tidak ada situs dengan >= 2 tahun lengkap dalam `JARAK_MAKS_KLIMATOLOGI_KM`;
+    `penanda_gudang` membuat cache kedaluwarsa setelah ingest baru.
+    """
+    gudang = GudangAnalitik()
+    terdekat = gudang.terdekat(lintang, bujur, min_tahun=2, jarak_maks=JARAK_MAKS_KLIMATOLOGI_KM)
+    if terdekat is None:
+        return None
+    kunci, jarak = terdekat
+    yield_tahun = gudang.yield_tahun_lengkap(kunci)
+    if len(yield_tahun) < 2:
+        return None
+    return {'nama': gudang.situs()[kunci]['nama'], 'jarak': jarak, 'rasio': rasio_yield_tahunan(yield_tahun)}
+
+@perf.pantau_cache(st.cache_data(max_entries=64))
+def load_monte_carlo(tagihan_bulanan, produksi_pv_bulanan, kapasitas_pv_wp, jumlah_sampel, seed, rasio_yield):
+    """Sampel Monte Carlo satu skenario (deterministik untuk seed yang sama)."""
+    param = ParameterMonteCarlo(jumlah_sampel=jumlah_sampel, seed=seed)
+    return simulasi_monte_carlo(tagihan_bulanan, produksi_pv_bulanan, kapasitas_pv_wp, param, rasio_yield)
+
+@st.cache_resource
+def cache_skenario():
+    """Satu cache LRU hasil + grafik per skenario, dibagi ke semua sesi."""
+    return CacheLRU()
+
+@st.cache_resource
+def pool_ekspor():
+    """Process pool render laporan PDF/PNG, dibagi ke semua sesi."""
+    return PoolEkspor()
+
+def bagian_laporan(inp, nama_file, dipantau=False):
+    """Tombol laporan PDF/PNG; render berjalan di pool dan future-nya disimpan per sesi."""
+    format_laporan = st.radio("Format Laporan", ['pdf', 'png'], format_func=str.upper,
+                              horizontal=True, key='format_laporan')
+    antrean = st.session_state.setdefault('antrean_laporan', {})
+    if dipantau and all(f.done() for f in antrean.values()):
+        st.rerun()      # render selesai: rerun penuh menampilkan hasil dan menghentikan pemantauan
+
+    path_laporan = laporan_tercache(inp, format_laporan)
+    future = antrean.get(kunci_berkas(inp, format_laporan))
+    if path_laporan is None and future is not None:
+        if not future.done():
+            st.info("⏳ Laporan sedang disusun; halaman tetap bisa dipakai.")
+            return
+        if future.exception() is not None:
+            st.error(f"Laporan gagal dibuat: {future.exception()}")
+        else:
+            path_laporan = future.result()
+    if path_laporan is None:
+        if st.button("Siapkan Laporan", key='siapkan_laporan'):
+            antrean[kunci_berkas(inp, format_laporan)] = pool_ekspor().kirim(inp, format_laporan)
+            st.rerun()  # rerun penuh agar fragmen mulai memantau future
+        return
+    with open(path_laporan, 'rb') as f:
+        st.download_button(
+            f"⬇️ Unduh Laporan {format_laporan.upper()}", f.read(),
+            file_name=f"{nama_file}.{format_laporan}", mime=MIME[format_laporan], key='unduh_laporan'
+        )
+
+def terapkan_ukuran(wp, modul):
+    """Callback tombol optimasi: isi widget Wp & jumlah modul dengan rekomendasi."""
+    st.session_state['pv_module_watt'] = wp
+    st.session_state['pv_module_count'] = modul
 
 # Panggil fungsi untuk memuat data
-data_solar = load_data(FILE_DATA)
-if data_solar.empty:
+referensi = load_referensi()
+if referensi is None:
     st.stop()
+profil.tandai('data')
 
 
 # --- 5. HEADER (JUDUL MENGAMBANG DI BACKGROUND) ---
@@ -141,19 +221,48 @@ col_input1, col_input2, col_input3 = st.columns(3)
 with col_input1:
     provinsi_pilihan = st.selectbox(
         "Pilih Lokasi (Provinsi):", 
-        data_solar['Provinsi'].tolist(),
+        referensi.nama(tingkat='provinsi'),
         key='provinsi_key' 
     )
     
+    sumber_produksi = st.radio(
+        "Sumber Data Produksi PV:",
+        SUMBER_PRODUKSI,
+        horizontal=True,
+        key='sumber_produksi',
+        help="Simulasi per jam memakai iradiansi & suhu NASA POWER dari lokasi berseri terdekat."
+    )
+    
     # Data Wilayah
-    data_lokasi = data_solar[data_solar['Provinsi'] == provinsi_pilihan].iloc[0]
-    radiasi_harian = data_lokasi['Produksi_Harian_kWh']
-    faktor_emisi_lokal = data_lokasi['Faktor_Emisi_kg_per_kWh']
+    situs = referensi.situs(referensi.cari(provinsi_pilihan))
+    radiasi_harian = situs.radiasi
+    faktor_emisi_lokal = situs.emisi
+    profil_jam = None
+    # Faktor musim: tabel klimatologi per situs yang dihitung saat dataset dibangun
+    # (seri per jam terdekat atau pola zona), tanpa pencocokan nama tiap rerun
+    klimatologi = referensi.klimatologi(situs.indeks)
+    faktor_musim, zona_musim = klimatologi.faktor, klimatologi.zona
+    label_pv_out = f"{radiasi_harian} kWh/kWp"
+
+    # Seri per jam yang terlalu jauh tidak mewakili lokasi: tetap pakai rata-rata provinsi
+    seri_terdekat = None
+    if sumber_produksi == SUMBER_PRODUKSI[1]:
+        seri_terdekat = referensi.terdekat(situs.lintang, situs.bujur, hanya_berseri=True,
+                                           jarak_maks=JARAK_MAKS_KLIMATOLOGI_KM)
+        if seri_terdekat is None:
+            st.caption(f"ℹ️ Tidak ada data per jam NASA POWER dalam {JARAK_MAKS_KLIMATOLOGI_KM:.0f} km "
+                       f"dari {provinsi_pilihan}; produksi memakai rata-rata provinsi.")
+    if seri_terdekat is not None:
+        indeks_seri, jarak_seri = seri_terdekat
+        profil_jam = load_profil_jam(referensi.versi, indeks_seri)
+        radiasi_harian = profil_jam['produksi_harian']
+        faktor_musim, zona_musim = profil_jam['faktor_musim'], None
+        label_pv_out = f"{radiasi_harian:.2f} kWh/kWp (simulasi {profil_jam['nama']}, {profil_jam['lintang']}, {profil_jam['bujur']}; {jarak_seri:.0f} km)"
     
     st.markdown(f"""
     <div class="info-box">
         <b>Data Wilayah: {provinsi_pilihan}</b><br>
-        ☀️ PV Out: {radiasi_harian} kWh/kWp<br>
+        ☀️ PV Out: {label_pv_out}<br>
         🏭 Emisi Grid: {faktor_emisi_lokal} kg/kWh
     </div>
     """, unsafe_allow_html=True)
@@ -185,67 +294,75 @@ with col_input3:
         key='pv_module_count'
     )
     
-    kapasitas_pv_wp = wp_pilihan * jumlah_modul
-    kapasitas_pv_kwp = kapasitas_pv_wp / 1000.0
+    kapasitas_pv_kwp = wp_pilihan * jumlah_modul / 1000.0
     
     st.markdown(f"Kapasitas Total PV Anda: **{kapasitas_pv_kwp:.2f} kWp**")
+profil.tandai('input')
 
 
-# --- BAGIAN 2: PROSES ALGORITMA ---
-
-# B. Perhitungan Konsumsi & Produksi
-konsumsi_kwh = tagihan_bulanan / TARIF_PLN
-produksi_pv_harian = radiasi_harian * kapasitas_pv_kwp 
-produksi_pv_bulanan = produksi_pv_harian * 30
-
-# C. Hitung Output Kritis Bulanan
-penghematan_rp = produksi_pv_bulanan * TARIF_PLN
-emisi_dicegah_total = produksi_pv_bulanan * faktor_emisi_lokal 
-skor_kemandirian = (produksi_pv_bulanan / konsumsi_kwh) * 100
-skor_kemandirian = min(skor_kemandirian, 100) 
-tagihan_baru = tagihan_bulanan - penghematan_rp
-if tagihan_baru < 0: tagihan_baru = 0
-
-# D. Hitung Output Kritis Jangka Panjang (Payback Fix)
-biaya_instalasi_pv = kapasitas_pv_wp * BIAYA_AWAL_PV_PER_Wp
-biaya_kumulatif_tanpa_pv = []
-biaya_kumulatif_dengan_pv = []
-
-tagihan_bulanan_saat_ini = tagihan_bulanan
-tagihan_baru_saat_ini = tagihan_baru
-
-total_biaya_tanpa_pv = 0
-total_biaya_dengan_pv = biaya_instalasi_pv 
-
-payback_tahun = TAHUN_ANALISIS + 1 
-
-for tahun in range(1, TAHUN_ANALISIS + 1):
-    # Kenaikan Tarif Bulanan
-    tagihan_bulanan_saat_ini *= (1 + ASUMSI_INFLASI_LISTRIK)
-    tagihan_baru_saat_ini *= (1 + ASUMSI_INFLASI_LISTRIK)
-
-    # 1. Update total biaya kumulatif
-    total_biaya_tanpa_pv += tagihan_bulanan_saat_ini * 12
-    total_biaya_dengan_pv += tagihan_baru_saat_ini * 12
-
-    biaya_kumulatif_tanpa_pv.append(total_biaya_tanpa_pv)
-    biaya_kumulatif_dengan_pv.append(total_biaya_dengan_pv)
-
-    # 2. Cek Payback
-    if total_biaya_dengan_pv <= total_biaya_tanpa_pv and payback_tahun > TAHUN_ANALISIS:
-        payback_tahun = tahun
-    
-emisi_total_ton = emisi_dicegah_total * 12 * TAHUN_ANALISIS / 1000 
-df_proyeksi = pd.DataFrame({
-    'Tahun': range(1, TAHUN_ANALISIS + 1),
-    'Tanpa PV': biaya_kumulatif_tanpa_pv,
-    'Dengan PV': biaya_kumulatif_dengan_pv
-})
+# --- BAGIAN 1B: OPTIMASI UKURAN SISTEM ---
+with st.expander("🎯 Cari Ukuran Sistem Optimal"):
+    if st.toggle("Hitung rekomendasi jumlah modul", key='mode_optimasi'):
+        o1, o2, o3 = st.columns(3)
+        tujuan_optimasi = o1.radio(
+            "Tujuan:", TUJUAN_OPTIMASI, key='tujuan_optimasi',
+            format_func=lambda k: "NPV Terbesar" if k == 'npv' else "Balik Modal Tercepat"
+        )
+        luas_atap = o2.number_input("Batas Luas Atap (m², 0 = tanpa batas):", min_value=0.0, value=0.0, step=5.0, key='luas_atap')
+        anggaran = o3.number_input("Batas Anggaran (Rp, 0 = tanpa batas):", min_value=0, value=0, step=5_000_000, key='anggaran')
+        semua_wp = st.checkbox("Bandingkan semua kapasitas modul (Wp)", value=True, key='optimasi_semua_wp')
+
+        opt = optimasi_ukuran(
+            radiasi_harian, faktor_emisi_lokal, tagihan_bulanan,
+            wp_modul=WP_CHOICES if semua_wp else [wp_pilihan],
+            tujuan=tujuan_optimasi,
+            luas_atap_m2=luas_atap or None,
+            anggaran_rp=anggaran or None
+        )
 
-# E. VARIABEL KHUSUS UNTUK GRAFIK DONUT 
-emisi_awal_total = konsumsi_kwh * faktor_emisi_lokal 
-emisi_dicegah_grafik = min(emisi_dicegah_total, emisi_awal_total) 
-emisi_tersisa_pln = emisi_awal_total - emisi_dicegah_grafik
+        if opt.terbaik is None:
+            st.warning("Tidak ada kombinasi modul yang memenuhi batas atap/anggaran.")
+        else:
+            st.success(
+                f"Rekomendasi: **{opt.modul_terbaik} modul × {opt.wp_terbaik} Wp** "
+                f"({opt.kapasitas_kwp[opt.terbaik]:.2f} kWp) • NPV {format_rupiah(opt.npv[opt.terbaik])} • "
+                f"Balik modal {opt.payback_pecahan[opt.terbaik]:.1f} tahun"
+            )
+            st.button("Terapkan Rekomendasi", on_click=terapkan_ukuran, args=(opt.wp_terbaik, opt.modul_terbaik))
+
+        import plotly.express as px
+
+        df_opt = opt.kurva()
+        df_opt = df_opt[df_opt['Layak']]
+        sumbu_y = 'NPV' if tujuan_optimasi == 'npv' else 'Masa Balik Modal'
+        fig_opt = px.line(
+            df_opt, x='Jumlah Modul', y=sumbu_y, color=df_opt['Wp'].astype(str),
+            labels={'color': 'Wp'}, title=f"Trade-off {sumbu_y} vs Jumlah Modul"
+        )
+        st.plotly_chart(fig_opt, use_container_width=True)
+        profil.payload('fig_opt', fig_opt)
+profil.tandai('optimasi')
+
+
+# --- BAGIAN 2: PROSES ALGORITMA (lihat engine.py) ---
+
+input_skenario = InputSkenario(
+    provinsi=provinsi_pilihan,
+    radiasi_harian=radiasi_harian,
+    faktor_emisi=faktor_emisi_lokal,
+    tagihan_bulanan=tagihan_bulanan,
+    wp_modul=wp_pilihan,
+    jumlah_modul=jumlah_modul,
+    faktor_musim=faktor_musim,
+    zona_musim=zona_musim
+)
+# Skenario yang sama (dari sesi mana pun) diambil dari cache beserta grafiknya
+skenario = cache_skenario().ambil(
+    kunci_skenario(input_skenario),
+    lambda: TampilanSkenario(input_skenario, hitung_skenario(input_skenario))
+)
+hasil = skenario.hasil
+profil.tandai('perhitungan')
 
 
 # --- BAGIAN 3: OUTPUT DASHBOARD METRIC (Scorecards) ---
@@ -258,35 +375,119 @@ m1, m2, m3, m4 = st.columns(4)
 with m1:
     st.metric(
         "💰 Hemat Biaya Bulanan", 
-        f"{format_rupiah(int(penghematan_rp))}", 
-        delta=f"Tagihan Akhir: {format_rupiah(int(tagihan_baru))}"
+        f"{format_rupiah(int(hasil.penghematan_rp))}", 
+        delta=f"Tagihan Akhir: {format_rupiah(int(hasil.tagihan_baru))}"
     )
 
 with m2:
-    payback_display = f"{payback_tahun} Tahun" if payback_tahun <= TAHUN_ANALISIS else f"> {TAHUN_ANALISIS} Tahun"
     st.metric(
         "⏳ Masa Balik Modal", 
-        payback_display, 
-        help=f"Total biaya sistem PV adalah {format_rupiah(biaya_instalasi_pv)}"
+        skenario.payback_display, 
+        help=f"Total biaya sistem PV adalah {format_rupiah(hasil.biaya_instalasi_pv)}"
     )
 
 with m3:
     st.metric(
         "🌱 Emisi CO₂ Dicegah (Bln)", 
-        f"{emisi_dicegah_total:.1f} kg", 
-        help=f"Total Emisi Dicegah selama {TAHUN_ANALISIS} tahun: {emisi_total_ton:.1f} ton CO₂"
+        f"{hasil.emisi_dicegah_total:.1f} kg", 
+        help=f"Total Emisi Dicegah selama {TAHUN_ANALISIS} tahun: {hasil.emisi_total_ton:.1f} ton CO₂"
     )
 
 with m4:
     st.metric(
         "⚡ Skor Kemandirian Energi", 
-        f"{skor_kemandirian:.1f}%", 
+        f"{hasil.skor_kemandirian:.1f}%", 
         help="Persentase kebutuhan listrik bulanan yang dipenuhi PV Anda."
     )
+profil.tandai('metrik')
+
+# --- BAGIAN 3B: NERACA ENERGI PER JAM (hanya mode simulasi per jam) ---
+if profil_jam is not None:
+    st.subheader("📐 Neraca Energi Per Jam: Dipakai Sendiri vs Diekspor")
+    aturan_ekspor = st.selectbox(
+        "Aturan Kredit Ekspor ke PLN:",
+        list(ATURAN_EKSPOR),
+        format_func=lambda k: ATURAN_EKSPOR[k].nama,
+        key='aturan_ekspor'
+    )
+    neraca = simulasi_konsumsi_mandiri(
+        profil_jam['waktu'],
+        hasil.konsumsi_kwh,
+        profil_jam['profil_per_kwp'] * hasil.kapasitas_pv_kwp,
+        ATURAN_EKSPOR[aturan_ekspor]
+    )
+    # Beban neraca = konsumsi/30 per hari sepanjang bulan kalender, jadi rata-rata tagihan tanpa PV
+    # di neraca lebih besar dari tagihan input (508.333 vs 500.000 untuk data 2024). Penghematan
+    # diskalakan ke bulan 30 hari agar kedua tagihan payback memakai basis yang sama.
+    penghematan_riil = float(neraca.penghematan_bulanan[0]) * faktor_bulan_30(profil_jam['waktu'])
+    payback_riil = int(payback_langkah(
+        tagihan_bulanan, max(tagihan_bulanan - penghematan_riil, 0), hasil.biaya_instalasi_pv,
+        TAHUN_ANALISIS, ASUMSI_INFLASI_LISTRIK
+    ))
+
+    n1, n2, n3, n4 = st.columns(4)
+    n1.metric("💰 Hemat Riil Bulanan", format_rupiah(int(penghematan_riil)),
+              delta=f"{format_rupiah(int(penghematan_riil - hasil.penghematan_rp))} vs estimasi sederhana",
+              delta_color="off")
+    n2.metric("⏳ Masa Balik Modal Riil", format_payback(payback_riil))
+    n3.metric("🏠 PV Dipakai Sendiri", f"{neraca.rasio_konsumsi_mandiri[0]:.1f}%",
+              help="Bagian produksi PV yang langsung dipakai rumah (sisanya diekspor).")
+    n4.metric("⚡ Kemandirian Per Jam", f"{neraca.skor_kemandirian[0]:.1f}%",
+              help=f"Energi diekspor: {neraca.ekspor_bulanan.sum():,.0f} kWh/tahun, "
+                   f"diimpor: {neraca.impor_bulanan.sum():,.0f} kWh/tahun.")
+
+    # --- BAGIAN 3C: SIMULASI BATERAI (opsional) ---
+    if st.checkbox("🔋 Analisis Penambahan Baterai", key='analisis_baterai'):
+        b1, b2 = st.columns(2)
+        kapasitas_baterai = b1.number_input(
+            "Kapasitas Baterai (kWh):", min_value=1, max_value=30, value=5, step=1, key='kapasitas_baterai'
+        )
+        strategi_baterai = b2.radio(
+            "Strategi Dispatch:", ['greedy', 'tou'], horizontal=True, key='strategi_baterai',
+            format_func=lambda k: "Greedy (isi surplus, pakai saat kurang)" if k == 'greedy' else "Jam Puncak 17-22",
+        )
+
+        # Sapuan 0..30 kWh dalam satu simulasi; ukuran pilihan diambil dari hasil sapuan
+        ukuran_sapuan = np.arange(0, 31, dtype=float)
+        sapuan = sapu_kapasitas(
+            profil_jam['waktu'],
+            profil_beban(profil_jam['waktu'], hasil.konsumsi_kwh),
+            profil_jam['profil_per_kwp'] * hasil.kapasitas_pv_kwp,
+            ukuran_sapuan, hasil.biaya_instalasi_pv, tagihan_bulanan,
+            param=ParameterBaterai(), strategi=strategi_baterai,
+            aturan=ATURAN_EKSPOR[aturan_ekspor]
+        )
+        i_bat = int(kapasitas_baterai)
+        biaya_baterai = sapuan.biaya_total[i_bat] - hasil.biaya_instalasi_pv
+
+        k1, k2, k3 = st.columns(3)
+        k1.metric("💰 Hemat Bulanan + Baterai", format_rupiah(int(sapuan.penghematan_bulanan[i_bat])),
+                  delta=format_rupiah(int(sapuan.penghematan_bulanan[i_bat] - penghematan_riil)), delta_color="off")
+        k2.metric("⏳ Masa Balik Modal + Baterai", format_payback(int(sapuan.payback_tahun[i_bat])),
+                  help=f"Biaya baterai: {format_rupiah(biaya_baterai)} ({format_rupiah(ParameterBaterai.biaya_per_kwh)}/kWh)")
+        k3.metric("⚡ Kemandirian + Baterai", f"{sapuan.skor_kemandirian[i_bat]:.1f}%")
+
+        import pandas as pd
+        import plotly.express as px
+
+        df_baterai = pd.DataFrame({
+            'Kapasitas Baterai (kWh)': ukuran_sapuan,
+            'Penghematan Bulanan (Rp)': sapuan.penghematan_bulanan
+        })
+        fig_baterai = px.line(
+            df_baterai, x='Kapasitas Baterai (kWh)', y='Penghematan Bulanan (Rp)', markers=True,
+            title='Penghematan Bulanan vs Ukuran Baterai'
+        )
+        fig_baterai.add_vline(x=i_bat, line_dash='dash', line_color='#3498db')
+        st.plotly_chart(fig_baterai, use_container_width=True)
+        profil.payload('fig_baterai', fig_baterai)
+    profil.tandai('neraca_jam')
 
 st.write("") 
 
 # --- BAGIAN 4: VISUALISASI GRAFIK ---
+# Hanya tab yang sedang dibuka yang dihitung & dikirim ke browser (tab.open);
+# berpindah tab memicu rerun ringan karena skenario sudah ada di cache.
 
 # UPDATE: Menambahkan "☀️ Profil Produksi Energi" di Tab ke-3
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -295,200 +496,180 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "☀️ Profil Produksi Energi", 
     "🌍 Lingkungan", 
     "ℹ️ Detail Teknis"
-])
+], key='tab_grafik', on_change='rerun')
 
 # GRAFIK 1: Analisis Biaya Bulanan
 with tab1:
-    st.subheader("Komparasi Tagihan Listrik Bulanan")
+    if tab1.open:
+        st.subheader("Komparasi Tagihan Listrik Bulanan")
+        st.plotly_chart(skenario.fig_bar, use_container_width=True) 
+        profil.payload('fig_bar', skenario.fig_bar)
     
-    data_biaya = pd.DataFrame({
-        'Kategori': ['Tagihan Awal', 'Tagihan Akhir'],
-        'Rupiah': [tagihan_bulanan, tagihan_baru],
-        'Teks': [format_rupiah(tagihan_bulanan), format_rupiah(tagihan_baru)]
-    })
-    
-    fig_bar = px.bar(
-        data_biaya, 
-        x='Kategori', 
-        y='Rupiah', 
-        text='Teks', 
-        color='Kategori',
-        color_discrete_map={'Tagihan Awal': '#34495e', 'Tagihan Akhir': '#2ecc71'},
-        title='Perbandingan Tagihan Listrik: Sebelum vs Sesudah PV'
-    )
-    
-    fig_bar.update_layout(yaxis_title="", xaxis_title="", showlegend=False)
-    
-    if penghematan_rp > 0 and tagihan_baru < tagihan_bulanan:
-        y_pos_annotasi = (tagihan_bulanan + tagihan_baru) / 2
-        fig_bar.add_annotation(
-            x=0.5, y=y_pos_annotasi, 
-            text=f"Hemat: {format_rupiah(penghematan_rp)}",
-            showarrow=False,
-            font=dict(size=14, color="black"),
-            bgcolor="rgba(255, 255, 0, 0.8)", 
-            borderpad=4
-        )
-    
-    st.plotly_chart(fig_bar, use_container_width=True) 
-    
-    st.markdown(f"**Tingkat Kemandirian Energi** dari PV Anda: **{skor_kemandirian:.1f}%**")
-    st.progress(int(skor_kemandirian))
+        st.markdown(f"**Tingkat Kemandirian Energi** dari PV Anda: **{hasil.skor_kemandirian:.1f}%**")
+        st.progress(int(hasil.skor_kemandirian))
+        profil.tandai('tab_biaya')
 
 # GRAFIK 2: Proyeksi Jangka Panjang
 with tab2:
-    st.subheader(f"Proyeksi Biaya Listrik Kumulatif Selama {TAHUN_ANALISIS} Tahun")
-
-    df_plot_longterm = df_proyeksi.melt('Tahun', var_name='Skenario', value_name='Total Biaya Kumulatif')
-
-    fig_proj = px.line(
-        df_plot_longterm,
-        x='Tahun',
-        y='Total Biaya Kumulatif',
-        color='Skenario',
-        color_discrete_map={'Tanpa PV': '#e74c3c', 'Dengan PV': '#2ecc71'},
-        title='Perbandingan Biaya Kumulatif Jangka Panjang',
-        markers=True
-    )
-    
-    fig_proj.update_layout(yaxis=dict(tickformat=",.0f", tickprefix="Rp "))
-
-    if payback_tahun <= TAHUN_ANALISIS:
-        payback_cost = df_proyeksi[df_proyeksi['Tahun'] == payback_tahun]['Dengan PV'].iloc[0]
-        fig_proj.add_scatter(
-            x=[payback_tahun], y=[payback_cost], 
-            mode='markers', marker=dict(size=10, color='#3498db'),
-            name='Masa Balik Modal', showlegend=False
-        )
-    
-    st.plotly_chart(fig_proj, use_container_width=True)
+    if tab2.open:
+        st.subheader(f"Proyeksi Biaya Listrik Kumulatif Selama {TAHUN_ANALISIS} Tahun")
+        st.plotly_chart(skenario.fig_proj, use_container_width=True)
 
-    st.markdown(f"""
-    * **Asumsi:** Kenaikan tarif listrik sebesar {ASUMSI_INFLASI_LISTRIK*100}% per tahun.
-    * **Total Hemat Setelah {TAHUN_ANALISIS} Tahun:** {format_rupiah(total_biaya_tanpa_pv - total_biaya_dengan_pv)}
-    """)
+        st.markdown(f"""
+        * **Asumsi:** Kenaikan tarif listrik sebesar {ASUMSI_INFLASI_LISTRIK*100}% per tahun.
+        * **Total Hemat Setelah {TAHUN_ANALISIS} Tahun:** {format_rupiah(hasil.total_hemat)}
+        """)
+        profil.payload('fig_proj', skenario.fig_proj)
+        profil.tandai('tab_proyeksi')
+
+        # --- MODE KETIDAKPASTIAN (lihat monte_carlo.py) ---
+        if st.toggle("🎲 Mode Ketidakpastian (Monte Carlo)", key='mode_monte_carlo',
+                     help="Sampel acak inflasi tarif, biaya instalasi, degradasi modul dan variasi yield tahunan."):
+            c_mc1, c_mc2 = st.columns(2)
+            jumlah_sampel = c_mc1.select_slider("Jumlah Sampel", [10_000, 100_000, 200_000, 500_000],
+                                                value=100_000, key='mc_sampel')
+            seed_mc = c_mc2.number_input("Seed", min_value=0, value=ParameterMonteCarlo.seed, step=1, key='mc_seed')
+
+            historis = load_rasio_yield(penanda_gudang(), situs.lintang, situs.bujur)
+            hasil_mc = load_monte_carlo(
+                input_skenario.tagihan_bulanan, hasil.produksi_pv_bulanan, hasil.kapasitas_pv_wp,
+                jumlah_sampel, int(seed_mc), None if historis is None else tuple(historis['rasio'].tolist())
+            )
+
+            pb10, pb50, pb90 = hasil_mc.persentil_payback()
+            npv10, npv50, npv90 = hasil_mc.persentil_npv()
+            tampil_pb = lambda t: f"{t:.1f} Tahun" if np.isfinite(t) else f"> {TAHUN_ANALISIS} Tahun"
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Masa Balik Modal P10", tampil_pb(pb10))
+            m2.metric("Masa Balik Modal P50", tampil_pb(pb50))
+            m3.metric("Masa Balik Modal P90", tampil_pb(pb90))
+            m1.metric("NPV P10", format_rupiah(npv10))
+            m2.metric("NPV P50", format_rupiah(npv50))
+            m3.metric("NPV P90", format_rupiah(npv90))
+
+            fig_mc = fig_kipas(hasil_mc)
+            st.plotly_chart(fig_mc, use_container_width=True)
+            profil.payload('fig_kipas', fig_mc)
+            sumber_yield = hasil_mc.sumber_yield
+            if historis is not None:
+                sumber_yield += f", {historis['nama']} ({historis['jarak']:.0f} km)"
+            st.caption(
+                f"{jumlah_sampel:,} sampel (seed {int(seed_mc)}) • peluang balik modal dalam "
+                f"{TAHUN_ANALISIS} tahun: {hasil_mc.peluang_impas:.1%} • variasi yield: {sumber_yield} • "
+                f"Pxx = persentil ke-xx dari seluruh sampel."
+            )
+            profil.tandai('monte_carlo')
+
+        # --- MODEL ARUS KAS LENGKAP (lihat keuangan.py) ---
+        with st.expander("📑 Analisis Arus Kas Lengkap (NPV, IRR, LCOE)"):
+            c_k1, c_k2, c_k3 = st.columns(3)
+            daya_va = c_k1.selectbox("Daya Tersambung PLN (VA)", DAYA_TERSAMBUNG_VA, index=3, key='daya_va')
+            subsidi = c_k1.checkbox("Pelanggan subsidi (900 VA)", key='tarif_subsidi', disabled=daya_va != 900)
+            horizon = c_k1.slider("Horizon (tahun)", 5, 30, 25, key='horizon_keuangan')
+            diskonto = c_k2.number_input("Tingkat Diskonto (%/tahun)", 0.0, 30.0, ParameterKeuangan.diskonto * 100, 0.5, key='diskonto') / 100
+            degradasi = c_k2.number_input("Degradasi Modul (%/tahun)", 0.0, 3.0, ParameterKeuangan.degradasi * 100, 0.1, key='degradasi') / 100
+            om_per_kwp = c_k2.number_input("O&M (Rp/kWp/tahun)", 0, 1_000_000, ParameterKeuangan.om_per_kwp_tahun, 10_000, key='om_per_kwp')
+            umur_inverter = c_k3.number_input("Umur Inverter (tahun, 0 = abaikan)", 0, 30, ParameterKeuangan.umur_inverter, key='umur_inverter')
+            biaya_inverter = c_k3.number_input("Biaya Inverter (Rp/Wp)", 0, 10_000, ParameterKeuangan.biaya_inverter_per_wp, 100, key='biaya_inverter')
+
+            golongan = golongan_tarif(daya_va, subsidi)
+            param_keu = ParameterKeuangan(
+                tahun=horizon, diskonto=diskonto, degradasi=degradasi, om_per_kwp_tahun=om_per_kwp,
+                umur_inverter=int(umur_inverter), biaya_inverter_per_wp=biaya_inverter
+            )
+            hasil_keu = analisis_keuangan(input_skenario.tagihan_bulanan, hasil.produksi_pv_bulanan,
+                                          hasil.kapasitas_pv_wp, golongan.tarif, param_keu)
+            tampil_thn = lambda t: f"{t:.1f} Tahun" if np.isfinite(t) else f"> {horizon} Tahun"
+
+            f1, f2, f3, f4, f5 = st.columns(5)
+            f1.metric("NPV", format_rupiah(float(hasil_keu.npv)))
+            f2.metric("IRR", f"{float(hasil_keu.irr):.1%}" if np.isfinite(hasil_keu.irr) else "-")
+            f3.metric("LCOE", f"Rp {float(hasil_keu.lcoe):,.0f}/kWh")
+            f4.metric("Balik Modal", tampil_thn(float(hasil_keu.payback_tahun)))
+            f5.metric("Balik Modal (Diskonto)", tampil_thn(float(hasil_keu.payback_diskonto_tahun)))
+            fig_keu = fig_arus_kas(hasil_keu)
+            st.plotly_chart(fig_keu, use_container_width=True)
+            st.caption(f"Golongan {golongan.kode}: Rp {golongan.tarif:,.2f}/kWh (naik {param_keu.inflasi_tarif:.0%}/tahun) • "
+                       f"arus kas bulanan selama {horizon} tahun.")
+            profil.payload('fig_arus_kas', fig_keu)
+        profil.tandai('arus_kas')
 
 # GRAFIK 3 (BARU): Profil Produksi Energi (Simulasi Musiman)
 
 with tab3:
-    st.subheader(f"Estimasi Produksi Energi Bulanan di {provinsi_pilihan}")
-    
-    # --- 1. LOGIKA ZONASI MUSIM ---
-    def get_pola_musim(nama_prov):
-        nama = nama_prov.lower()
-        
-        # ZONA 1: TIPE MONSUN (Jawa, Bali, Nusa Tenggara)
-        if any(x in nama for x in ['jawa', 'jakarta', 'banten', 'yogyakarta', 'bali', 'nusa']):
-            st.caption("ℹ️ Pola Musim: Monsun (Puncak kemarau di pertengahan tahun).")
-            return [0.80, 0.85, 0.90, 0.98, 1.05, 1.10, 1.15, 1.18, 1.12, 1.02, 0.90, 0.85]
-            
-        # ZONA 2: TIPE KHATULISTIWA (Sumatra, Kalimantan, Sulawesi, Papua, dll)
-        else:
-            st.caption("ℹ️ Pola Musim: Khatulistiwa (Cenderung stabil sepanjang tahun).")
-            return [0.95, 0.98, 1.05, 1.02, 0.98, 0.96, 0.98, 1.02, 1.05, 1.02, 0.98, 0.96]
-
-    faktor_musim = get_pola_musim(provinsi_pilihan)
-    
-    bulan_list = ['Jan', 'Feb', 'Mar', 'Apr', 'Mei', 'Jun', 'Jul', 'Agu', 'Sep', 'Okt', 'Nov', 'Des']
-    days_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-    
-    produksi_bulanan_simulasi = []
+    if tab3.open:
+        st.subheader(f"Estimasi Produksi Energi Bulanan di {provinsi_pilihan}")
     
-    for i in range(12):
-        prod = produksi_pv_harian * days_in_month[i] * faktor_musim[i]
-        produksi_bulanan_simulasi.append(prod)
-        
-    df_monthly = pd.DataFrame({
-        'Bulan': bulan_list,
-        'Produksi (kWh)': produksi_bulanan_simulasi
-    })
-    
-    # --- 2. MEMBUAT GRAFIK (CLEAN - TANPA GARIS MENGGANGGU) ---
-    warna_bar = '#e74c3c' if max(faktor_musim) > 1.10 else '#f39c12'
+        # --- 1. POLA MUSIM (lihat referensi.ReferensiSitus.klimatologi) ---
+        st.caption(KETERANGAN_MUSIM[hasil.zona_musim])
+        if klimatologi.dari_seri and profil_jam is None:
+            st.caption(f"Sumber klimatologi: {referensi.situs(klimatologi.sumber).nama} ({klimatologi.jarak_km:.0f} km)")
+        elif profil_jam is None:
+            st.caption(f"Sumber pola musim: zona provinsi (tidak ada data per jam NASA POWER "
+                       f"dalam {JARAK_MAKS_KLIMATOLOGI_KM:.0f} km)")
     
-    fig_monthly = px.bar(
-        df_monthly, 
-        x='Bulan', 
-        y='Produksi (kWh)',
-        text_auto='.0f',
-        title=f"Profil Energi Bulanan - {provinsi_pilihan}",
-        color_discrete_sequence=[warna_bar]
-    )
-    
-    # UPDATE: Menghapus 'hovermode="x unified"' agar garis hilang
-    fig_monthly.update_layout(
-        yaxis_title="Energi (kWh)",
-        xaxis_title="",
-        bargap=0.3,
-        plot_bgcolor='rgba(0,0,0,0)'
-    )
+        # --- 2. GRAFIK (lihat grafik.TampilanSkenario.fig_monthly) ---
+        st.plotly_chart(skenario.fig_monthly, use_container_width=True)
+        profil.payload('fig_monthly', skenario.fig_monthly)
     
-    # Kita juga menghapus panah anotasi (Peak) agar bersih total
-
-    st.plotly_chart(fig_monthly, use_container_width=True)
-    
-    # Ringkasan Bawah
-    c1, c2 = st.columns(2)
-    c1.metric("Total Produksi Setahun", f"{sum(produksi_bulanan_simulasi)/1000:.2f} MWh")
-    c2.metric("Variabilitas Musim", "Tinggi" if max(faktor_musim) > 1.10 else "Stabil")
+        # Ringkasan Bawah
+        c1, c2 = st.columns(2)
+        c1.metric("Total Produksi Setahun", f"{sum(hasil.produksi_bulanan_simulasi)/1000:.2f} MWh")
+        c2.metric("Variabilitas Musim", "Tinggi" if skenario.musim_tinggi else "Stabil")
+        profil.tandai('tab_produksi')
 
 # GRAFIK 4: Analisis Emisi (Donut)
 with tab4:
-    st.subheader("Total Pengurangan Jejak Karbon (CO₂)")
+    if tab4.open:
+        st.subheader("Total Pengurangan Jejak Karbon (CO₂)")
     
-    c_don, c_txt = st.columns([1.5, 1])
+        c_don, c_txt = st.columns([1.5, 1])
     
-    with c_don:
-        labels = ['Dicegah (PV)', 'Sisa (PLN)']
-        values = [emisi_dicegah_grafik, emisi_tersisa_pln]
-        colors = ['#2ecc71', '#bdc3c7']
-        
-        fig_donut = go.Figure(data=[go.Pie(
-            labels=labels, 
-            values=values, 
-            hole=.6, 
-            marker_colors=colors,
-            hoverinfo="label+value+percent",
-            textinfo='percent'
-        )])
-        
-        fig_donut.update_layout(
-            annotations=[dict(text=f"{skor_kemandirian:.0f}%", x=0.5, y=0.5, font_size=20, showarrow=False)],
-            showlegend=True,
-            legend=dict(orientation="h", yanchor="bottom", y=-0.2, xanchor="center", x=0.5)
-        )
-        st.plotly_chart(fig_donut, use_container_width=True)
+        with c_don:
+            st.plotly_chart(skenario.fig_donut, use_container_width=True)
+            profil.payload('fig_donut', skenario.fig_donut)
     
-    with c_txt:
-        st.info(f"Dengan PV, Anda berhasil mengurangi emisi sebesar **{emisi_dicegah_grafik:.1f} kg CO₂** dari konsumsi rumah Anda.")
-        st.markdown(f"""
-        **Setara dengan:**
-        \n🌳 Menanam **{int(emisi_dicegah_total/20)} pohon**
-        \n🚗 Menghapus **{int(emisi_dicegah_total*5)} km** perjalanan mobil
-        """)
+        with c_txt:
+            st.info(f"Dengan PV, Anda berhasil mengurangi emisi sebesar **{hasil.emisi_dicegah_grafik:.1f} kg CO₂** dari konsumsi rumah Anda.")
+            st.markdown(f"""
+            **Setara dengan:**
+            \n🌳 Menanam **{int(hasil.emisi_dicegah_total/20)} pohon**
+            \n🚗 Menghapus **{int(hasil.emisi_dicegah_total*5)} km** perjalanan mobil
+            """)
+        profil.tandai('tab_lingkungan')
 
 # TAB 5: Detail Teknis
 with tab5:
-    col_tech1, col_tech2 = st.columns(2)
+    if tab5.open:
+        col_tech1, col_tech2 = st.columns(2)
     
-    with col_tech1:
-        st.markdown("### ⚙️ Sistem & Energi")
-        st.markdown("Ringkasan teknis instalasi dan produksi energi.")
-        st.write("---")
-        
-        data_sistem = pd.DataFrame({
-            "Keterangan": ["Kapasitas PV Total", "Jumlah Modul", "Kapasitas 1 Modul", "Produksi Energi Bulanan"],
-            "Nilai": [f"{kapasitas_pv_kwp:.2f} kWp", f"{jumlah_modul} unit", f"{wp_pilihan} Wp", f"{produksi_pv_bulanan:.2f} kWh"]
-        }).set_index('Keterangan')
-        st.table(data_sistem)
-        
-    with col_tech2:
-        st.markdown("### 💸 Finansial & Dampak")
-        st.markdown("Rincian hitungan biaya dan manfaat lingkungan.")
-        st.write("---")
+        with col_tech1:
+            st.markdown("### ⚙️ Sistem & Energi")
+            st.markdown("Ringkasan teknis instalasi dan produksi energi.")
+            st.write("---")
+            st.table(skenario.data_sistem)
         
-        data_finansial = pd.DataFrame({
-            "Keterangan": ["Biaya Instalasi Awal", "Tagihan Bulanan Baru", "Penghematan Bulanan", "Masa Balik Modal", f"Total Emisi Dicegah ({TAHUN_ANALISIS} Thn)"],
-            "Nilai": [format_rupiah(biaya_instalasi_pv), format_rupiah(tagihan_baru), format_rupiah(penghematan_rp), payback_display, f"{emisi_total_ton:.1f} ton CO₂"]
-        }).set_index('Keterangan')
-        st.table(data_finansial)
\ No newline at end of file
+        with col_tech2:
+            st.markdown("### 💸 Finansial & Dampak")
+            st.markdown("Rincian hitungan biaya dan manfaat lingkungan.")
+            st.write("---")
+            st.table(skenario.data_finansial)
+        profil.payload('tabel_sistem', skenario.data_sistem)
+        profil.payload('tabel_finansial', skenario.data_finansial)
+
+        statistik_cache = cache_skenario().statistik()
+        st.caption(
+            f"Cache skenario: {statistik_cache['hit']} hit / {statistik_cache['miss']} miss "
+            f"({statistik_cache['ukuran']}/{statistik_cache['kapasitas']} entri)"
+        )
+
+        # Laporan statis: di-render di proses terpisah dan di-cache per skenario (lihat ekspor.py)
+        st.markdown("### 📄 Unduh Laporan")
+        # Fragmen memantau render yang masih berjalan tiap detik tanpa memblokir sesi
+        menunggu = any(not f.done() for f in st.session_state.get('antrean_laporan', {}).values())
+        st.fragment(run_every=1 if menunggu else None)(bagian_laporan)(
+            input_skenario, f"laporan_pv_{provinsi_pilihan.replace(' ', '_')}", menunggu
+        )
+        profil.tandai('tab_teknis')
+
+profil.selesai()
@@ -0,0 +1,581 @@
+"""Penyimpanan data referensi lokasi (provinsi, kabupaten, titik koordinat).
+
+Satu versi dataset adalah satu direktori berisi file `.npy` yang sudah
+dinormalisasi dan divalidasi saat dibangun:
+
+    manifest.json           versi format & dataset, jumlah situs, checksum file
+    situs.npy               tabel situs (structured array: nama, koordinat, yield, emisi)
+    nama_kunci.npy          nama ternormalisasi terurut  -> pencarian nama biner
+    nama_urutan.npy         posisi situs untuk tiap kunci terurut
+    grid_*.npy              indeks grid lintang/bujur    -> pencarian situs terdekat
+    klimatologi.npy         12 faktor musim bulanan per situs dari seri berseri terdekat
+                            (hanya jika dalam `JARAK_MAKS_KLIMATOLOGI_KM`)
+    seri_waktu.npy          sumbu waktu per jam bersama (datetime64[h] sebagai int64)
+    seri_<KOLOM>.npy        seri per jam NASA POWER, bentuk (situs berseri, jam)
+
+Semua file dibuka dengan `mmap_mode='r'`, jadi membuka dataset berisi ribuan
+situs tidak membaca isinya; memilih lokasi hanya menyentuh beberapa baris.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from engine import FILE_DATA, FILE_NASA, ZONA_DATA_PER_JAM, baca_baris_provinsi, pola_musim
+from nasa_power import DIR_CACHE, DataNasaPower, MetadataNasaPower, baca_nasa_power
+
+FORMAT_VERSI = 4
+FILE_KOORDINAT = 'koordinat_provinsi.csv'
+DIR_REFERENSI = DIR_CACHE.parent / 'referensi'
+DIR_ASET = Path(__file__).resolve().parent / 'aset' / 'referensi'   # dataset bawaan yang ikut di repo
+UKURAN_SEL_DERAJAT = 0.5
+KM_PER_DERAJAT = 111.195
+JARI_BUMI_KM = 6371.0088
+PANJANG_NAMA = 64
+CINCIN_SEBELUM_PENUH = 8    # setelah sekian cincin kosong, cari ke seluruh situs
+JARAK_MAKS_KLIMATOLOGI_KM = 300.0   # lebih jauh dari ini pola musim zona provinsi lebih mewakili
+
+DTYPE_SITUS = np.dtype([
+    ('nama', f'U{PANJANG_NAMA}'),
+    ('tingkat', 'U16'),
+    ('lintang', 'f8'),
+    ('bujur', 'f8'),
+    ('radiasi', 'f8'),      # kWh/kWp/hari
+    ('emisi', 'f8'),        # kg CO2/kWh
+    ('seri', 'i4'),         # baris di seri_<KOLOM>.npy, -1 jika tanpa seri per jam
+])
+
+DTYPE_KLIMATOLOGI = np.dtype([
+    ('faktor', 'f8', (12,)),  # produksi harian rata-rata per bulan / rata-rata tahunan
+    ('sumber', 'i4'),         # situs berseri asal data, -1 = pola zona (tanpa seri dalam jarak maksimum)
+    ('jarak_km', 'f8'),
+    ('zona', 'U16'),          # ZONA_DATA_PER_JAM atau nama zona `engine.pola_musim`
+])
+
+
+class GalatReferensi(ValueError):
+    """Dataset referensi tidak valid, rusak, atau berbeda versi format."""
+
+
+@dataclass(frozen=True)
+class Situs:
+    """Satu lokasi dari dataset referensi."""
+    indeks: int
+    nama: str
+    tingkat: str
+    lintang: float
+    bujur: float
+    radiasi: float
+    emisi: float
+    seri: int
+
+    @property
+    def punya_seri(self):
+        return self.seri >= 0
+
+
+@dataclass(frozen=True)
+class Klimatologi:
+    """Faktor musim bulanan sebuah situs beserta situs berseri asal datanya."""
+    faktor: tuple
+    sumber: int
+    jarak_km: float
+    zona: str
+
+    @property
+    def dari_seri(self):
+        return self.sumber >= 0
+
+
+def kunci_nama(nama):
+    """Nama ternormalisasi untuk pencarian: spasi dirapikan dan huruf kecil."""
+    return ' '.join(str(nama).split()).casefold()
+
+
+def jarak_km(lintang1, bujur1, lintang2, bujur2):
+    """Jarak great-circle (haversine) dalam km; argumen boleh array."""
+    p1, p2 = np.radians(lintang1), np.radians(lintang2)
+    dp = p2 - p1
+    dl = np.radians(np.asarray(bujur2) - np.asarray(bujur1))
+    a = np.sin(dp / 2) ** 2 + np.cos(p1) * np.cos(p2) * np.sin(dl / 2) ** 2
+    return 2 * JARI_BUMI_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+# --- INDEKS GRID LINTANG/BUJUR ---
+
+class IndeksGrid:
+    """Situs dikelompokkan per sel grid `ukuran` derajat; pencarian memeriksa sel melingkar."""
+
+    def __init__(self, ukuran, kunci, awal, urutan):
+        self.ukuran = ukuran
+        self.kunci = kunci          # kunci sel unik terurut
+        self.awal = awal            # offset tiap sel di `urutan` (len = sel + 1)
+        self.urutan = urutan        # indeks situs terurut per sel
+        self.n_baris = int(math.ceil(180 / ukuran)) + 1
+        self.n_kolom = int(math.ceil(360 / ukuran))
+
+    @classmethod
+    def bangun(cls, lintang, bujur, indeks_situs, ukuran=UKURAN_SEL_DERAJAT):
+        grid = cls(ukuran, None, None, None)
+        kunci = grid._kunci_sel(*grid._sel(np.asarray(lintang), np.asarray(bujur)))
+        urut = np.argsort(kunci, kind='stable')
+        unik, awal = np.unique(kunci[urut], return_index=True)
+        grid.kunci = unik.astype(np.int64)
+        grid.awal = np.append(awal, len(kunci)).astype(np.int64)
+        grid.urutan = np.asarray(indeks_situs, dtype=np.int64)[urut]
+        return grid
+
+    def _sel(self, lintang, bujur):
+        baris = np.floor((lintang + 90) / self.ukuran).astype(np.int64)
+        kolom = np.floor((np.mod(bujur + 180, 360)) / self.ukuran).astype(np.int64) % self.n_kolom
+        return baris, kolom
+
+    def _kunci_sel(self, baris, kolom):
+        return baris * self.n_kolom + kolom
+
+    def _isi_sel(self, kunci):
+        """Indeks situs di dalam sekumpulan sel."""
+        pos = np.searchsorted(self.kunci, kunci)
+        ada = pos < len(self.kunci)
+        pos, kunci = pos[ada], kunci[ada]
+        pos = pos[self.kunci[pos] == kunci]
+        if not len(pos):
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self.urutan[self.awal[p]:self.awal[p + 1]] for p in pos])
+
+    def _cincin(self, baris0, kolom0, r):
+        if r == 0:
+            baris, kolom = np.array([baris0]), np.array([kolom0])
+        else:
+            d = np.arange(-r, r + 1)
+            baris = np.concatenate([np.full(len(d), -r), np.full(len(d), r), d[1:-1], d[1:-1]]) + baris0
+            kolom = np.concatenate([d, d, np.full(len(d) - 2, -r), np.full(len(d) - 2, r)]) + kolom0
+        sah = (baris >= 0) & (baris < self.n_baris)
+        return np.unique(self._kunci_sel(baris[sah], kolom[sah] % self.n_kolom))
+
+    def terdekat(self, lintang, bujur, koordinat):
+        """(indeks situs, jarak km) terdekat; `koordinat` = (array lintang, array bujur) semua situs."""
+        if not len(self.urutan):
+            raise GalatReferensi("Indeks grid kosong")
+        semua_lintang, semua_bujur = koordinat
+        baris0, kolom0 = (int(v) for v in self._sel(np.float64(lintang), np.float64(bujur)))
+
+        terbaik, jarak_terbaik = -1, np.inf
+        for r in range(max(self.n_baris, self.n_kolom)):
+            # Situs di cincin r berjarak minimal (r - 1) sel dari titik pada salah satu sumbu
+            if r > 0:
+                batas_derajat = (r - 1) * self.ukuran
+                lintang_jauh = min(90.0, abs(lintang) + (r + 1) * self.ukuran)
+                batas_km = batas_derajat * KM_PER_DERAJAT * min(1.0, math.cos(math.radians(lintang_jauh)))
+                if jarak_terbaik <= batas_km:
+                    break
+            if terbaik < 0 and r >= CINCIN_SEBELUM_PENUH:
+                kandidat = self.urutan          # titik jauh dari semua situs: periksa semuanya
+            else:
+                kandidat = self._isi_sel(self._cincin(baris0, kolom0, r))
+            if len(kandidat):
+                jarak = jarak_km(lintang, bujur, semua_lintang[kandidat], semua_bujur[kandidat])
+                i = int(np.argmin(jarak))
+                if jarak[i] < jarak_terbaik:
+                    terbaik, jarak_terbaik = int(kandidat[i]), float(jarak[i])
+            if kandidat is self.urutan:
+                break
+        return terbaik, jarak_terbaik
+
+    def simpan(self, direktori, awalan):
+        for nama in ('kunci', 'awal', 'urutan'):
+            np.save(direktori / f'{awalan}_{nama}.npy', getattr(self, nama))
+
+    @classmethod
+    def muat(cls, direktori, awalan, ukuran):
+        return cls(ukuran, *(np.load(direktori / f'{awalan}_{nama}.npy', mmap_mode='r')
+                             for nama in ('kunci', 'awal', 'urutan')))
+
+
+# --- MEMBANGUN DATASET ---
+
+def _validasi_situs(situs):
+    if not len(situs):
+        raise GalatReferensi("Dataset tidak berisi situs")
+    galat = []
+    for i, s in enumerate(situs):
+        if not s['nama'].strip():
+            galat.append(f"baris {i}: nama kosong")
+        elif len(s['nama']) > PANJANG_NAMA:
+            galat.append(f"baris {i}: nama lebih dari {PANJANG_NAMA} karakter")
+        if not (-90 <= s['lintang'] <= 90 and -180 <= s['bujur'] <= 180):
+            galat.append(f"{s['nama']}: koordinat di luar jangkauan ({s['lintang']}, {s['bujur']})")
+        if not (np.isfinite(s['radiasi']) and s['radiasi'] > 0):
+            galat.append(f"{s['nama']}: produksi harian harus > 0")
+        if not (np.isfinite(s['emisi']) and s['emisi'] >= 0):
+            galat.append(f"{s['nama']}: faktor emisi harus >= 0")
+    kunci = [kunci_nama(s['nama']) for s in situs]
+    ganda = sorted({k for k in kunci if kunci.count(k) > 1}) if len(set(kunci)) != len(kunci) else []
+    if ganda:
+        galat.append(f"nama ganda (beri nama unik, mis. 'Kab. X, Provinsi'): {', '.join(ganda[:5])}")
+    if galat:
+        raise GalatReferensi("Dataset tidak valid:\n  " + "\n  ".join(galat[:20]))
+
+
+def _hash_file(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            h.update(blok)
+    return h.hexdigest()
+
+
+def _klimatologi(tabel, seri, grid_seri, jarak_maks=JARAK_MAKS_KLIMATOLOGI_KM):
+    """Tabel faktor musim per situs: pola bulanan seri per jam terdekat (dihitung sekali per seri).
+
+    Situs tanpa seri dalam `jarak_maks` km memakai pola zona `engine.pola_musim` dengan
+    `sumber=-1`, jadi setiap situs punya baris siap pakai.
+    """
+    from simulasi_pv import profil_lokasi
+
+    hasil = np.zeros(len(tabel), dtype=DTYPE_KLIMATOLOGI)
+    for i, nama in enumerate(tabel['nama']):
+        zona, faktor = pola_musim(str(nama))
+        hasil[i] = (faktor, -1, np.nan, zona)
+    if not seri:
+        return hasil
+    faktor_seri = np.array([profil_lokasi(d)[1] for d in seri])
+    koordinat = (tabel['lintang'], tabel['bujur'])
+    for i in range(len(tabel)):
+        sumber, jarak = grid_seri.terdekat(tabel['lintang'][i], tabel['bujur'][i], koordinat)
+        if jarak <= jarak_maks:
+            hasil[i] = (faktor_seri[tabel['seri'][sumber]], sumber, jarak, ZONA_DATA_PER_JAM)
+    return hasil
+
+
+def bangun_referensi(tujuan, situs, seri=(), versi='1', sumber=None, ukuran_sel=UKURAN_SEL_DERAJAT):
+    """Validasi dan tulis dataset ke direktori `tujuan` (atomik); kembalikan path-nya.
+
+    `situs` adalah list dict berkunci nama, tingkat, lintang, bujur, radiasi,
+    emisi dan opsional `seri` (indeks ke list `seri` berisi `DataNasaPower`).
+    """
+    tujuan = Path(tujuan)
+    situs = [dict(s) for s in situs]
+    for s in situs:
+        s.setdefault('tingkat', '')
+        s['seri'] = -1 if s.get('seri') is None else int(s['seri'])
+        for k in ('lintang', 'bujur', 'radiasi', 'emisi'):
+            s[k] = float(s[k])
+    _validasi_situs(situs)
+
+    seri = list(seri)
+    if any(not -1 <= s['seri'] < len(seri) for s in situs):
+        raise GalatReferensi("Indeks seri situs di luar jangkauan")
+    if seri and any(not np.array_equal(d.waktu, seri[0].waktu) for d in seri[1:]):
+        raise GalatReferensi("Semua seri per jam harus memiliki sumbu waktu yang sama")
+    kolom_seri = sorted(set.intersection(*(set(d.kolom) for d in seri))) if seri else []
+
+    sementara = tujuan.with_name(f'.{tujuan.name}.{os.getpid()}.tmp')
+    shutil.rmtree(sementara, ignore_errors=True)
+    sementara.mkdir(parents=True)
+
+    tabel = np.array([tuple(s[k] for k in DTYPE_SITUS.names) for s in situs], dtype=DTYPE_SITUS)
+    np.save(sementara / 'situs.npy', tabel)
+
+    kunci = np.array([kunci_nama(n) for n in tabel['nama']], dtype=f'U{PANJANG_NAMA}')
+    urut = np.argsort(kunci, kind='stable')
+    np.save(sementara / 'nama_kunci.npy', kunci[urut])
+    np.save(sementara / 'nama_urutan.npy', urut.astype(np.int64))
+
+    semua = np.arange(len(tabel))
+    IndeksGrid.bangun(tabel['lintang'], tabel['bujur'], semua, ukuran_sel).simpan(sementara, 'grid_semua')
+    berseri = semua[tabel['seri'] >= 0]
+    grid_seri = IndeksGrid.bangun(tabel['lintang'][berseri], tabel['bujur'][berseri], berseri, ukuran_sel)
+    grid_seri.simpan(sementara, 'grid_seri')
+    np.save(sementara / 'klimatologi.npy', _klimatologi(tabel, seri, grid_seri))
+
+    if seri:
+        np.save(sementara / 'seri_waktu.npy', seri[0].waktu.astype(np.int64))
+        for nama in kolom_seri:
+            np.save(sementara / f'seri_{nama}.npy', np.stack([d[nama] for d in seri]).astype(np.float64))
+
+    manifest = {
+        'format_versi': FORMAT_VERSI,
+        'versi': str(versi),
+        'dibuat': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'jumlah_situs': len(tabel),
+        'ukuran_sel_derajat': ukuran_sel,
+        'kolom_seri': kolom_seri,
+        'metadata_seri': [
+            {k: v for k, v in vars(d.metadata).items() if k != 'baris_header'} for d in seri
+        ],
+        'sumber': sumber or {},
+        'checksum': {p.name: _hash_file(p) for p in sorted(sementara.glob('*.npy'))},
+    }
+    (sementara / 'manifest.json').write_text(json.dumps(manifest, indent=1, ensure_ascii=False))
+
+    if tujuan.exists():
+        shutil.rmtree(sementara)
+        raise GalatReferensi(f"Dataset {tujuan} sudah ada; gunakan versi baru")
+    tujuan.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(sementara, tujuan)
+    return tujuan
+
+
+# --- MEMBACA DATASET ---
+
+class ReferensiSitus:
+    """Dataset referensi yang dibuka secara memory-mapped."""
+
+    def __init__(self, direktori, verifikasi=False):
+        self.direktori = Path(direktori)
+        path_manifest = self.direktori / 'manifest.json'
+        if not path_manifest.exists():
+            raise GalatReferensi(f"Bukan dataset referensi: {self.direktori}")
+        self.manifest = json.loads(path_manifest.read_text())
+        if self.manifest.get('format_versi') != FORMAT_VERSI:
+            raise GalatReferensi(
+                f"Format dataset v{self.manifest.get('format_versi')} tidak didukung (butuh v{FORMAT_VERSI})"
+            )
+        if verifikasi:
+            for nama, hash_tercatat in self.manifest['checksum'].items():
+                if _hash_file(self.direktori / nama) != hash_tercatat:
+                    raise GalatReferensi(f"Checksum {nama} tidak cocok: dataset rusak")
+
+        muat = lambda nama: np.load(self.direktori / nama, mmap_mode='r')
+        self.tabel = muat('situs.npy')
+        if self.tabel.dtype != DTYPE_SITUS or len(self.tabel) != self.manifest['jumlah_situs']:
+            raise GalatReferensi("situs.npy tidak sesuai manifest")
+        self._nama_kunci = muat('nama_kunci.npy')
+        self._nama_urutan = muat('nama_urutan.npy')
+        ukuran = self.manifest['ukuran_sel_derajat']
+        self._grid = {
+            False: IndeksGrid.muat(self.direktori, 'grid_semua', ukuran),
+            True: IndeksGrid.muat(self.direktori, 'grid_seri', ukuran),
+        }
+        self._klimatologi = muat('klimatologi.npy')
+        self._seri = {nama: muat(f'seri_{nama}.npy') for nama in self.manifest['kolom_seri']}
+        self._waktu = muat('seri_waktu.npy') if self._seri else None
+
+    @property
+    def versi(self):
+        return self.manifest['versi']
+
+    def __len__(self):
+        return len(self.tabel)
+
+    def situs(self, i):
+        baris = self.tabel[i]
+        return Situs(int(i), str(baris['nama']), str(baris['tingkat']), float(baris['lintang']),
+                     float(baris['bujur']), float(baris['radiasi']), float(baris['emisi']), int(baris['seri']))
+
+    def nama(self, tingkat=None):
+        """Nama situs sesuai urutan dataset, opsional hanya satu tingkat (mis. 'provinsi')."""
+        nama = self.tabel['nama']
+        if tingkat is not None:
+            nama = nama[self.tabel['tingkat'] == tingkat]
+        return nama.tolist()
+
+    def cari(self, nama):
+        """Indeks situs berdasarkan nama (tanpa membedakan huruf besar/kecil)."""
+        kunci = kunci_nama(nama)
+        pos = int(np.searchsorted(self._nama_kunci, kunci))
+        if pos >= len(self._nama_kunci) or self._nama_kunci[pos] != kunci:
+            raise KeyError(f"Lokasi tidak ditemukan: {nama}")
+        return int(self._nama_urutan[pos])
+
+    def terdekat(self, lintang, bujur, hanya_berseri=False, jarak_maks=None):
+        """(indeks situs, jarak km) terdekat dari sebuah koordinat; None jika lebih jauh dari `jarak_maks` km."""
+        indeks, jarak = self._grid[hanya_berseri].terdekat(
+            lintang, bujur, (self.tabel['lintang'], self.tabel['bujur'])
+        )
+        if jarak_maks is not None and jarak > jarak_maks:
+            return None
+        return indeks, jarak
+
+    def klimatologi(self, i):
+        """Faktor musim bulanan situs `i` (precomputed): dari seri per jam terdekat atau pola zona."""
+        baris = self._klimatologi[i]
+        return Klimatologi(tuple(baris['faktor'].tolist()), int(baris['sumber']), float(baris['jarak_km']),
+                           str(baris['zona']))
+
+    def seri(self, i):
+        """Seri per jam situs `i` sebagai `DataNasaPower` (kolom tetap memory-mapped)."""
+        j = int(self.tabel['seri'][i])
+        if j < 0:
+            raise KeyError(f"Situs {self.tabel['nama'][i]} tidak memiliki seri per jam")
+        meta = self.manifest['metadata_seri'][j]
+        return DataNasaPower(
+            MetadataNasaPower(**meta, baris_header=0),
+            self._waktu.astype('datetime64[h]'),
+            {nama: nilai[j] for nama, nilai in self._seri.items()},
+        )
+
+
+def daftar_versi(akar=DIR_REFERENSI):
+    """Versi dataset yang tersedia di `akar`, dari yang terlama."""
+    akar = Path(akar)
+    if not akar.exists():
+        return []
+    urutan = []
+    for p in akar.iterdir():
+        path_manifest = p / 'manifest.json'
+        if not path_manifest.exists():
+            continue
+        try:
+            dibuat = json.loads(path_manifest.read_text()).get('dibuat', '')
+        except ValueError:
+            dibuat = ''
+        # 'dibuat' ikut ke salinan dataset; mtime hanya pemecah seri (resolusi detik)
+        urutan.append((dibuat, path_manifest.stat().st_mtime, p.name))
+    return [nama for *_, nama in sorted(urutan)]
+
+
+def buka_referensi(akar=DIR_REFERENSI, versi=None, verifikasi=False):
+    """Buka satu versi dataset (default: yang terbaru)."""
+    if versi is None:
+        tersedia = daftar_versi(akar)
+        if not tersedia:
+            raise GalatReferensi(f"Belum ada dataset referensi di {akar}")
+        versi = tersedia[-1]
+    return ReferensiSitus(Path(akar) / versi, verifikasi)
+
+
+# --- DATASET BAWAAN (CSV PROVINSI + KOORDINAT + NASA POWER) ---
+
+def baca_koordinat(file_path):
+    """Kunci nama provinsi -> (lintang, bujur) dari CSV koordinat ibu kota."""
+    import csv
+
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        return {kunci_nama(b['Provinsi']): (float(b['Lintang']), float(b['Bujur'])) for b in csv.DictReader(f)}
+
+
+def situs_dari_sumber(file_provinsi, file_koordinat, file_nasa=()):
+    """Bangun list situs + seri dari CSV provinsi, koordinat dan file NASA POWER."""
+    from simulasi_pv import profil_lokasi
+
+    koordinat = baca_koordinat(file_koordinat)
+    situs = []
+    for nama, radiasi, emisi in baca_baris_provinsi(file_provinsi):
+        if kunci_nama(nama) not in koordinat:
+            raise GalatReferensi(f"Koordinat provinsi {nama} tidak ada di {file_koordinat}")
+        lintang, bujur = koordinat[kunci_nama(nama)]
+        situs.append({'nama': nama, 'tingkat': 'provinsi', 'lintang': lintang, 'bujur': bujur,
+                      'radiasi': radiasi, 'emisi': emisi})
+
+    # Lokasi NASA POWER: yield dari simulasi per jam, faktor emisi dari provinsi terdekat
+    seri = []
+    for path in file_nasa:
+        data = baca_nasa_power(path)
+        lintang, bujur = data.metadata.lintang, data.metadata.bujur
+        jarak = [float(jarak_km(lintang, bujur, s['lintang'], s['bujur'])) for s in situs]
+        provinsi = situs[int(np.argmin(jarak))]
+        situs.append({'nama': Path(path).stem, 'tingkat': 'lokasi', 'lintang': lintang, 'bujur': bujur,
+                      'radiasi': profil_lokasi(data)[0], 'emisi': provinsi['emisi'], 'seri': len(seri)})
+        seri.append(data)
+    return situs, seri
+
+
+def versi_bawaan(sumber):
+    """Nama versi dataset bawaan: hash format + isi semua file sumber."""
+    h = hashlib.blake2b(f'format-{FORMAT_VERSI}'.encode(), digest_size=8)
+    for path in sumber:
+        h.update(Path(path).read_bytes())
+    return f'bawaan-{h.hexdigest()}'
+
+
+def referensi_bawaan(akar=DIR_REFERENSI, file_provinsi=FILE_DATA, file_koordinat=FILE_KOORDINAT,
+                     file_nasa=(FILE_NASA,), aset=DIR_ASET):
+    """Dataset dari file bawaan proyek; dibangun ulang otomatis jika isi sumber berubah.
+
+    Versi yang sudah dikemas di `aset` (lihat `python referensi.py kemas`)
+    langsung dipakai, jadi container baru tidak perlu membangunnya.
+    """
+    sumber = [file_provinsi, file_koordinat, *file_nasa]
+    versi = versi_bawaan(sumber)
+    if (Path(aset) / versi / 'manifest.json').exists():
+        return ReferensiSitus(Path(aset) / versi)
+
+    direktori = Path(akar) / versi
+    if not (direktori / 'manifest.json').exists():
+        situs, seri = situs_dari_sumber(file_provinsi, file_koordinat, file_nasa)
+        try:
+            bangun_referensi(direktori, situs, seri, versi=versi,
+                             sumber={str(p): _hash_file(p) for p in sumber})
+        except (GalatReferensi, OSError):
+            if not (direktori / 'manifest.json').exists():   # proses lain sudah membangunnya
+                raise
+    return ReferensiSitus(direktori)
+
+
+def _baca_csv_situs(path):
+    """CSV situs tambahan: nama, tingkat, lintang, bujur, produksi_harian_kwh, faktor_emisi."""
+    import csv
+
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        return [{'nama': b['nama'], 'tingkat': b.get('tingkat', ''), 'lintang': b['lintang'],
+                 'bujur': b['bujur'], 'radiasi': b['produksi_harian_kwh'], 'emisi': b['faktor_emisi']}
+                for b in csv.DictReader(f)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kelola dataset referensi lokasi Solar Analyzer")
+    sub = parser.add_subparsers(dest='perintah', required=True)
+
+    p_bangun = sub.add_parser('bangun', help="Bangun versi dataset baru")
+    p_bangun.add_argument('versi')
+    p_bangun.add_argument('--akar', default=str(DIR_REFERENSI))
+    p_bangun.add_argument('--provinsi', default=FILE_DATA)
+    p_bangun.add_argument('--koordinat', default=FILE_KOORDINAT)
+    p_bangun.add_argument('--situs', nargs='*', default=[], help="CSV situs tambahan (kabupaten, kecamatan, ...)")
+    p_bangun.add_argument('--nasa', nargs='*', default=[FILE_NASA], help="File NASA POWER per jam")
+
+    p_kemas = sub.add_parser('kemas', help="Bangun ulang dataset bawaan yang ikut di repo (aset/referensi)")
+    p_kemas.add_argument('--aset', default=str(DIR_ASET))
+
+    p_info = sub.add_parser('info', help="Tampilkan versi yang tersedia")
+    p_info.add_argument('--akar', default=str(DIR_REFERENSI))
+    p_info.add_argument('--verifikasi', action='store_true', help="Periksa checksum semua file")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.perintah == 'bangun':
+            situs, seri = situs_dari_sumber(args.provinsi, args.koordinat, args.nasa)
+            for path in args.situs:
+                situs += _baca_csv_situs(path)
+            sumber = [args.provinsi, args.koordinat, *args.nasa, *args.situs]
+            path = bangun_referensi(Path(args.akar) / args.versi, situs, seri, versi=args.versi,
+                                    sumber={str(p): _hash_file(p) for p in sumber})
+            print(f"{len(situs)} situs ({len(seri)} berseri per jam) -> {path}")
+        elif args.perintah == 'kemas':
+            sumber = [FILE_DATA, FILE_KOORDINAT, FILE_NASA]
+            versi = versi_bawaan(sumber)
+            for lama in daftar_versi(args.aset):
+                if lama != versi:
+                    shutil.rmtree(Path(args.aset) / lama)
+            path = Path(args.aset) / versi
+            if not (path / 'manifest.json').exists():
+                situs, seri = situs_dari_sumber(*sumber[:2], sumber[2:])
+                bangun_referensi(path, situs, seri, versi=versi, sumber={str(p): _hash_file(p) for p in sumber})
+            print(f"Dataset bawaan {versi} -> {path}")
+        else:
+            for versi in daftar_versi(args.akar):
+                try:
+                    ref = buka_referensi(args.akar, versi, verifikasi=args.verifikasi)
+                except GalatReferensi as e:
+                    print(f"{versi}: {e}")
+                    continue
+                print(f"{versi}: {len(ref)} situs, dibuat {ref.manifest['dibuat']}")
+    except (GalatReferensi, OSError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
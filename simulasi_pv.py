@@ -0,0 +1,110 @@
+"""Simulasi energi PV per jam dari iradiansi dan suhu NASA POWER.
+
+Model sederhana yang sepenuhnya vektor:
+  T_sel  = T2M + (NOCT - 20) / 800 * G
+  P_dc   = kWp * G / 1000 * (1 + koef_suhu * (T_sel - 25)) * (1 - rugi_sistem)
+  P_ac   = min(P_dc * efisiensi_inverter, kapasitas_inverter)
+dengan G = ALLSKY_SFC_SW_DWN (Wh/m^2 per jam = rata-rata W/m^2 jam tersebut).
+
+Jika inverter diskalakan dengan rasio DC/AC, keluaran linier terhadap kWp,
+sehingga profil per-kWp cukup dihitung sekali per lokasi dan perubahan
+jumlah modul hanya berupa perkalian.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+KOLOM_GHI = 'ALLSKY_SFC_SW_DWN'
+KOLOM_SUHU = 'T2M'
+
+
+@dataclass(frozen=True)
+class ParameterPV:
+    """Asumsi teknis modul dan sistem."""
+    koef_suhu: float = -0.0037          # per °C (modul mono-Si)
+    noct: float = 45.0                  # °C
+    rugi_sistem: float = 0.14           # kabel, kotoran, mismatch, dll
+    efisiensi_inverter: float = 0.96
+    rasio_dc_ac: float = 1.2            # kWp / kW inverter
+    kapasitas_inverter_kw: float = None  # jika diisi, menggantikan rasio_dc_ac
+
+
+@dataclass(frozen=True)
+class HasilSimulasiPV:
+    """Energi AC per jam berbentuk (..., jam) beserta sumbu waktunya."""
+    waktu: np.ndarray               # datetime64[h]
+    energi_kwh: np.ndarray          # (..., jam)
+    kapasitas_kwp: np.ndarray       # (...)
+
+    @property
+    def total_kwh(self):
+        return self.energi_kwh.sum(axis=-1)
+
+    @property
+    def jumlah_hari(self):
+        return len(self.waktu) / 24
+
+    @property
+    def produksi_harian_spesifik(self):
+        """Rata-rata kWh/kWp/hari, padanan kolom `Produksi_Harian_kWh`."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.total_kwh / self.kapasitas_kwp / self.jumlah_hari
+
+    def per_bulan(self):
+        """Total energi per bulan kalender berbentuk (..., 12)."""
+        return agregasi_bulanan(self.waktu, self.energi_kwh)
+
+    def hari_per_bulan(self):
+        """Jumlah hari data di tiap bulan kalender (mengikuti tahun data)."""
+        return agregasi_bulanan(self.waktu, np.ones(len(self.waktu))) / 24
+
+
+def agregasi_bulanan(waktu, nilai):
+    """Jumlahkan `nilai[..., jam]` per bulan kalender (Jan..Des) tanpa loop Python."""
+    bulan = waktu.astype('datetime64[M]').astype(np.int64) % 12
+    satu_panas = np.zeros((len(bulan), 12))
+    satu_panas[np.arange(len(bulan)), bulan] = 1.0
+    return np.asarray(nilai) @ satu_panas
+
+
+def daya_per_kwp(ghi, suhu_udara, param=ParameterPV()):
+    """Energi AC per jam untuk 1 kWp (kWh), sebelum pembatasan inverter tetap."""
+    ghi = np.nan_to_num(np.asarray(ghi, dtype=np.float64), nan=0.0)
+    suhu_udara = np.asarray(suhu_udara, dtype=np.float64)
+    suhu_udara = np.where(np.isnan(suhu_udara), 25.0, suhu_udara)
+
+    suhu_sel = suhu_udara + (param.noct - 20.0) / 800.0 * ghi
+    derating = 1 + param.koef_suhu * (suhu_sel - 25.0)
+    p_dc = ghi / 1000.0 * derating * (1 - param.rugi_sistem)
+    return np.maximum(p_dc * param.efisiensi_inverter, 0.0)
+
+
+def simulasi(data_nasa, kapasitas_kwp, param=ParameterPV()):
+    """Simulasikan satu tahun (atau lebih) per jam untuk satu/banyak kapasitas sekaligus.
+
+    `data_nasa` adalah `nasa_power.DataNasaPower`; `kapasitas_kwp` skalar atau array.
+    """
+    kapasitas_kwp = np.asarray(kapasitas_kwp, dtype=np.float64)
+    profil = daya_per_kwp(data_nasa[KOLOM_GHI], data_nasa[KOLOM_SUHU], param)
+    energi = kapasitas_kwp[..., None] * profil
+
+    if param.kapasitas_inverter_kw is not None:
+        batas = np.asarray(param.kapasitas_inverter_kw, dtype=np.float64)
+    else:
+        batas = kapasitas_kwp / param.rasio_dc_ac
+    energi = np.minimum(energi, np.asarray(batas)[..., None])
+    return HasilSimulasiPV(data_nasa.waktu, energi, kapasitas_kwp)
+
+
+def profil_lokasi(data_nasa, param=ParameterPV()):
+    """Ringkasan per-kWp sebuah lokasi untuk dashboard: (kWh/kWp/hari, faktor musim 12 bulan).
+
+    Faktor musim = rata-rata harian bulan tersebut / rata-rata harian setahun,
+    sehingga bisa langsung menggantikan pola musim di `engine.pola_musim`.
+    """
+    hasil = simulasi(data_nasa, 1.0, param)
+    harian = float(hasil.produksi_harian_spesifik)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        faktor = hasil.per_bulan() / hasil.hari_per_bulan() / harian
+    return harian, tuple(np.nan_to_num(faktor, nan=0.0).tolist())